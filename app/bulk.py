@@ -0,0 +1,327 @@
+"""Bulk writes of fruits and colors, used by the bulk mutations.
+
+Every call runs in one transaction: the rows are validated in Python first,
+every error of every item is reported at once, then written with
+`bulk_create`/`bulk_update` by batches of `BATCH_SIZE`. Nested colors of the
+fruits are resolved with one lookup query, the missing ones by name created
+with one more.
+
+`post_save` is not sent by bulk writes, `post_bulk_save` is sent once per call
+instead, see `utils.signals`.
+
+References:
+    https://docs.djangoproject.com/en/5.0/ref/models/querysets/#bulk-create
+    https://docs.djangoproject.com/en/5.0/ref/models/instances/#validating-objects
+"""
+
+from typing import TYPE_CHECKING, Any, Iterable, Optional, Sequence
+
+from django.core.exceptions import ValidationError
+from django.db import models as django_models
+from django.db import router, transaction
+from django.utils import timezone
+from graphql import GraphQLError
+from strawberry import UNSET
+
+from utils.signals import post_bulk_save
+
+from . import models
+
+if TYPE_CHECKING:
+    from .inputs import ColorInput, ColorPartialInput, FruitInput, FruitPartialInput
+
+BAD_USER_INPUT = "BAD_USER_INPUT"
+BATCH_SIZE = 1000
+# The ids of one `bulk_delete`, past them the call is rejected.
+MAX_DELETE_SIZE = 10 * BATCH_SIZE
+
+
+class BulkErrors:
+    """Errors of the items of a bulk write, by index and field."""
+
+    def __init__(self) -> None:
+        """Initialize the BulkErrors."""
+        self.errors: list[dict[str, Any]] = []
+
+    def add(self, index: int, field: str, *messages: str) -> None:
+        """Add the messages of the field of the item."""
+        self.errors.append({"index": index, "field": field, "messages": list(messages)})
+
+    def validate(
+        self,
+        instances: Sequence[django_models.Model],
+        exclude: Iterable[str] = (),
+        locations: Optional[Sequence[tuple[int, str]]] = None,
+    ) -> None:
+        """Validate the fields of the instances, without queries.
+
+        Args:
+            instances: The instances to validate.
+            exclude: The fields not to validate, e.g. resolved relations.
+            locations: The item index and the field prefix of each instance,
+                by default the index of the instance without prefix.
+        """
+        exclude = list(exclude)
+        for position, instance in enumerate(instances):
+            index, prefix = locations[position] if locations else (position, "")
+            try:
+                instance.full_clean(
+                    exclude=exclude, validate_unique=False, validate_constraints=False
+                )
+            except ValidationError as e:
+                for field, messages in e.message_dict.items():
+                    self.add(index, f"{prefix}{field}", *messages)
+
+    def raise_if_any(self) -> None:
+        """Raise every error at once.
+
+        Raises:
+            GraphQLError: The errors are in the ``errors`` extension.
+        """
+        if self.errors:
+            raise GraphQLError(
+                f"{len(self.errors)} invalid fields.",
+                extensions={"code": BAD_USER_INPUT, "errors": self.errors},
+            )
+
+
+def is_set(value: Any) -> bool:
+    """Return whether the input value was given."""
+    return value is not UNSET
+
+
+def to_pk(model: type[django_models.Model], value: Any) -> Optional[Any]:
+    """Return the primary key of the ``ID`` input, None when it is not valid."""
+    if not is_set(value) or value is None:
+        return None
+    try:
+        return model._meta.pk.to_python(value)  # type: ignore[union-attr]
+    except ValidationError:
+        return None
+
+
+def get_database(model: type[django_models.Model]) -> str:
+    """Return the database alias the model is written to."""
+    return router.db_for_write(model)
+
+
+def bulk_create(model: type[django_models.Model], instances: list[Any]) -> list[Any]:
+    """Insert the instances by batches and send `post_bulk_save`."""
+    using = get_database(model)
+    model.objects.using(using).bulk_create(instances, batch_size=BATCH_SIZE)
+    post_bulk_save.send(sender=model, instances=instances, created=True, using=using)
+    return instances
+
+
+def bulk_update(
+    model: type[django_models.Model], instances: list[Any], fields: Iterable[str]
+) -> list[Any]:
+    """Update the fields of the instances by batches and send `post_bulk_save`."""
+    using = get_database(model)
+    if fields := sorted(set(fields)):
+        model.objects.using(using).bulk_update(instances, fields, batch_size=BATCH_SIZE)
+        post_bulk_save.send(
+            sender=model, instances=instances, created=False, using=using
+        )
+    return instances
+
+
+def bulk_delete(model: type[django_models.Model], ids: Sequence[Any]) -> int:
+    """Delete the rows by batches, returns the number of deleted rows.
+
+    Raises:
+        GraphQLError: More than `MAX_DELETE_SIZE` ids.
+    """
+    if len(ids) > MAX_DELETE_SIZE:
+        raise GraphQLError(
+            f"At most {MAX_DELETE_SIZE} ids are deleted at once.",
+            extensions={"code": BAD_USER_INPUT},
+        )
+    using = get_database(model)
+    ids = [pk for pk in (to_pk(model, value) for value in ids) if pk is not None]
+    deleted = 0
+    for start in range(0, len(ids), BATCH_SIZE):
+        batch = ids[start : start + BATCH_SIZE]
+        queryset = model.objects.using(using).filter(pk__in=batch)
+        _, rows = queryset.delete()
+        deleted += rows.get(model._meta.label, 0)
+    return deleted
+
+
+def resolve_colors(
+    inputs: Sequence[Optional["ColorPartialInput"]], errors: BulkErrors
+) -> list[Optional[models.Color]]:
+    """Return the colors of the inputs, by ``id`` or by ``name``.
+
+    Colors are looked up with one query, the missing names are created.
+    """
+    ids = {to_pk(models.Color, i.id) for i in inputs if i} - {None}
+    names = {
+        i.name
+        for i in inputs
+        if i and not (is_set(i.id) and i.id is not None) and is_set(i.name)
+    }
+    by_id: dict[Any, models.Color] = {}
+    by_name: dict[str, models.Color] = {}
+    if ids or names:
+        found = models.Color.objects.filter(
+            django_models.Q(pk__in=ids) | django_models.Q(name__in=names)
+        ).order_by("pk")
+        for color in found:
+            by_id[color.pk] = color
+            by_name.setdefault(color.name, color)
+
+    missing = {name: models.Color(name=name) for name in names - by_name.keys()}
+    colors: list[Optional[models.Color]] = []
+    for index, color_input in enumerate(inputs):
+        color = None
+        if not color_input:
+            pass
+        elif is_set(color_input.id) and color_input.id is not None:
+            color = by_id.get(to_pk(models.Color, color_input.id))
+            if color is None:
+                errors.add(index, "color", f"Color {color_input.id} does not exist.")
+        elif is_set(color_input.name):
+            color = by_name.get(color_input.name) or missing[color_input.name]  # type: ignore[index]
+            if color.pk is None:
+                errors.validate(
+                    [color], exclude=["description"], locations=[(index, "color.")]
+                )
+        else:
+            errors.add(index, "color", "Color requires an id or a name.")
+        colors.append(color)
+
+    if missing and not errors.errors:
+        bulk_create(models.Color, list(missing.values()))
+    return colors
+
+
+def get_existing(
+    model: type[django_models.Model], inputs: Sequence[Any], errors: BulkErrors
+) -> list[Any]:
+    """Return the rows of the inputs by ``id``, with one query."""
+    ids = [to_pk(model, i.id) for i in inputs]
+    existing = model.objects.in_bulk([pk for pk in ids if pk is not None])
+    instances = []
+    for index, (item, pk) in enumerate(zip(inputs, ids)):
+        instance = existing.get(pk) if pk is not None else None
+        if instance is None:
+            errors.add(index, "id", f"{model.__name__} {item.id} does not exist.")
+        instances.append(instance)
+    return instances
+
+
+@transaction.atomic
+def create_fruits(inputs: Sequence["FruitInput"]) -> list[models.Fruit]:
+    """Create the fruits."""
+    errors = BulkErrors()
+    colors = resolve_colors(
+        [i.color if is_set(i.color) else None for i in inputs], errors
+    )
+    fruits = [
+        models.Fruit(name=i.name, category=i.category, color=color)
+        for i, color in zip(inputs, colors)
+    ]
+    errors.validate(fruits, exclude=["color"])
+    errors.raise_if_any()
+    return bulk_create(models.Fruit, fruits)
+
+
+@transaction.atomic
+def update_fruits(inputs: Sequence["FruitPartialInput"]) -> list[models.Fruit]:
+    """Update the given fields of the fruits, by ``id``."""
+    errors = BulkErrors()
+    fruits = get_existing(models.Fruit, inputs, errors)
+    colors = resolve_colors(
+        [i.color if is_set(i.color) else None for i in inputs], errors
+    )
+    fields = {"updated_at"}
+    now = timezone.now()
+    for fruit_input, fruit, color in zip(inputs, fruits, colors):
+        if fruit is None:
+            continue
+        for name in ("name", "category"):
+            if is_set(value := getattr(fruit_input, name)):
+                setattr(fruit, name, value)
+                fields.add(name)
+        if is_set(fruit_input.color):
+            fruit.color = color
+            fields.add("color")
+        fruit.updated_at = now
+    errors.validate(
+        [fruit for fruit in fruits if fruit],
+        exclude=["color"],
+        locations=[(index, "") for index, fruit in enumerate(fruits) if fruit],
+    )
+    errors.raise_if_any()
+    return bulk_update(models.Fruit, fruits, fields)
+
+
+@transaction.atomic
+def delete_fruits(ids: Sequence[Any]) -> int:
+    """Delete the fruits, returns the number of deleted fruits."""
+    return bulk_delete(models.Fruit, list(ids))
+
+
+@transaction.atomic
+def create_colors(inputs: Sequence["ColorInput"]) -> list[models.Color]:
+    """Create the colors, with their nested ``fruits``."""
+    errors = BulkErrors()
+    colors = [
+        models.Color(
+            name=i.name,
+            description=i.description if is_set(i.description) else "",
+        )
+        for i in inputs
+    ]
+    errors.validate(colors)
+    errors.raise_if_any()
+    bulk_create(models.Color, colors)
+
+    fruits: list[models.Fruit] = []
+    locations: list[tuple[int, str]] = []
+    for index, (color_input, color) in enumerate(zip(inputs, colors)):
+        for position, fruit_input in enumerate(color_input.fruits or ()):
+            fruits.append(
+                models.Fruit(
+                    name=fruit_input.name, category=fruit_input.category, color=color
+                )
+            )
+            locations.append((index, f"fruits.{position}."))
+    errors.validate(fruits, exclude=["color"], locations=locations)
+    errors.raise_if_any()
+    if fruits:
+        bulk_create(models.Fruit, fruits)
+    return colors
+
+
+@transaction.atomic
+def update_colors(inputs: Sequence["ColorPartialInput"]) -> list[models.Color]:
+    """Update the given fields of the colors, by ``id``.
+
+    Nested ``fruits`` are not updated, use ``updateFruits``.
+    """
+    errors = BulkErrors()
+    colors = get_existing(models.Color, inputs, errors)
+    fields = set()
+    for index, (color_input, color) in enumerate(zip(inputs, colors)):
+        if is_set(color_input.fruits):
+            errors.add(index, "fruits", "Fruits are updated by updateFruits.")
+        if color is None:
+            continue
+        for name in ("name", "description"):
+            if is_set(value := getattr(color_input, name)):
+                setattr(color, name, value)
+                fields.add(name)
+    errors.validate(
+        [color for color in colors if color],
+        locations=[(index, "") for index, color in enumerate(colors) if color],
+    )
+    errors.raise_if_any()
+    return bulk_update(models.Color, colors, fields)
+
+
+@transaction.atomic
+def delete_colors(ids: Sequence[Any]) -> int:
+    """Delete the colors and their fruits, returns the number of colors."""
+    return bulk_delete(models.Color, list(ids))
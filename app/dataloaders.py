@@ -0,0 +1,157 @@
+"""App app dataloaders.
+
+`DjangoOptimizerExtension` only optimizes the querysets it resolves itself.
+Objects built by mutations, subscriptions or custom resolvers would load
+``Fruit.color`` and ``Color.fruits`` one row at a time; these loaders batch all
+keys requested in the same event loop tick into a single ``IN (...)`` query.
+
+Examples:
+    Add the extension, ``schema.py``::
+
+        schema = strawberry.Schema(
+            query=Query,
+            extensions=[DjangoOptimizerExtension, DataLoadersExtension],
+        )
+
+    And use the field class on the types, ``types.py``::
+
+        @strawberry_django.type(models.Fruit, field_cls=DataLoaderStrawberryDjangoField)
+        class Fruit:
+            color: "Color"
+
+References:
+    https://strawberry.rocks/docs/guides/dataloaders
+    https://strawberry-graphql.github.io/strawberry-django/guide/optimizer/
+"""
+
+import asyncio
+import contextvars
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, Optional
+
+from asgiref.sync import sync_to_async
+from strawberry.dataloader import DataLoader
+from strawberry.extensions import SchemaExtension
+from strawberry.utils.inspect import in_async_context
+from strawberry_django.fields.field import StrawberryDjangoField
+
+from . import models
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Generator
+
+    from django.db import models as django_models
+
+
+@sync_to_async
+def load_colors(keys: list[int]) -> list[Optional[models.Color]]:
+    """Batch load colors by primary key."""
+    colors = models.Color.objects.in_bulk(keys)
+    return [colors.get(key) for key in keys]
+
+
+@sync_to_async
+def load_fruits_by_color(keys: list[int]) -> list[list[models.Fruit]]:
+    """Batch load the fruits of colors by color primary key."""
+    fruits: dict[int, list[models.Fruit]] = defaultdict(list)
+    for fruit in models.Fruit.objects.filter(color_id__in=keys).order_by("pk"):
+        fruits[fruit.color_id].append(fruit)  # type: ignore[index]
+    return [fruits[key] for key in keys]
+
+
+def get_running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """Return the running event loop, None outside of one."""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class DataLoaders:
+    """Request scoped dataloaders."""
+
+    def __init__(self, cache: bool = True) -> None:
+        """Create new loaders, their cache lives as long as this instance.
+
+        Without ``cache``, the loaders only batch the keys of the same tick.
+        """
+        self.color: DataLoader[int, Optional[models.Color]] = DataLoader(
+            load_fn=load_colors, cache=cache
+        )
+        self.fruits_by_color: DataLoader[int, list[models.Fruit]] = DataLoader(
+            load_fn=load_fruits_by_color, cache=cache
+        )
+        self.loop = get_running_loop()
+
+    def load(
+        self, source: "django_models.Model", field_name: str
+    ) -> Optional["Awaitable[Any]"]:
+        """Load the relation through a dataloader, if it has one.
+
+        Returns None when the relation is not batched or is already cached
+        (e.g. by the optimizer ``select_related``/``prefetch_related``).
+        """
+        if isinstance(source, models.Fruit) and field_name == "color":
+            if source.color_id is None or models.Fruit.color.is_cached(source):  # type: ignore[attr-defined]
+                return None
+            return self.color.load(source.color_id)
+        if isinstance(source, models.Color) and field_name == "fruits":
+            if "fruits" in getattr(source, "_prefetched_objects_cache", {}):
+                return None
+            return self.fruits_by_color.load(source.pk)
+        return None
+
+
+dataloaders: contextvars.ContextVar[Optional[DataLoaders]] = contextvars.ContextVar(
+    "dataloaders_ctx",
+    default=None,
+)
+
+
+def get_dataloaders() -> DataLoaders:
+    """Return the loaders of the current operation."""
+    loaders = dataloaders.get()
+    if loaders is None or loaders.loop is not get_running_loop():
+        # Outside of an operation, e.g. a subscription event: these loaders
+        # outlive the event, so they batch but do not cache. Loaders are bound
+        # to their event loop, the context may outlive it too.
+        loaders = DataLoaders(cache=False)
+        dataloaders.set(loaders)
+    return loaders
+
+
+class DataLoadersExtension(SchemaExtension):
+    """Create new dataloaders for every executed operation."""
+
+    def on_execute(self) -> "Generator[None, None, None]":
+        """Set the dataloaders while the operation is executed."""
+        token = dataloaders.set(DataLoaders())
+        try:
+            yield
+        finally:
+            dataloaders.reset(token)
+
+
+class DataLoaderStrawberryDjangoField(StrawberryDjangoField):
+    """Resolve relations through `DataLoaders` in async context."""
+
+    def get_result(
+        self,
+        source: Optional["django_models.Model"],
+        info: Any,
+        args: list[Any],
+        kwargs: dict[str, Any],
+    ) -> Any:
+        """Override to batch uncached relations."""
+        if (
+            source is not None
+            and self.base_resolver is None
+            and not kwargs
+            and in_async_context()
+        ):
+            result = get_dataloaders().load(
+                source, self.django_name or self.python_name
+            )
+            if result is not None:
+                return result
+        return super().get_result(source, info, args, kwargs)
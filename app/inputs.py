@@ -4,6 +4,9 @@ References:
     https://strawberry-graphql.github.io/strawberry-django/guide/types/
 """
 
+from typing import Optional
+
+import strawberry
 import strawberry_django
 from strawberry import auto
 
@@ -17,7 +20,7 @@ class ColorInput:
     id: auto
     name: auto
     description: auto
-    fruits: list["FruitInput"]
+    fruits: Optional[list["FruitInput"]] = strawberry.UNSET
 
 
 @strawberry_django.input(models.Color, partial=True)
@@ -27,7 +30,7 @@ class ColorPartialInput:
     id: auto
     name: auto
     description: auto
-    fruits: list["FruitPartialInput"]
+    fruits: Optional[list["FruitPartialInput"]] = strawberry.UNSET
 
 
 @strawberry_django.input(models.Color, partial=True)
@@ -46,12 +49,11 @@ class FruitInput:
 
     id: auto
     name: auto
-    color: "ColorInput"
+    category: auto
+    # A color by ``id``, or by ``name`` created if missing, see ``app.bulk``.
+    color: Optional["ColorPartialInput"] = strawberry.UNSET
 
 
 @strawberry_django.input(models.Fruit, partial=True)
 class FruitPartialInput(FruitInput):
     """Fruit model partial input type."""
-
-    # Override.
-    color: "ColorPartialInput"  # type: ignore[assignment]
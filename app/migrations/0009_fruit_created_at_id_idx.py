@@ -0,0 +1,17 @@
+# Generated by Django 5.1.3 on 2026-10-18 05:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0008_delete_history'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fruit',
+            index=models.Index(fields=['created_at', 'id'], name='fruit_created_at_id_idx'),
+        ),
+    ]
@@ -49,6 +49,12 @@ class Fruit(models.Model):
         help_text="색상",
     )
 
+    class Meta:
+        indexes = [
+            # Keyset pagination, see ``app.pagination``.
+            models.Index(fields=["created_at", "id"], name="fruit_created_at_id_idx"),
+        ]
+
     def __str__(self) -> str:
         """이름."""
         return self.name
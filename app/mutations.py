@@ -1,12 +1,21 @@
 """App app mutations.
 
+The bulk mutations write every item in one transaction, or none of them, see
+`app.bulk`.
+
 References:
     https://strawberry.rocks/docs/guides/authentication
+    https://strawberry-graphql.github.io/strawberry-django/guide/mutations/
 """
 
+from typing import List
+
 import strawberry
+import strawberry_django
 
-from .types import LoginError, LoginResult, LoginSuccess, User
+from . import bulk
+from .inputs import ColorInput, ColorPartialInput, FruitInput, FruitPartialInput
+from .types import Color, Fruit, LoginError, LoginResult, LoginSuccess, User
 
 # @strawberry.type
 # class FruitMutations:
@@ -50,3 +59,33 @@ class Mutation:
                 password=password,
             )
         )
+
+    @strawberry_django.mutation
+    def create_fruits(self, input: List[FruitInput]) -> List[Fruit]:
+        """Create fruits, with their colors by id or name."""
+        return bulk.create_fruits(input)  # type: ignore[return-value]
+
+    @strawberry_django.mutation
+    def update_fruits(self, input: List[FruitPartialInput]) -> List[Fruit]:
+        """Update the given fields of fruits, by id."""
+        return bulk.update_fruits(input)  # type: ignore[return-value]
+
+    @strawberry_django.mutation
+    def delete_fruits(self, ids: List[strawberry.ID]) -> int:
+        """Delete fruits by id, returns the number of deleted fruits."""
+        return bulk.delete_fruits(ids)
+
+    @strawberry_django.mutation
+    def create_colors(self, input: List[ColorInput]) -> List[Color]:
+        """Create colors, with their nested fruits."""
+        return bulk.create_colors(input)  # type: ignore[return-value]
+
+    @strawberry_django.mutation
+    def update_colors(self, input: List[ColorPartialInput]) -> List[Color]:
+        """Update the given fields of colors, by id."""
+        return bulk.update_colors(input)  # type: ignore[return-value]
+
+    @strawberry_django.mutation
+    def delete_colors(self, ids: List[strawberry.ID]) -> int:
+        """Delete colors and their fruits by id, returns the number of colors."""
+        return bulk.delete_colors(ids)
@@ -0,0 +1,214 @@
+"""App app keyset pagination.
+
+Cursors hold the values of the queryset ordering for a row, so the next page
+is fetched with ``WHERE (created_at, id) > (...) ORDER BY created_at, id LIMIT n``
+which is served by an index, instead of ``OFFSET n`` which scans every skipped
+row.
+
+Examples:
+    Order the queryset by a unique keyset, ``schema.py``::
+
+        @strawberry_django.connection(KeysetConnection[Fruit])
+        def fruits(self) -> Iterable[models.Fruit]:
+            return models.Fruit.objects.order_by("created_at", "id")
+
+References:
+    https://strawberry.rocks/docs/guides/pagination/connections
+    https://strawberry-graphql.github.io/strawberry-django/guide/relay/
+    https://relay.dev/graphql/connections.htm
+    https://use-the-index-luke.com/no-offset
+"""
+
+import datetime
+import json
+from typing import TYPE_CHECKING, Any, Optional
+
+import strawberry
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models import F, Q
+from strawberry import relay
+from strawberry.types.base import StrawberryContainer, get_object_definition
+from strawberry_django.resolvers import django_resolver
+from typing_extensions import Self
+
+if TYPE_CHECKING:
+    from strawberry.types import Info
+    from strawberry.utils.await_maybe import AwaitableOrValue
+
+KEYSET_CURSOR_PREFIX = "keyset"
+KEYSET_ANNOTATION_PREFIX = "_keyset_"
+
+Keyset = list[tuple[str, bool]]
+
+
+def get_keyset(queryset: models.QuerySet) -> Keyset:
+    """Return ``(field name, descending)`` pairs of the queryset ordering.
+
+    The last field must be unique (e.g. ``id``) so that cursors are stable.
+    """
+    ordering = queryset.query.order_by or ("pk",)
+    keyset: Keyset = []
+    for field_name in ordering:
+        if not isinstance(field_name, str):
+            raise TypeError("Keyset pagination only supports ordering by field names.")
+        descending = field_name.startswith("-")
+        keyset.append((field_name.lstrip("-"), descending))
+    return keyset
+
+
+class KeysetJSONEncoder(DjangoJSONEncoder):
+    """JSON encoder of keyset values at full precision.
+
+    `DjangoJSONEncoder` cuts times to milliseconds, so a cursor of a row with
+    microseconds would not compare equal to its row and match it again.
+    """
+
+    def default(self, o: Any) -> Any:
+        """Override."""
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(values: list[Any]) -> str:
+    """Encode the keyset values of a row."""
+    return relay.to_base64(
+        KEYSET_CURSOR_PREFIX, json.dumps(values, cls=KeysetJSONEncoder)
+    )
+
+
+def decode_cursor(cursor: str, model: type[models.Model], keyset: Keyset) -> list[Any]:
+    """Decode the keyset values of a cursor into python values of their fields."""
+    try:
+        prefix, value = relay.from_base64(cursor)
+        values = json.loads(value)
+    except ValueError as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if prefix != KEYSET_CURSOR_PREFIX or len(values) != len(keyset):
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+    opts = model._meta
+    return [
+        (opts.pk if name == "pk" else opts.get_field(name)).to_python(value)  # type: ignore[union-attr]
+        for (name, _), value in zip(keyset, values)
+    ]
+
+
+def keyset_filter(keyset: Keyset, values: list[Any], *, after: bool) -> Q:
+    """Row comparison ``(k1, k2) > (v1, v2)`` expanded for the ORM.
+
+    ``k1 >= v1 AND (k1 > v1 OR (k1 = v1 AND k2 > v2))``, the redundant first
+    term lets the database use a range scan on the leading index column.
+    """
+    condition: Optional[Q] = None
+    for (name, descending), value in reversed(list(zip(keyset, values))):
+        lookup = "gt" if after != descending else "lt"
+        strict = Q(**{f"{name}__{lookup}": value})
+        condition = (
+            strict if condition is None else strict | (Q(**{name: value}) & condition)
+        )
+    assert condition is not None
+
+    name, descending = keyset[0]
+    lookup = "gte" if after != descending else "lte"
+    return Q(**{f"{name}__{lookup}": values[0]}) & condition
+
+
+@strawberry.type(description="A connection paginated by keyset cursors.")
+class KeysetConnection(relay.Connection[relay.NodeType]):
+    """Relay connection paginated by the ordering of the resolved queryset."""
+
+    @classmethod
+    def resolve_connection(
+        cls,
+        nodes: models.QuerySet,  # type: ignore[override]
+        *,
+        info: "Info",
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        first: Optional[int] = None,
+        last: Optional[int] = None,
+        **kwargs: Any,
+    ) -> "AwaitableOrValue[Self]":
+        """Resolve the page of the queryset after/before the given cursors."""
+        max_results = info.schema.config.relay_max_results
+        for name, value in (("first", first), ("last", last)):
+            if value is not None and value < 0:
+                raise ValueError(f"Argument '{name}' must be a non-negative integer.")
+            if value is not None and value > max_results:
+                raise ValueError(
+                    f"Argument '{name}' cannot be higher than {max_results}."
+                )
+
+        keyset = get_keyset(nodes)
+        queryset = nodes.annotate(
+            **{
+                f"{KEYSET_ANNOTATION_PREFIX}{i}": F(name)
+                for i, (name, _) in enumerate(keyset)
+            }
+        )
+        if after is not None:
+            values = decode_cursor(after, nodes.model, keyset)
+            queryset = queryset.filter(keyset_filter(keyset, values, after=True))
+        if before is not None:
+            values = decode_cursor(before, nodes.model, keyset)
+            queryset = queryset.filter(keyset_filter(keyset, values, after=False))
+
+        # Only ``last`` reads the page backwards, from ``before`` or the end.
+        backwards = last is not None and first is None
+        limit = (last if backwards else first) or 0
+        if first is None and last is None:
+            limit = max_results
+        if backwards:
+            queryset = queryset.reverse()
+
+        @django_resolver(qs_hook=None)
+        def resolve() -> Self:
+            # Overfetch one row to know whether there is another page.
+            rows = list(queryset[: limit + 1])
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+            if backwards:
+                rows.reverse()
+                has_previous_page, has_next_page = has_more, before is not None
+            else:
+                if last is not None:
+                    rows = rows[-last:] if last else []
+                has_previous_page, has_next_page = after is not None, has_more
+
+            edge_class = cls._get_edge_class()
+            edges = [
+                edge_class(
+                    cursor=encode_cursor(
+                        [
+                            getattr(row, f"{KEYSET_ANNOTATION_PREFIX}{i}")
+                            for i in range(len(keyset))
+                        ]
+                    ),
+                    node=cls.resolve_node(row, info=info, **kwargs),
+                )
+                for row in rows
+            ]
+            return cls(
+                edges=edges,
+                page_info=relay.PageInfo(
+                    start_cursor=edges[0].cursor if edges else None,
+                    end_cursor=edges[-1].cursor if edges else None,
+                    has_previous_page=has_previous_page,
+                    has_next_page=has_next_page,
+                ),
+            )
+
+        return resolve()
+
+    @classmethod
+    def _get_edge_class(cls) -> type[relay.Edge]:
+        """Return the specialized ``Edge`` type of the ``edges`` field."""
+        type_def = get_object_definition(cls, strict=True)
+        field_def = type_def.get_field("edges")
+        assert field_def
+        field = field_def.resolve_type(type_definition=type_def)
+        while isinstance(field, StrawberryContainer):
+            field = field.of_type
+        return field  # type: ignore[return-value]
@@ -1,13 +1,20 @@
 """App app queries."""
 
+from typing import Any, Iterable
+
 import strawberry
 import strawberry_django
+from django.contrib.auth import get_user_model
 
 from utils.strawberry_django.fields.field import CustomStrawberryDjangoField
 
+from . import models
+from .pagination import KeysetConnection
+from .subscriptions import command_admission, shared_commands
 from .types import (
     Berry,
     Color,
+    CommandAdmission,
     Fruit,
     Fruit2,
     FruitAllFields,
@@ -24,9 +31,7 @@ from .types import (
 class Query:
     """App app root query class."""
 
-    berries: list[Berry] = strawberry_django.field()
     color: Color = strawberry_django.field()
-    colors: list[Color] = strawberry_django.field()
     fruit: Fruit = strawberry_django.field()
     fruit2: Fruit2 = strawberry_django.field()
     fruit_all_fields: FruitAllFields = strawberry_django.field()
@@ -36,14 +41,43 @@ class Query:
     fruit_override_exclude_fields: FruitOverrideExcludeFields = (
         strawberry_django.field()
     )
-    fruits: list[Fruit] = strawberry_django.field()
     user: User = strawberry_django.field()
-    users: list[User] = strawberry_django.field()
     # 일반 strawberry type 에 사용자 정의 필드 클래스를 직접 생성할 수 있습니다.
     user2: User2 = CustomStrawberryDjangoField()  # type: ignore
 
+    @strawberry_django.connection(KeysetConnection[Berry])
+    def berries(self) -> Iterable[models.Fruit]:
+        """Berries paginated by ``(created_at, id)``, see ``Berry.get_queryset``."""
+        return models.Fruit.objects.order_by("created_at", "id")
+
+    @strawberry_django.connection(KeysetConnection[Color])
+    def colors(self) -> Iterable[models.Color]:
+        """Colors paginated by ``id``."""
+        return models.Color.objects.order_by("id")
+
+    @strawberry_django.connection(KeysetConnection[Fruit])
+    def fruits(self) -> Iterable[models.Fruit]:
+        """Fruits paginated by ``(created_at, id)``."""
+        return models.Fruit.objects.order_by("created_at", "id")
+
+    @strawberry_django.connection(KeysetConnection[User])
+    def users(self) -> Iterable[Any]:
+        """Users paginated by ``id``."""
+        return get_user_model().objects.order_by("id")
+
     @strawberry.field
     def hello(self, info: strawberry.Info) -> str:
         """Hello world."""
         print(info.context["request"].consumer.scope["user"])
         return "world"
+
+    @strawberry.field
+    def command_admission(self) -> CommandAdmission:
+        """Running and queued `runCommand` subscriptions of this worker."""
+        return CommandAdmission(
+            running=command_admission.running,
+            queued=command_admission.queued,
+            limit=command_admission.limit,
+            max_queued=command_admission.max_queued,
+            followers=shared_commands.followers,
+        )
@@ -1,48 +1,77 @@
 """App app subscriptions.
 
+Subscriptions are served over websockets and, with the ``Accept:
+multipart/mixed;boundary=graphql;subscriptionSpec=1.0`` header, over multipart
+HTTP, so the ``stream*`` subscriptions deliver large lists incrementally.
+
 References:
     https://strawberry.rocks/docs/general/subscriptions
+    https://strawberry.rocks/docs/general/multipart-subscriptions
 """
 
 import asyncio
 import asyncio.subprocess as subprocess
+import contextlib
 from asyncio import streams
+from collections import deque
 from typing import (
     TYPE_CHECKING,
     Any,
     AsyncGenerator,
     AsyncIterator,
-    Coroutine,
+    Callable,
+    Deque,
+    Dict,
+    List,
     Optional,
+    Set,
 )
 
 import strawberry
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import QuerySet
+from graphql import GraphQLError
+
+from utils.admission import AdmissionController, AdmissionRejected
+from utils.broker.local import Subscriber
+
+from . import models
+from .types import Fruit, User
 
 if TYPE_CHECKING:
     pass
 
+COMMAND_REJECTED = "COMMAND_REJECTED"
+MAX_CHUNK_SIZE = 1000
 
-async def wait_for_call(coro: Coroutine[Any, Any, bytes]) -> Optional[bytes]:
-    r"""Wait_for_call calls the supplied coroutine in a wait_for block.
+# Subprocesses of the `run_command` subscriptions in this worker.
+command_admission = AdmissionController(
+    settings.COMMAND_SUBSCRIPTION_LIMIT,
+    max_queued=settings.COMMAND_SUBSCRIPTION_MAX_QUEUED,
+    max_wait=settings.COMMAND_SUBSCRIPTION_MAX_WAIT,
+)
 
-    This mitigates cases where the coroutine doesn't yield until it has
-    completed its task. In this case, reading a line from a StreamReader; if
-    there are no `\n` line chars in the stream the function will never exit
-    """
-    try:
-        return await asyncio.wait_for(coro(), timeout=0.1)  # type: ignore
-    except asyncio.TimeoutError:
-        return None
 
+async def read_lines(
+    stream: streams.StreamReader, chunk_size: int = 64 * 1024
+) -> AsyncIterator[list[str]]:
+    """Read_lines yields the complete lines available in the stream, per read.
 
-async def lines(stream: streams.StreamReader) -> AsyncIterator[str]:
-    """Lines reads all lines from the provided stream, decoding them as UTF-8 strings."""
-    while True:
-        b = await wait_for_call(stream.readline)  # type: ignore
-        if b:
-            yield b.decode("UTF-8").rstrip()
-        else:
-            break
+    Each read waits for the pipe and returns everything buffered so far, so a
+    burst of output is one list of lines, without polling. Lines longer than
+    ``chunk_size`` are split.
+    """
+    pending = b""
+    while chunk := await stream.read(chunk_size):
+        *complete, pending = (pending + chunk).split(b"\n")
+        if len(pending) >= chunk_size:
+            complete.append(pending)
+            pending = b""
+        if complete:
+            yield [line.decode("UTF-8", errors="replace").rstrip() for line in complete]
+    if pending:
+        yield [pending.decode("UTF-8", errors="replace").rstrip()]
 
 
 async def exec_proc(target: int) -> subprocess.Process:
@@ -55,19 +84,140 @@ async def exec_proc(target: int) -> subprocess.Process:
     )
 
 
-async def tail(proc: subprocess.Process) -> AsyncGenerator[str, None]:
-    """Tail reads from stdout until the process finishes."""
-    # Note: race conditions are possible here since we're in a subprocess. In
-    # this case the process can finish between the loop predicate and the call
-    # to read a line from stdout. This is a good example of why you need to
-    # be defensive by using asyncio.wait_for in wait_for_call().
-    while proc.returncode is None:
-        async for line in lines(proc.stdout):  # type: ignore
-            yield line
-    else:
-        # read anything left on the pipe after the process has finished
-        async for line in lines(proc.stdout):  # type: ignore
-            yield line
+async def reap(proc: subprocess.Process) -> None:
+    """Reap kills the process if it is still running and waits for it."""
+    if proc.returncode is None:
+        with contextlib.suppress(ProcessLookupError):
+            proc.kill()
+    await proc.wait()
+
+
+class SharedCommand:
+    """One command process, its output is shared by every follower.
+
+    The last ``replay`` lines are kept to replay them to late followers.
+    """
+
+    def __init__(self, target: int, replay: int) -> None:
+        """Initialize the SharedCommand, see `start`."""
+        self.target = target
+        self.history: Deque[str] = deque(maxlen=replay)
+        self.followers: Set[Subscriber] = set()
+        self.task: Optional[asyncio.Task[None]] = None
+
+    def start(self, on_done: Callable[["SharedCommand"], None]) -> None:
+        """Start the process in a task, ``on_done`` is called when it ends."""
+        self.task = asyncio.create_task(self.run(on_done))
+
+    def stop(self) -> None:
+        """Stop the process, e.g. after the last follower left."""
+        if self.task is not None:
+            self.task.cancel()
+
+    def publish(self, item: Any) -> None:
+        """Push a batch of lines, the end (None) or an error to the followers."""
+        for follower in self.followers:
+            follower.put(item)
+
+    async def run(self, on_done: Callable[["SharedCommand"], None]) -> None:
+        """Run the process with a slot of `command_admission`."""
+        end: Optional[Exception] = None
+        try:
+            async with command_admission.admit():
+                proc = await exec_proc(self.target)
+                try:
+                    async for batch in read_lines(proc.stdout):  # type: ignore[arg-type]
+                        self.history.extend(batch)
+                        self.publish(batch)
+                finally:
+                    await reap(proc)
+        except Exception as e:
+            # Every follower gets the error, not a silent end.
+            end = e
+        finally:
+            on_done(self)
+            self.publish(end)
+
+
+class SharedCommands:
+    """Running commands by target, identical commands share one process."""
+
+    def __init__(self, replay: int = 100) -> None:
+        """Initialize the SharedCommands.
+
+        Args:
+            replay: The number of recent lines replayed to late followers.
+        """
+        self.replay = replay
+        self.commands: Dict[int, SharedCommand] = {}
+
+    @property
+    def followers(self) -> int:
+        """The number of followers of the running commands."""
+        return sum(len(command.followers) for command in self.commands.values())
+
+    async def follow(self, target: int) -> AsyncGenerator[List[str], None]:
+        """Follow the command, starting it unless it is running.
+
+        Yields the replayed lines first, then the batches of lines read. The
+        command is stopped when its last follower closes the generator.
+
+        Raises:
+            AdmissionRejected: The command was rejected by `command_admission`.
+            Exception: The error ending the command, e.g. an OSError of exec.
+        """
+        command = self.commands.get(target)
+        if command is None:
+            command = self.commands[target] = SharedCommand(target, self.replay)
+            command.start(self._forget)
+        # No await between the replay and the subscription, no line is missed.
+        history = list(command.history)
+        follower = Subscriber()
+        command.followers.add(follower)
+        try:
+            if history:
+                yield history
+            async for item in follower:
+                if item is None:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            command.followers.discard(follower)
+            if not command.followers:
+                self._forget(command)
+                command.stop()
+
+    def _forget(self, command: SharedCommand) -> None:
+        """Start a new process for the next followers of the target."""
+        if self.commands.get(command.target) is command:
+            del self.commands[command.target]
+
+
+# Commands of the `run_command` subscriptions in this worker.
+shared_commands = SharedCommands(settings.COMMAND_SUBSCRIPTION_REPLAY)
+
+
+async def chunks(queryset: QuerySet, chunk_size: int) -> AsyncIterator[List[Any]]:
+    """Chunks yields the rows of the queryset by lists of ``chunk_size``.
+
+    Rows are fetched ``chunk_size`` at a time from the database cursor, so the
+    first chunk is sent before the next ones are fetched, and the queryset is
+    never materialized.
+    """
+    chunk_size = max(1, min(chunk_size, MAX_CHUNK_SIZE))
+    chunk: List[Any] = []
+    sent = False
+    async for row in queryset.aiterator(chunk_size=chunk_size):
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+            sent = True
+    if chunk or not sent:
+        # An empty queryset is one empty chunk, subscriptions send a result.
+        yield chunk
 
 
 @strawberry.type
@@ -76,9 +226,47 @@ class Subscription:
 
     @strawberry.subscription
     async def run_command(
-        self, info: strawberry.Info, target: int = 100
+        self, info: strawberry.Info, target: int = 100, batch: bool = False
     ) -> AsyncGenerator[str, None]:
-        """Run command."""
+        """Run command, ``batch`` joins the lines of an output burst.
+
+        Identical commands share one process, see `shared_commands`. Commands
+        wait for a slot of `command_admission`, and are rejected once its queue
+        is full or the wait is over.
+        """
         print(info.context["request"].scope["user"])
-        proc = await exec_proc(target)
-        return tail(proc)
+        # Close `follow` with this generator, so the process is stopped either way.
+        async with contextlib.aclosing(shared_commands.follow(target)) as batches:
+            try:
+                async for chunk in batches:
+                    if batch:
+                        yield "\n".join(chunk)
+                    else:
+                        for line in chunk:
+                            yield line
+            except AdmissionRejected as e:
+                raise GraphQLError(
+                    f"Too many commands: {e}", extensions={"code": COMMAND_REJECTED}
+                ) from e
+
+    @strawberry.subscription
+    async def stream_fruits(
+        self, chunk_size: int = 100, color_id: Optional[strawberry.ID] = None
+    ) -> AsyncGenerator[List[Fruit], None]:
+        """Fruits by chunks, ordered like ``fruits``, of a color if given."""
+        queryset = models.Fruit.objects.order_by("created_at", "id")
+        if color_id is not None:
+            queryset = queryset.filter(color_id=color_id)
+        async with contextlib.aclosing(chunks(queryset, chunk_size)) as rows:
+            async for chunk in rows:
+                yield chunk  # type: ignore[misc]
+
+    @strawberry.subscription
+    async def stream_users(
+        self, chunk_size: int = 100
+    ) -> AsyncGenerator[List[User], None]:
+        """Users by chunks, ordered like ``users``."""
+        queryset = get_user_model().objects.order_by("id")
+        async with contextlib.aclosing(chunks(queryset, chunk_size)) as rows:
+            async for chunk in rows:
+                yield chunk  # type: ignore[misc]
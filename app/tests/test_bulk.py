@@ -0,0 +1,196 @@
+"""Tests bulk mutations in the app app."""
+
+import asyncio
+from unittest import mock
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.test import TestCase
+
+from project.schema import schema
+from utils.broker.local import LocalBroker
+from utils.broker.model_events import ModelEvents
+from utils.strawberry.response_cache import (
+    LocalResponseCacheBackend,
+    ResponseCache,
+    get_tag,
+)
+
+from .. import bulk
+from ..inputs import FruitInput
+from ..models import Color, Fruit, FruitCategory
+
+CREATE_FRUITS = """mutation Create($input: [FruitInput!]!) {
+  createFruits(input: $input) { name category color { name } }
+}"""
+
+UPDATE_FRUITS = """mutation Update($input: [FruitPartialInput!]!) {
+  updateFruits(input: $input) { name category color { name } }
+}"""
+
+CREATE_COLORS = """mutation Create($input: [ColorInput!]!) {
+  createColors(input: $input) { name fruits { name } }
+}"""
+
+
+class BulkMutationsTestCase(TestCase):
+    """Tests the bulk mutations of fruits and colors."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create a color with a fruit."""
+        cls.red = Color.objects.create(name="Red")
+        cls.apple = Fruit.objects.create(
+            name="Apple", category=FruitCategory.CITRUS, color=cls.red
+        )
+
+    def execute(self, query: str, **variables):
+        """Execute the mutation asynchronously and return the result."""
+        return async_to_sync(schema.execute)(query, variable_values=variables)
+
+    def test_create_fruits(self):
+        """Test the fruits and their missing colors are created at once."""
+        fruits = [
+            {"name": "Cherry", "category": "BERRY", "color": {"id": self.red.pk}},
+            {"name": "Grape", "category": "BERRY", "color": {"name": "Purple"}},
+            {"name": "Plum", "category": "BERRY", "color": {"name": "Purple"}},
+            {"name": "Lemon", "category": "CITRUS", "color": {"name": "Red"}},
+        ]
+        # Savepoint, colors lookup, colors insert, fruits insert, release.
+        with self.assertNumQueries(5):
+            result = self.execute(CREATE_FRUITS, input=fruits)
+        assert result.errors is None, result.errors
+        assert [
+            (fruit["name"], fruit["color"]["name"])
+            for fruit in result.data["createFruits"]
+        ] == [
+            ("Cherry", "Red"),
+            ("Grape", "Purple"),
+            ("Plum", "Purple"),
+            ("Lemon", "Red"),
+        ]
+        assert Color.objects.filter(name="Purple").count() == 1
+        assert Fruit.objects.count() == 5
+
+    def test_errors(self):
+        """Test every error is reported at once and nothing is created."""
+        fruits = [
+            {"name": "Cherry", "category": "BERRY", "color": {"name": "Purple"}},
+            {"name": "x" * 21, "category": "BERRY", "color": {"id": "0"}},
+            {"name": "Grape", "category": "BERRY", "color": {"name": "y" * 21}},
+        ]
+        result = self.execute(CREATE_FRUITS, input=fruits)
+        [error] = result.errors
+        assert error.extensions["code"] == bulk.BAD_USER_INPUT
+        assert [
+            (item["index"], item["field"]) for item in error.extensions["errors"]
+        ] == [(1, "color"), (2, "color.name"), (1, "name")]
+        assert not Color.objects.filter(name="Purple").exists()
+        assert Fruit.objects.count() == 1
+
+    def test_update_fruits(self):
+        """Test only the given fields are updated."""
+        result = self.execute(
+            UPDATE_FRUITS,
+            input=[
+                {"id": self.apple.pk, "name": "Orange", "color": {"name": "Orange"}}
+            ],
+        )
+        assert result.errors is None, result.errors
+        assert result.data["updateFruits"] == [
+            {"name": "Orange", "category": "CITRUS", "color": {"name": "Orange"}}
+        ]
+        self.apple.refresh_from_db()
+        assert self.apple.color.name == "Orange"
+
+        result = self.execute(UPDATE_FRUITS, input=[{"id": "0", "name": "Orange"}])
+        [error] = result.errors
+        assert error.extensions["errors"] == [
+            {"index": 0, "field": "id", "messages": ["Fruit 0 does not exist."]}
+        ]
+
+    def test_colors(self):
+        """Test colors are created with their fruits, updated and deleted."""
+        result = self.execute(
+            CREATE_COLORS,
+            input=[
+                {
+                    "name": "Yellow",
+                    "fruits": [
+                        {"name": "Banana", "category": "BERRY"},
+                        {"name": "Lemon", "category": "CITRUS"},
+                    ],
+                },
+                {"name": "Green"},
+            ],
+        )
+        assert result.errors is None, result.errors
+        assert result.data["createColors"] == [
+            {"name": "Yellow", "fruits": [{"name": "Banana"}, {"name": "Lemon"}]},
+            {"name": "Green", "fruits": []},
+        ]
+
+        yellow = Color.objects.get(name="Yellow")
+        result = self.execute(
+            """mutation Update($input: [ColorPartialInput!]!) {
+              updateColors(input: $input) { name }
+            }""",
+            input=[{"id": yellow.pk, "fruits": []}],
+        )
+        [error] = result.errors
+        assert error.extensions["errors"][0]["field"] == "fruits"
+
+        result = self.execute(
+            "mutation Delete($ids: [ID!]!) { deleteColors(ids: $ids) }",
+            ids=[yellow.pk, self.red.pk, "0", "invalid"],
+        )
+        assert result.data == {"deleteColors": 2}
+        assert list(Fruit.objects.values_list("name", flat=True)) == []
+
+    def test_delete_size(self):
+        """Test deleting more ids than the maximum is rejected."""
+        with mock.patch.object(bulk, "MAX_DELETE_SIZE", 1):
+            result = self.execute(
+                "mutation Delete($ids: [ID!]!) { deleteColors(ids: $ids) }",
+                ids=[self.red.pk, self.red.pk],
+            )
+        [error] = result.errors
+        assert error.extensions == {"code": bulk.BAD_USER_INPUT}
+        assert Color.objects.filter(pk=self.red.pk).exists()
+
+
+class PostBulkSaveTestCase(TestCase):
+    """Tests the receivers of `post_bulk_save`."""
+
+    def create_fruits(self) -> list[Fruit]:
+        """Create fruits in bulk and commit."""
+        with self.captureOnCommitCallbacks(execute=True):
+            return bulk.create_fruits(
+                [
+                    FruitInput(name=name, category=FruitCategory.BERRY)
+                    for name in ("Cherry", "Grape")
+                ]
+            )
+
+    def test_response_cache(self):
+        """Test the responses of the model are invalidated once."""
+        response_cache = ResponseCache(backend=LocalResponseCacheBackend())
+        response_cache.connect(Fruit)
+        self.addCleanup(response_cache.disconnect)
+        key = response_cache.get_version_key(get_tag(Fruit))
+        self.create_fruits()
+        # Bumped before and after the commit.
+        assert response_cache.backend.get_many([key]) == {key: 2}
+
+    async def test_model_events(self):
+        """Test the events of the created fruits are one message."""
+        broker = LocalBroker()
+        model_events = ModelEvents(broker, topic_prefix="test")
+        model_events.connect(Fruit, fields=["category"])
+        self.addCleanup(model_events.disconnect)
+        async with broker.subscribe(model_events.get_topic(Fruit)) as messages:
+            fruits = await sync_to_async(self.create_fruits)()
+            events = await asyncio.wait_for(anext(messages), 1)
+        assert events == [
+            {"action": "created", "pk": fruit.pk, "category": "berry"}
+            for fruit in fruits
+        ]
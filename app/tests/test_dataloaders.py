@@ -0,0 +1,102 @@
+"""Tests dataloaders in the app app."""
+
+import strawberry
+from asgiref.sync import async_to_sync, sync_to_async
+from django.test import TestCase
+
+from project.schema import PublicSchema
+from project.schema import schema as project_schema
+
+from ..dataloaders import DataLoaders, DataLoadersExtension
+from ..models import Color, Fruit, FruitCategory
+from ..types import Color as ColorType
+from ..types import Fruit as FruitType
+
+
+@strawberry.type
+class Query:
+    """Query resolving lists the optimizer does not see."""
+
+    @strawberry.field
+    async def fruits(self) -> list[FruitType]:
+        """Fruits evaluated before they are returned."""
+        return await sync_to_async(list)(Fruit.objects.order_by("pk"))
+
+    @strawberry.field
+    async def colors(self) -> list[ColorType]:
+        """Colors evaluated before they are returned."""
+        return await sync_to_async(list)(Color.objects.order_by("pk"))
+
+
+schema = PublicSchema(query=Query, extensions=[DataLoadersExtension])
+
+
+class DataLoadersTestCase(TestCase):
+    """Tests the dataloaders of the app app types."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create colors with a few fruits each."""
+        cls.colors = [Color.objects.create(name=name) for name in ("Red", "Green")]
+        for i in range(6):
+            Fruit.objects.create(
+                name=f"fruit{i}", category=FruitCategory.BERRY, color=cls.colors[i % 2]
+            )
+
+    def test_fruit_color(self):
+        """Test the colors of all fruits are loaded by one query."""
+        with self.assertNumQueries(2):
+            response = async_to_sync(schema.execute)(
+                "{ fruits { name color { name } } }"
+            )
+        assert response.errors is None, response.errors
+        assert [fruit["color"] for fruit in response.data["fruits"]] == [
+            {"name": "Red"},
+            {"name": "Green"},
+            {"name": "Red"},
+            {"name": "Green"},
+            {"name": "Red"},
+            {"name": "Green"},
+        ]
+
+    def test_color_fruits(self):
+        """Test the fruits of all colors are loaded by one query."""
+        query = "{ colors { name fruits { name } onlyPkByFruit { pk } } }"
+        with self.assertNumQueries(2):
+            response = async_to_sync(schema.execute)(query)
+        assert response.errors is None, response.errors
+        red, green = response.data["colors"]
+        assert [fruit["name"] for fruit in red["fruits"]] == [
+            "fruit0",
+            "fruit2",
+            "fruit4",
+        ]
+        assert len(green["onlyPkByFruit"]) == len(green["fruits"]) == 3
+
+    def test_nested(self):
+        """Test every level of nested relations is batched."""
+        query = "{ colors { fruits { color { fruits { name } } } } }"
+        with self.assertNumQueries(3):
+            response = async_to_sync(schema.execute)(query)
+        assert response.errors is None, response.errors
+
+    def test_optimized_relations_are_not_loaded(self):
+        """Test relations already fetched by the optimizer are used as is."""
+        query = "{ fruits { edges { node { color { fruits { name } } } } } }"
+        with self.assertNumQueries(2):
+            response = async_to_sync(project_schema.execute)(query)
+        assert response.errors is None, response.errors
+
+    def test_request_scoped(self):
+        """Test loaded rows are cached by the loaders of one operation only."""
+        fruit = Fruit.objects.get(name="fruit0")
+
+        async def load_color_twice(loaders: DataLoaders) -> list[str]:
+            first = await loaders.load(fruit, "color")
+            second = await loaders.load(fruit, "color")
+            return [first.name, second.name]
+
+        with self.assertNumQueries(1):
+            assert async_to_sync(load_color_twice)(DataLoaders()) == ["Red", "Red"]
+        with self.assertNumQueries(1):
+            assert async_to_sync(load_color_twice)(DataLoaders()) == ["Red", "Red"]
@@ -0,0 +1,165 @@
+"""Tests keyset pagination in the app app."""
+
+from datetime import datetime, timezone
+
+from django.test import TestCase
+
+from project.schema import schema
+
+from ..models import Color, Fruit, FruitCategory
+from ..pagination import decode_cursor, encode_cursor, get_keyset
+
+FRUITS_QUERY = """query Fruits($first: Int, $after: String, $last: Int, $before: String) {
+  fruits(first: $first, after: $after, last: $last, before: $before) {
+    edges {
+      cursor
+      node {
+        name
+      }
+    }
+    pageInfo {
+      hasNextPage
+      hasPreviousPage
+      startCursor
+      endCursor
+    }
+  }
+}"""
+
+
+class KeysetPaginationTestCase(TestCase):
+    """Tests the keyset connections of the app app query."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create fruits sharing created_at values, so id breaks the ties.
+
+        The values are the ones of auto_now_add, with their microseconds.
+        """
+        red = Color.objects.create(name="Red")
+        fruits = [
+            Fruit.objects.create(
+                name=f"fruit{i}",
+                category=FruitCategory.BERRY if i % 2 else FruitCategory.CITRUS,
+                color=red,
+            )
+            for i in range(5)
+        ]
+        for i, fruit in enumerate(fruits):
+            Fruit.objects.filter(pk=fruit.pk).update(
+                created_at=fruits[i - i % 2].created_at
+            )
+
+    def execute(self, query: str = FRUITS_QUERY, **variables) -> dict:
+        """Execute the query and return the data."""
+        response = schema.execute_sync(query, variable_values=variables)
+        assert response.errors is None, response.errors
+        return response.data
+
+    def names(self, connection: dict) -> list[str]:
+        """Names of the connection nodes."""
+        return [edge["node"]["name"] for edge in connection["edges"]]
+
+    def test_first_after(self):
+        """Test forward pagination walks every row once."""
+        page = self.execute(first=2)["fruits"]
+        assert self.names(page) == ["fruit0", "fruit1"]
+        assert page["pageInfo"]["hasNextPage"] is True
+        assert page["pageInfo"]["hasPreviousPage"] is False
+
+        with self.assertNumQueries(1):
+            page = self.execute(first=2, after=page["pageInfo"]["endCursor"])
+        page = page["fruits"]
+        assert self.names(page) == ["fruit2", "fruit3"]
+
+        page = self.execute(first=2, after=page["pageInfo"]["endCursor"])["fruits"]
+        assert self.names(page) == ["fruit4"]
+        assert page["pageInfo"]["hasNextPage"] is False
+        assert page["pageInfo"]["hasPreviousPage"] is True
+
+    def test_last_before(self):
+        """Test backward pagination keeps the forward order within a page."""
+        page = self.execute(last=2)["fruits"]
+        assert self.names(page) == ["fruit3", "fruit4"]
+        assert page["pageInfo"]["hasPreviousPage"] is True
+
+        page = self.execute(last=2, before=page["pageInfo"]["startCursor"])["fruits"]
+        assert self.names(page) == ["fruit1", "fruit2"]
+
+        page = self.execute(last=2, before=page["pageInfo"]["startCursor"])["fruits"]
+        assert self.names(page) == ["fruit0"]
+        assert page["pageInfo"]["hasPreviousPage"] is False
+        assert page["pageInfo"]["hasNextPage"] is True
+
+    def test_cursor_is_stable_after_insert(self):
+        """Test rows inserted before the cursor do not shift the next page."""
+        page = self.execute(first=2)["fruits"]
+        Fruit.objects.create(name="early", category=FruitCategory.BERRY)
+        Fruit.objects.filter(name="early").update(
+            created_at=datetime(2000, 1, 1, tzinfo=timezone.utc)
+        )
+        page = self.execute(first=2, after=page["pageInfo"]["endCursor"])["fruits"]
+        assert self.names(page) == ["fruit2", "fruit3"]
+
+    def test_cursor_keeps_microseconds(self):
+        """Test cursors decode to the exact keyset values of their row."""
+        queryset = Fruit.objects.order_by("created_at", "id")
+        values = [datetime(2024, 1, 1, 0, 0, 0, 123456, tzinfo=timezone.utc), 1]
+        cursor = encode_cursor(values)
+        assert decode_cursor(cursor, Fruit, get_keyset(queryset)) == values
+
+    def test_invalid_cursor(self):
+        """Test cursors that are not keyset cursors are rejected."""
+        response = schema.execute_sync(
+            FRUITS_QUERY, variable_values={"first": 1, "after": "YXJyYXk6MQ=="}
+        )
+        assert response.errors
+
+    def test_berries_keep_category_filter(self):
+        """Test Berry.get_queryset still filters the berries connection."""
+        data = self.execute(
+            """query Berries {
+              berries(first: 10) {
+                edges {
+                  node {
+                    name
+                    category
+                  }
+                }
+              }
+            }"""
+        )
+        assert [edge["node"]["name"] for edge in data["berries"]["edges"]] == [
+            "fruit1",
+            "fruit3",
+        ]
+
+    def test_colors(self):
+        """Test colors are paginated by id."""
+        Color.objects.create(name="Blue")
+        data = self.execute(
+            """query Colors {
+              colors(first: 1) {
+                edges {
+                  node {
+                    name
+                    fruits {
+                      name
+                    }
+                  }
+                }
+                pageInfo {
+                  hasNextPage
+                }
+              }
+            }"""
+        )
+        assert data["colors"]["edges"][0]["node"]["name"] == "Red"
+        assert len(data["colors"]["edges"][0]["node"]["fruits"]) == 5
+        assert data["colors"]["pageInfo"]["hasNextPage"] is True
+
+    async def test_async(self):
+        """Test the connection resolves in async context."""
+        response = await schema.execute(FRUITS_QUERY, variable_values={"first": 1})
+        assert response.errors is None, response.errors
+        assert self.names(response.data["fruits"]) == ["fruit0"]
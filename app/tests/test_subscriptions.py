@@ -0,0 +1,206 @@
+"""Tests subscriptions in the app app."""
+
+import asyncio
+from unittest import mock
+
+import pytest
+from django.test import AsyncRequestFactory, SimpleTestCase, TestCase
+
+from project.schema import schema
+from utils.strawberry.views import AsyncGraphQLView
+
+from ..models import Color, Fruit, FruitCategory
+
+from ..subscriptions import (
+    COMMAND_REJECTED,
+    SharedCommands,
+    command_admission,
+    exec_proc,
+    read_lines,
+    reap,
+)
+
+
+def stream_of(*chunks: bytes) -> asyncio.StreamReader:
+    """Return a stream fed with the chunks."""
+    stream = asyncio.StreamReader()
+    for chunk in chunks:
+        stream.feed_data(chunk)
+    stream.feed_eof()
+    return stream
+
+
+class SubscriptionsTestCase(SimpleTestCase):
+    """Tests the command subscription helpers."""
+
+    async def test_read_lines_last_line(self):
+        """Test complete lines are read, the last one even without newline."""
+        stream = stream_of(b"a\nb", b"c\n", b"d")
+        batches = [batch async for batch in read_lines(stream)]
+        assert [line for batch in batches for line in batch] == ["a", "bc", "d"]
+
+    async def test_read_lines(self):
+        """Test the lines buffered together are read as one batch."""
+        stream = stream_of(b"0\n1\n2\n", b"3\n")
+        assert [batch async for batch in read_lines(stream)] == [["0", "1", "2", "3"]]
+
+    async def test_read_lines_splits_long_lines(self):
+        """Test lines longer than the chunk size do not grow without bound."""
+        stream = stream_of(b"abcdef\n")
+        batches = [batch async for batch in read_lines(stream, chunk_size=4)]
+        assert batches == [["abcd"], ["ef"]]
+
+    async def test_reap(self):
+        """Test a process still running is killed and reaped."""
+        proc = await exec_proc(100)
+        assert await proc.stdout.readline() == b"0\n"
+        await reap(proc)
+        assert proc.returncode is not None
+
+    async def test_run_command(self):
+        """Test the subscription emits the output of the command."""
+        context = {"request": type("Request", (), {"scope": {"user": None}})()}
+        results = await schema.subscribe(
+            "subscription { runCommand(target: 3) }", context_value=context
+        )
+        outputs = [result.data["runCommand"] async for result in results]
+        assert outputs == ["0", "1", "2"]
+
+    async def test_run_command_rejected(self):
+        """Test commands are rejected once the admission queue is full."""
+        context = {"request": type("Request", (), {"scope": {"user": None}})()}
+        query = "subscription { runCommand(target: 1) }"
+        with mock.patch.multiple(command_admission, limit=1, max_queued=0):
+            await command_admission.acquire()
+            try:
+                results = await schema.subscribe(query, context_value=context)
+                [result] = [result async for result in results]
+            finally:
+                command_admission.release()
+        [error] = result.errors
+        assert error.extensions == {"code": COMMAND_REJECTED}
+        assert command_admission.running == 0
+
+    async def test_command_admission(self):
+        """Test the admission counts are exported."""
+        response = await schema.execute("{ commandAdmission { running queued } }")
+        assert response.data == {"commandAdmission": {"running": 0, "queued": 0}}
+
+
+class SharedCommandsTestCase(SimpleTestCase):
+    """Tests identical commands share one process."""
+
+    async def test_follow(self):
+        """Test followers share the process, late ones get the replayed lines."""
+        commands = SharedCommands(replay=2)
+        first = commands.follow(4)
+        assert await anext(first) == ["0"]
+        assert await anext(first) == ["1"]
+        assert await anext(first) == ["2"]
+
+        late = commands.follow(4)
+        assert await anext(late) == ["1", "2"]
+        assert len(commands.commands) == 1
+        assert commands.followers == 2
+        assert command_admission.running == 1
+
+        assert [batch async for batch in first] == [["3"]]
+        assert [batch async for batch in late] == [["3"]]
+        assert commands.commands == {}
+        assert command_admission.running == 0
+
+    async def test_last_follower_stops(self):
+        """Test the process is stopped when its last follower leaves."""
+        commands = SharedCommands()
+        first, second = commands.follow(100), commands.follow(100)
+        await anext(first)
+        await anext(second)
+        [command] = commands.commands.values()
+
+        await first.aclose()
+        assert not command.task.done()
+        await second.aclose()
+        assert commands.commands == {}
+        with pytest.raises(asyncio.CancelledError):
+            await command.task
+        assert command_admission.running == 0
+
+    async def test_command_error(self):
+        """Test every follower gets the error ending the command."""
+        commands = SharedCommands()
+        with mock.patch(
+            "app.subscriptions.exec_proc", side_effect=OSError("exec failed")
+        ):
+            errors = await asyncio.gather(
+                anext(commands.follow(1)),
+                anext(commands.follow(1)),
+                return_exceptions=True,
+            )
+        assert [str(error) for error in errors] == ["exec failed"] * 2
+        assert errors[0] is errors[1]
+        assert commands.commands == {}
+        assert command_admission.running == 0
+
+
+class StreamTestCase(TestCase):
+    """Tests lists streamed by chunks."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create fruits of two colors."""
+        cls.red = Color.objects.create(name="Red")
+        blue = Color.objects.create(name="Blue")
+        for i in range(5):
+            Fruit.objects.create(
+                name=f"Fruit {i}",
+                category=FruitCategory.BERRY,
+                color=cls.red if i % 2 == 0 else blue,
+            )
+
+    async def stream(self, query: str, **variables) -> list:
+        """Return the results of the subscription."""
+        results = await schema.subscribe(query, variable_values=variables)
+        return [result async for result in results]
+
+    async def test_stream_fruits(self):
+        """Test the rows are sent by chunks, in order."""
+        results = await self.stream(
+            "subscription { streamFruits(chunkSize: 2) { name color { name } } }"
+        )
+        assert [
+            [fruit["name"] for fruit in result.data["streamFruits"]]
+            for result in results
+        ] == [["Fruit 0", "Fruit 1"], ["Fruit 2", "Fruit 3"], ["Fruit 4"]]
+        assert results[0].data["streamFruits"][0]["color"] == {"name": "Red"}
+
+    async def test_stream_fruits_of_color(self):
+        """Test the fruits of a color are streamed."""
+        results = await self.stream(
+            "subscription Stream($colorId: ID) {"
+            "  streamFruits(chunkSize: 2, colorId: $colorId) { name }"
+            "}",
+            colorId=str(self.red.pk),
+        )
+        assert [result.data["streamFruits"] for result in results] == [
+            [{"name": "Fruit 0"}, {"name": "Fruit 2"}],
+            [{"name": "Fruit 4"}],
+        ]
+
+    async def test_stream_users(self):
+        """Test one empty chunk is sent without rows."""
+        [result] = await self.stream("subscription { streamUsers { username } }")
+        assert result.data == {"streamUsers": []}
+
+    async def test_multipart_http(self):
+        """Test the chunks are parts of a multipart HTTP response."""
+        view = AsyncGraphQLView.as_view(schema=schema)
+        request = AsyncRequestFactory().post(
+            "/graphql/",
+            {"query": "subscription { streamFruits(chunkSize: 2) { name } }"},
+            content_type="application/json",
+            headers={"accept": "multipart/mixed;boundary=graphql;subscriptionSpec=1.0"},
+        )
+        response = await view(request)
+        assert response["content-type"].startswith("multipart/mixed")
+        body = b"".join([part async for part in response.streaming_content])
+        assert body.count(b'"streamFruits"') == 3
@@ -7,7 +7,8 @@ References:
 """
 
 # from datetime import datetime
-from typing import Annotated, Union
+from enum import Enum
+from typing import Annotated, Optional, Union
 
 import strawberry
 import strawberry_django
@@ -19,6 +20,7 @@ from strawberry_django.fields.types import field_type_map
 from utils.strawberry_django.fields.field import CustomStrawberryDjangoField
 
 from . import models
+from .dataloaders import DataLoaderStrawberryDjangoField
 from .scalars import SlugScalar, UnixTimeStampScalar
 
 field_type_map.update(
@@ -29,7 +31,7 @@ field_type_map.update(
 )
 
 
-@strawberry_django.type(models.Fruit)
+@strawberry_django.type(models.Fruit, field_cls=DataLoaderStrawberryDjangoField)
 class Berry:
     """Fruit model type."""
 
@@ -48,7 +50,7 @@ class Berry:
         return queryset.filter(category="berry")
 
 
-@strawberry_django.type(models.Color)
+@strawberry_django.type(models.Color, field_cls=DataLoaderStrawberryDjangoField)
 class Color:
     """Color model type."""
 
@@ -67,12 +69,14 @@ class Color:
         # order=FruitOrder,
         # pagination=True,
         description="A list of fruits with this color",
+        field_cls=DataLoaderStrawberryDjangoField,
     )
 
 
 @strawberry_django.type(
     models.Fruit,
     description="Priority description than Fruit model description.",
+    field_cls=DataLoaderStrawberryDjangoField,
 )
 class Fruit:
     """Fruit model type."""
@@ -212,3 +216,58 @@ class LoginError:
 LoginResult = Annotated[
     Union[LoginSuccess, LoginError], strawberry.union("LoginResult")
 ]
+
+
+@strawberry.type
+class CommandAdmission:
+    """Admission of the `runCommand` subscriptions, to size the limit."""
+
+    running: int
+    queued: int
+    limit: int
+    max_queued: int
+    followers: int = strawberry.field(
+        description="Subscriptions following the running commands."
+    )
+
+
+@strawberry.enum
+class ModelChangeAction(Enum):
+    """Action of a model change."""
+
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+
+
+@strawberry.type
+class FruitChange:
+    """Fruit created, updated or deleted, see ``fruitChanged``."""
+
+    action: ModelChangeAction
+    id: strawberry.ID
+    category: models.FruitCategory
+    color_id: Optional[strawberry.ID]
+
+    @classmethod
+    def from_event(cls, event: dict) -> "FruitChange":
+        """Return the change of the event of `utils.broker.model_events`."""
+        return cls(
+            action=ModelChangeAction(event["action"]),
+            id=event["pk"],
+            category=models.FruitCategory(event["category"]),
+            color_id=event["color_id"],
+        )
+
+
+@strawberry.type
+class ColorChange:
+    """Color created, updated or deleted, see ``colorChanged``."""
+
+    action: ModelChangeAction
+    id: strawberry.ID
+
+    @classmethod
+    def from_event(cls, event: dict) -> "ColorChange":
+        """Return the change of the event of `utils.broker.model_events`."""
+        return cls(action=ModelChangeAction(event["action"]), id=event["pk"])
@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class MyPydanticConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'my_pydantic'
+
+    def ready(self):
+        """Override."""
+        from .pydantic.types import set_intern_cache
+
+        set_intern_cache(settings.IP_INTERN_CACHE_SIZE)
@@ -0,0 +1,6 @@
+"""The dhcpd.conf syntax of the pydantic models in my_pydantic app.
+
+References:
+    https://linux.die.net/man/5/dhcpd.conf
+    https://linux.die.net/man/5/dhcp-options
+"""
@@ -0,0 +1,474 @@
+"""Parse dhcpd.conf (dhcpd -6) into SharedNetwork models, streamed.
+
+The file is read line by line, through the buffered chunks of the file
+object, tokenized, and each ``shared-network`` block is validated and yielded
+as soon as its closing brace is read, so a file of hundreds of megabytes
+costs one block at a time.
+
+The syntax is the one of `my_pydantic.dhcpd.render`:
+
+* ``shared-network``: ``option dhcp6.name-servers``,
+  ``option dhcp6.domain-search``, ``preferred-lifetime``,
+  ``default-lease-time`` and ``subnet6`` blocks.
+* ``subnet6``: ``pool6`` blocks, ``range6`` statements (a pool without
+  class) and ``host`` blocks.
+* ``pool6``: ``allow members of``, the options, the lifetimes and ``range6``.
+* ``host``: ``host-identifier option dhcp6.client-id`` and
+  ``fixed-address6``, a bind of the pool whose range has the address. The
+  IAID is the one of the host name of `render.get_host_name`, 0 otherwise.
+
+Other top level statements, the global options and parameters, are skipped,
+the global scope is not modeled. Other statements in a block, e.g.
+``max-lease-time``, are skipped with their block and collected as
+`ParseWarning`. ``subnet6``, ``pool6``, ``range6`` and ``host`` out of their
+place, at the top level included, are errors, they would lose addresses;
+errors are `ParseError`, with the line and the column.
+
+Comment lines right before a ``shared-network`` are its ``description``.
+
+Examples:
+    Import a config file::
+
+        warnings = []
+        with open("dhcpd6.conf") as file:
+            for network in parse(file, warnings):
+                ...
+
+References:
+    https://linux.die.net/man/5/dhcpd.conf
+"""
+
+import re
+from ipaddress import AddressValueError, IPv6Address
+from typing import Any, Iterable, Iterator, NamedTuple, Optional
+
+from pydantic import ValidationError
+from pydantic_core import ErrorDetails
+
+from ..exceptions import convert_errors
+from ..pydantic.models import SharedNetwork
+
+# Spaces are skipped within the matches, they are as many as the tokens.
+TOKEN_RE = re.compile(
+    r"""
+    \s*
+    (?:
+    (?P<comment>\#.*)
+    | (?P<string>"(?:[^"\\]|\\.)*")
+    | (?P<punctuation>[{};,])
+    | (?P<word>[^\s{};,"\#]+)
+    | (?P<error>.)
+    )
+    """,
+    re.VERBOSE,
+)
+ESCAPE_RE = re.compile(r"\\(.)")
+HOST_NAME_RE = re.compile(r"^[0-9a-f]+-(?P<iaid>[0-9a-f]{8})$")
+
+# The dhcpd -6 options of the fields of `Option`.
+OPTIONS = {
+    "dhcp6.name-servers": "dns_servers",
+    "dhcp6.domain-search": "domain_list",
+}
+
+# Top level statements of addresses, which belong to a shared network.
+NETWORK_KEYWORDS = ("subnet6", "pool6", "range6", "host")
+
+COMMENT = "comment"
+STRING = "string"
+PUNCTUATION = "punctuation"
+
+Path = tuple[Any, ...]
+
+
+class Token(NamedTuple):
+    """A token, with its line and column from 1."""
+
+    kind: str
+    value: str
+    line: int
+    column: int
+
+
+class Node(NamedTuple):
+    """A statement, its words then its block, None when it ends with ``;``."""
+
+    words: list[Token]
+    block: Optional[list["Node"]]
+
+    @property
+    def keyword(self) -> str:
+        """Return the first word."""
+        return self.words[0].value
+
+
+class ParseError(ValueError):
+    """An error of the config, at its line and column."""
+
+    def __init__(
+        self,
+        message: str,
+        line: int,
+        column: int,
+        errors: Optional[list[ErrorDetails]] = None,
+    ) -> None:
+        """Initialize the ParseError.
+
+        Args:
+            message: The error.
+            line: The line of the error, from 1.
+            column: The column of the error, from 1.
+            errors: The `convert_errors` of an invalid shared network.
+        """
+        super().__init__(f"{message} (line {line}, column {column})")
+        self.line = line
+        self.column = column
+        self.errors = errors or []
+
+
+class ParseWarning(NamedTuple):
+    """A statement skipped, at its line and column."""
+
+    message: str
+    line: int
+    column: int
+
+    def __str__(self) -> str:
+        """Return the message with the location, as `ParseError`."""
+        return f"{self.message} (line {self.line}, column {self.column})"
+
+
+def tokenize(lines: Iterable[str]) -> Iterator[Token]:
+    """Yield the tokens of the lines, with the comments.
+
+    Raises:
+        ParseError: An unterminated string.
+    """
+    for number, line in enumerate(lines, start=1):
+        for match in TOKEN_RE.finditer(line):
+            kind = match.lastgroup
+            value = match.group(kind)  # type: ignore[arg-type]
+            column = match.start(kind) + 1  # type: ignore[arg-type]
+            if kind == "error":
+                raise ParseError(f"Unexpected {value!r}", number, column)
+            if kind == STRING:
+                value = ESCAPE_RE.sub(r"\1", value[1:-1])
+            yield Token(kind, value, number, column)  # type: ignore[arg-type]
+
+
+class Parser:
+    """Parse the statements of the tokens, see `parse`."""
+
+    def __init__(self, tokens: Iterator[Token]) -> None:
+        """Initialize the Parser."""
+        self.tokens = tokens
+        self.comments: list[Token] = []
+        self.last: Optional[Token] = None
+
+    def next(self) -> Optional[Token]:
+        """Return the next token, None at the end, collecting the comments."""
+        for token in self.tokens:
+            if token.kind == COMMENT:
+                self.comments.append(token)
+                continue
+            self.last = token
+            return token
+        return None
+
+    def error(self, message: str, token: Optional[Token]) -> ParseError:
+        """Return the error at the token, at the last one when None."""
+        token = token or self.last
+        if token is None:
+            return ParseError(message, 1, 1)
+        return ParseError(message, token.line, token.column)
+
+    def node(self, first: Token) -> Node:
+        """Return the statement starting at the token, with its block."""
+        words = [first]
+        while True:
+            token = self.next()
+            if token is None:
+                raise self.error("Unexpected end of file, expected ';' or '{'", None)
+            if token.kind != PUNCTUATION:
+                words.append(token)
+            elif token.value == ",":
+                continue
+            elif token.value == ";":
+                return Node(words, None)
+            elif token.value == "{":
+                return Node(words, self.block())
+            else:
+                raise self.error("Unexpected '}'", token)
+
+    def block(self) -> list[Node]:
+        """Return the statements until the closing brace."""
+        nodes = []
+        while True:
+            token = self.next()
+            if token is None:
+                raise self.error("Unexpected end of file, expected '}'", None)
+            if token.kind == PUNCTUATION:
+                if token.value == "}":
+                    return nodes
+                raise self.error(f"Unexpected {token.value!r}", token)
+            nodes.append(self.node(token))
+
+    def __iter__(self) -> Iterator[tuple[Node, list[Token]]]:
+        """Yield the top level statements, with the comments right before."""
+        while True:
+            self.comments = []
+            token = self.next()
+            if token is None:
+                return
+            if token.kind == PUNCTUATION:
+                raise self.error(f"Unexpected {token.value!r}", token)
+            comments = [
+                comment
+                for index, comment in enumerate(self.comments)
+                if comment.line + len(self.comments) - index == token.line
+            ]
+            yield self.node(token), comments
+
+
+class Builder:
+    """Build the payload of a shared network, keeping where its values are."""
+
+    def __init__(self, warnings: Optional[list[ParseWarning]] = None) -> None:
+        """Initialize the Builder.
+
+        Args:
+            warnings: The list collecting the skipped statements.
+        """
+        self.locations: dict[Path, Token] = {}
+        self.warnings = [] if warnings is None else warnings
+
+    def set(self, data: dict, path: Path, key: str, value: Any, token: Token) -> None:
+        """Set the value of the payload and its location."""
+        data[key] = value
+        self.locations[(*path, key)] = token
+
+    def values(self, node: Node, start: int, count: Optional[int] = None) -> list[str]:
+        """Return the values of the statement from ``start``, ``count`` of them."""
+        values = [token.value for token in node.words[start:]]
+        if not values or (count is not None and len(values) != count):
+            expected = "values" if count is None else f"{count} values"
+            raise ParseError(
+                f"{node.keyword} expects {expected}",
+                node.words[0].line,
+                node.words[0].column,
+            )
+        return values
+
+    def unexpected(self, node: Node, scope: str) -> ParseError:
+        """Return the error of a statement not supported in the scope."""
+        token = node.words[0]
+        kind = "block" if node.block is not None else "statement"
+        return ParseError(
+            f"Unexpected {kind} {token.value!r} in {scope}", token.line, token.column
+        )
+
+    def skip(self, node: Node, scope: str) -> None:
+        """Skip the statement not supported in the scope, with a warning.
+
+        Raises:
+            ParseError: A statement of addresses, they would be lost.
+        """
+        if node.keyword in NETWORK_KEYWORDS:
+            raise self.unexpected(node, scope)
+        token = node.words[0]
+        kind = "block" if node.block is not None else "statement"
+        self.warnings.append(
+            ParseWarning(
+                f"Skipped {kind} {token.value!r} in {scope}", token.line, token.column
+            )
+        )
+
+    def common(self, node: Node, data: dict, path: Path) -> bool:
+        """Set the option or the parameter of the statement, if it is one."""
+        keyword = node.keyword
+        if node.block is not None:
+            return False
+        if keyword == "option" and len(node.words) > 1:
+            key = OPTIONS.get(node.words[1].value)
+            if key is None:
+                return False
+            values = self.values(node, 2)
+            option = data.setdefault("option", {})
+            self.set(option, (*path, "option"), key, values, node.words[2])
+            return True
+        if keyword in ("preferred-lifetime", "default-lease-time"):
+            [value] = self.values(node, 1, 1)
+            key = "preferred_lifetime" if keyword[0] == "p" else "valid_lifetime"
+            parameter = data.setdefault("parameter", {})
+            self.set(parameter, (*path, "parameter"), key, value, node.words[1])
+            return True
+        return False
+
+    def address(self, token: Token) -> IPv6Address:
+        """Return the address of the token, parsed once for the validation."""
+        try:
+            return IPv6Address(token.value)
+        except AddressValueError as e:
+            raise ParseError(str(e), token.line, token.column) from e
+
+    def range6(self, node: Node, data: dict, path: Path) -> None:
+        """Set the addresses of the ``range6`` statement."""
+        self.values(node, 1, 2)
+        low, high = node.words[1:]
+        self.set(data, path, "low_address", self.address(low), low)
+        self.set(data, path, "high_address", self.address(high), high)
+
+    def pool6(self, node: Node, path: Path) -> dict:
+        """Return the IANA of the ``pool6`` block."""
+        data: dict = {"binds": []}
+        for child in node.block or ():
+            if self.common(child, data, path):
+                continue
+            values = [token.value for token in child.words]
+            if child.keyword == "range6" and child.block is None:
+                self.range6(child, data, path)
+            elif values[:3] == ["allow", "members", "of"] and child.block is None:
+                [klass] = self.values(child, 3, 1)
+                self.set(data, path, "klass", klass, child.words[3])
+            else:
+                self.skip(child, "pool6")
+        if "low_address" not in data:
+            token = node.words[0]
+            raise ParseError("pool6 expects range6", token.line, token.column)
+        return data
+
+    def host(self, node: Node) -> tuple[dict, dict[str, Token]]:
+        """Return the bind of the ``host`` block and the tokens of its values."""
+        [name] = self.values(node, 1, 1)
+        data: dict = {"iaid": "0"}
+        tokens = {"iaid": node.words[1]}
+        if match := HOST_NAME_RE.match(name):
+            iaid = match.group("iaid")
+            data["iaid"] = ":".join(iaid[i : i + 2] for i in range(0, 8, 2))
+        for child in node.block or ():
+            values = [token.value for token in child.words]
+            if child.block is not None:
+                self.skip(child, "host")
+            elif values[:3] == ["host-identifier", "option", "dhcp6.client-id"]:
+                [data["duid"]] = self.values(child, 3, 1)
+                tokens["duid"] = child.words[3]
+            elif child.keyword == "fixed-address6":
+                self.values(child, 1, 1)
+                tokens["ip6_address"] = child.words[1]
+                data["ip6_address"] = self.address(child.words[1])
+            else:
+                self.skip(child, "host")
+        if "duid" not in data or "ip6_address" not in data:
+            raise ParseError(
+                "host expects host-identifier and fixed-address6",
+                node.words[0].line,
+                node.words[0].column,
+            )
+        return data, tokens
+
+    def subnet6(self, node: Node, path: Path) -> dict:
+        """Return the Subnet6 of the ``subnet6`` block."""
+        [number] = self.values(node, 1, 1)
+        data: dict = {"pools": []}
+        self.set(data, path, "subnet6_number", number, node.words[1])
+        hosts = []
+        for child in node.block or ():
+            pool_path = (*path, "pools", len(data["pools"]))
+            if child.keyword == "pool6" and child.block is not None:
+                data["pools"].append(self.pool6(child, pool_path))
+            elif child.keyword == "range6" and child.block is None:
+                pool: dict = {"binds": []}
+                self.range6(child, pool, pool_path)
+                data["pools"].append(pool)
+            elif child.keyword == "host" and child.block is not None:
+                hosts.append(child)
+            else:
+                self.skip(child, "subnet6")
+        ranges = [(pool["low_address"], pool["high_address"]) for pool in data["pools"]]
+        for host in hosts:
+            self.bind(host, data["pools"], ranges, path)
+        return data
+
+    def bind(
+        self,
+        node: Node,
+        pools: list[dict],
+        ranges: list[tuple[IPv6Address, IPv6Address]],
+        path: Path,
+    ) -> None:
+        """Add the bind of the host to the pool whose range has its address."""
+        data, tokens = self.host(node)
+        value = data["ip6_address"]
+        for index, (low, high) in enumerate(ranges):
+            if low <= value <= high:
+                break
+        else:
+            address = tokens["ip6_address"]
+            raise ParseError(
+                f"host {node.words[1].value!r} is in no range6",
+                address.line,
+                address.column,
+            )
+        binds = pools[index]["binds"]
+        bind_path = (*path, "pools", index, "binds", len(binds))
+        for key, token in tokens.items():
+            self.locations[(*bind_path, key)] = token
+        binds.append(data)
+
+    def shared_network(self, node: Node, comments: list[Token]) -> dict:
+        """Return the payload of the ``shared-network`` block."""
+        [name] = self.values(node, 1, 1)
+        data: dict = {"option": {}, "subnets": []}
+        self.locations[()] = node.words[0]
+        self.set(data, (), "name", name, node.words[1])
+        if comments:
+            description = "\n".join(c.value[1:].strip() for c in comments)
+            self.set(data, (), "description", description, comments[0])
+        for child in node.block or ():
+            if self.common(child, data, ()):
+                continue
+            if child.keyword == "subnet6" and child.block is not None:
+                subnet_path = ("subnets", len(data["subnets"]))
+                data["subnets"].append(self.subnet6(child, subnet_path))
+            else:
+                self.skip(child, "shared-network")
+        return data
+
+    def locate(self, loc: Path) -> Token:
+        """Return the token of the longest known prefix of the error location."""
+        for end in range(len(loc), -1, -1):
+            if token := self.locations.get(tuple(loc[:end])):
+                return token
+        return self.locations[()]
+
+
+def parse(
+    lines: Iterable[str], warnings: Optional[list[ParseWarning]] = None
+) -> Iterator[SharedNetwork]:
+    """Yield the validated shared networks of the lines, e.g. of a file.
+
+    The statements skipped in the blocks are appended to ``warnings``, as they
+    are read.
+
+    Raises:
+        ParseError: The syntax is not valid, or a shared network is not, with
+            its `convert_errors`, located at the first error.
+    """
+    for node, comments in Parser(tokenize(lines)):
+        builder = Builder(warnings)
+        if node.keyword in NETWORK_KEYWORDS:
+            raise builder.unexpected(node, "the global scope")
+        if node.keyword != "shared-network" or node.block is None:
+            continue
+        data = builder.shared_network(node, comments)
+        try:
+            yield SharedNetwork.model_validate(data)
+        except ValidationError as e:
+            errors = convert_errors(e)
+            token = builder.locate(errors[0]["loc"])
+            raise ParseError(
+                f"Invalid shared-network {data['name']!r}: {errors[0]['msg']}",
+                token.line,
+                token.column,
+                errors,
+            ) from e
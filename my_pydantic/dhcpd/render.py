@@ -0,0 +1,183 @@
+"""Render SharedNetwork models to dhcpd.conf (dhcpd -6) syntax, streamed.
+
+The statements are generated one line at a time and joined into chunks of
+about `CHUNK_SIZE` characters, so the config is never built in memory: a
+shared network of hundreds of thousands of binds costs one chunk at a time.
+The chunks go straight to a file with `write`, or to an HTTP response.
+
+Layout of a shared network::
+
+    # description
+    shared-network name {
+        option dhcp6.name-servers 2001:4860:4860::8888;
+        preferred-lifetime 300;
+        default-lease-time 600;
+        subnet6 2001:db8::/64 {
+            pool6 {
+                allow members of "klass";
+                range6 2001:db8::100 2001:db8::1ff;
+            }
+            host 000300011a2b3c4d5e6f7a8b-1a2b3c4d {
+                host-identifier option dhcp6.client-id 00:03:00:01:1a:2b:3c:4d:5e:6f:7a:8b;
+                fixed-address6 2001:db8::101;
+            }
+        }
+    }
+
+``pool6`` does not accept host declarations, the binds of a pool are
+declared in its subnet6. IPv4 name servers have no dhcpd -6 option and are
+not rendered.
+
+Examples:
+    Write a config file::
+
+        with open("dhcpd6.conf", "w") as file:
+            write(networks, file)
+
+    Stream it as an HTTP response::
+
+        StreamingHttpResponse(render(networks), content_type="text/plain")
+
+References:
+    https://linux.die.net/man/5/dhcpd.conf
+    https://linux.die.net/man/5/dhcp-options
+"""
+
+from typing import IO, Iterable, Iterator
+
+from ..pydantic.models import IANA, Bind, Option, Parameter, SharedNetwork, Subnet6
+from ..pydantic.types import get_duid_bytes, get_iaid_bytes
+
+INDENT = "    "
+CHUNK_SIZE = 64 * 1024
+
+
+def quote(value: str) -> str:
+    """Return the value as a dhcpd.conf string."""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def get_host_name(bind: Bind) -> str:
+    """Return the unique name of the host of the bind.
+
+    Its canonical DUID then IAID in hex, so the IAID is parsed back.
+    """
+    return f"{get_duid_bytes(bind.duid).hex()}-{get_iaid_bytes(bind.iaid).hex()}"
+
+
+def render_option(option: Option, depth: int) -> Iterator[str]:
+    """Yield the lines of the option."""
+    indent = INDENT * depth
+    if option.dns_servers:
+        servers = [
+            address.compressed for address in option.dns_servers if address.version == 6
+        ]
+        if servers:
+            yield f"{indent}option dhcp6.name-servers {', '.join(servers)};\n"
+    if option.domain_list:
+        domains = ", ".join(quote(domain) for domain in option.domain_list)
+        yield f"{indent}option dhcp6.domain-search {domains};\n"
+
+
+def render_parameter(parameter: Parameter, depth: int) -> Iterator[str]:
+    """Yield the lines of the parameter."""
+    indent = INDENT * depth
+    yield f"{indent}preferred-lifetime {parameter.preferred_lifetime};\n"
+    yield f"{indent}default-lease-time {parameter.valid_lifetime};\n"
+
+
+def render_bind(bind: Bind, depth: int) -> Iterator[str]:
+    """Yield the lines of the host of the bind."""
+    indent = INDENT * depth
+    yield (
+        f"{indent}host {get_host_name(bind)} {{\n"
+        f"{indent}{INDENT}host-identifier option dhcp6.client-id "
+        f"{get_duid_bytes(bind.duid).hex(':')};\n"
+        f"{indent}{INDENT}fixed-address6 {bind.ip6_address.compressed};\n"
+        f"{indent}}}\n"
+    )
+
+
+def render_iana(iana: IANA, depth: int) -> Iterator[str]:
+    """Yield the lines of the pool6 of the IANA, without its binds."""
+    indent = INDENT * depth
+    yield f"{indent}pool6 {{\n"
+    if iana.klass:
+        yield f"{indent}{INDENT}allow members of {quote(iana.klass)};\n"
+    if iana.option:
+        yield from render_option(iana.option, depth + 1)
+    if iana.parameter:
+        yield from render_parameter(iana.parameter, depth + 1)
+    yield (
+        f"{indent}{INDENT}range6 {iana.low_address.compressed} "
+        f"{iana.high_address.compressed};\n"
+    )
+    yield f"{indent}}}\n"
+
+
+def render_subnet6(subnet6: Subnet6, depth: int) -> Iterator[str]:
+    """Yield the lines of the subnet6, its pools then their binds."""
+    indent = INDENT * depth
+    yield f"{indent}subnet6 {subnet6.subnet6_number.compressed} {{\n"
+    for iana in subnet6.pools or ():
+        yield from render_iana(iana, depth + 1)
+    for iana in subnet6.pools or ():
+        for bind in iana.binds or ():
+            yield from render_bind(bind, depth + 1)
+    yield f"{indent}}}\n"
+
+
+def render_shared_network(network: SharedNetwork, depth: int = 0) -> Iterator[str]:
+    """Yield the lines of the shared network."""
+    indent = INDENT * depth
+    if network.description:
+        for line in network.description.splitlines():
+            yield f"{indent}# {line}\n"
+    yield f"{indent}shared-network {network.name} {{\n"
+    yield from render_option(network.option, depth + 1)
+    yield from render_parameter(network.parameter, depth + 1)
+    for subnet6 in network.subnets or ():
+        yield from render_subnet6(subnet6, depth + 1)
+    yield f"{indent}}}\n"
+
+
+def join_chunks(lines: Iterable[str], chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Join the lines into chunks of at least ``chunk_size`` characters."""
+    buffer: list[str] = []
+    size = 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= chunk_size:
+            yield "".join(buffer)
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def render(
+    networks: Iterable[SharedNetwork], chunk_size: int = CHUNK_SIZE
+) -> Iterator[str]:
+    """Yield the config of the shared networks, by chunks.
+
+    The networks are consumed lazily, e.g. from a generator validating them.
+    """
+
+    def lines() -> Iterator[str]:
+        for index, network in enumerate(networks):
+            if index:
+                yield "\n"
+            yield from render_shared_network(network)
+
+    return join_chunks(lines(), chunk_size)
+
+
+def write(
+    networks: Iterable[SharedNetwork], file: IO[str], chunk_size: int = CHUNK_SIZE
+) -> int:
+    """Write the config of the shared networks, returns the characters written."""
+    written = 0
+    for chunk in render(networks, chunk_size):
+        written += file.write(chunk)
+    return written
@@ -22,6 +22,18 @@ class OptionInput: ...
 class ParameterInput: ...
 
 
+@strawberry.experimental.pydantic.input(model=models.Bind)
+class BindInput:
+    # DUID and IAID are constrained strings, validated by the pydantic model.
+    duid: str
+    iaid: str
+    ip6_address: strawberry.auto
+
+
+@strawberry.experimental.pydantic.input(model=models.IANA, all_fields=True)
+class IANAInput: ...
+
+
 @strawberry.experimental.pydantic.input(model=models.Subnet6, all_fields=True)
 class Subnet6Input: ...
 
@@ -0,0 +1,75 @@
+"""Benchmark the aggregation of networks on random prefixes.
+
+The prefixes are /48 to /64 of 2001:db8::/32, so some overlap or touch and
+most stay apart, the worst case for the number of networks created. The best
+time of ``--repeat`` runs is reported, like `timeit`.
+
+Examples:
+    100k prefixes::
+
+        python manage.py benchmark_aggregation --prefixes 100000
+"""
+
+import random
+import time
+from ipaddress import IPv6Network, collapse_addresses
+
+from django.core.management.base import BaseCommand
+
+from ...pydantic.aggregation import collapse, exclude, summarize
+
+
+class Command(BaseCommand):
+    """Benchmark `my_pydantic.pydantic.aggregation`."""
+
+    help = "Benchmark collapsing, summarizing and excluding random prefixes"
+
+    def add_arguments(self, parser):
+        """Override."""
+        parser.add_argument(
+            "--prefixes",
+            type=int,
+            default=100000,
+            help="The number of prefixes (default: 100000)",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="The seed of the random prefixes (default: 0)",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="The number of runs of each function (default: 5)",
+        )
+
+    def handle(self, *args, **options):
+        """Override."""
+        rng = random.Random(options["seed"])
+        networks = [
+            IPv6Network(
+                (0x2001_0DB8 << 96 | rng.getrandbits(32) << 64, rng.randrange(48, 65)),
+                strict=False,
+            )
+            for _ in range(options["prefixes"])
+        ]
+        excluded = networks[::2]
+        for name, function in (
+            ("collapse", lambda: collapse(networks)),
+            ("summarize", lambda: summarize(networks)),
+            ("exclude", lambda: exclude(networks, excluded)),
+            (
+                "ipaddress.collapse_addresses",
+                lambda: list(collapse_addresses(networks)),
+            ),
+        ):
+            elapsed = float("inf")
+            for _ in range(options["repeat"]):
+                start = time.perf_counter()
+                found = function()
+                elapsed = min(elapsed, time.perf_counter() - start)
+            self.stdout.write(
+                f"{name}: {len(networks)} prefixes into {len(found)} in {elapsed:.3f}s"
+            )
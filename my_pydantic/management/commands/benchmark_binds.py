@@ -0,0 +1,64 @@
+"""Benchmark the uniqueness checks of the binds, see `pydantic.binds`.
+
+Examples:
+    A million binds, a hundred of them conflicting::
+
+        python manage.py benchmark_binds --binds 1000000 --conflicts 100
+"""
+
+import time
+from ipaddress import IPv6Address
+
+from django.core.management.base import BaseCommand
+
+from ...pydantic.binds import find_bind_conflicts
+from ...pydantic.models import Bind
+
+
+class Command(BaseCommand):
+    """Benchmark `find_bind_conflicts`."""
+
+    help = "Benchmark the uniqueness checks of the binds"
+
+    def add_arguments(self, parser):
+        """Override."""
+        parser.add_argument(
+            "--binds",
+            type=int,
+            default=1_000_000,
+            help="The number of binds (default: 1000000)",
+        )
+        parser.add_argument(
+            "--conflicts",
+            type=int,
+            default=100,
+            help="The number of binds reusing an address (default: 100)",
+        )
+
+    def handle(self, *args, **options):
+        """Override."""
+        count, conflicts = options["binds"], options["conflicts"]
+        base = int(IPv6Address("2001:db8::"))
+        start = time.perf_counter()
+        binds = [
+            (
+                index,
+                Bind.model_construct(
+                    # Half the DUIDs with separators, as they are normalized.
+                    duid=f"0003{index:020X}" if index % 2 else f"00:03:{index:020x}",
+                    iaid=str(index % 7),
+                    ip6_address=IPv6Address(base + index % (count - conflicts)),
+                ),
+            )
+            for index in range(count)
+        ]
+        generated = time.perf_counter() - start
+
+        start = time.perf_counter()
+        found = find_bind_conflicts(binds)
+        checked = time.perf_counter() - start
+        self.stdout.write(f"generated: {count} binds in {generated:.2f}s")
+        self.stdout.write(
+            f"checked:   {len(found)} conflicts in {checked:.2f}s, "
+            f"{count / checked:.0f} binds/s"
+        )
@@ -0,0 +1,110 @@
+"""Benchmark the dhcpd.conf parser on a generated config.
+
+The config is rendered to a temporary file, then parsed back one shared
+network at a time; the peak resident memory shows it is not loaded whole.
+
+Examples:
+    About 190 MB of config::
+
+        python manage.py benchmark_dhcpd_parser --networks 100 --binds 10000
+"""
+
+import resource
+import tempfile
+import time
+from ipaddress import IPv6Address, IPv6Network
+from typing import Iterator
+
+from django.core.management.base import BaseCommand
+
+from ...dhcpd.parse import parse
+from ...dhcpd.render import write
+from ...pydantic.models import IANA, Bind, Option, Parameter, SharedNetwork, Subnet6
+
+
+def generate(networks: int, binds: int) -> Iterator[SharedNetwork]:
+    """Yield shared networks of one subnet6 and one pool of ``binds`` binds."""
+    for index in range(networks):
+        prefix = IPv6Network(f"2001:db8:{index:x}::/64")
+        low = int(prefix.network_address) + 0x100
+        yield SharedNetwork(
+            name=f"network_{index}",
+            option=Option(dns_servers=["2001:4860:4860::8888"]),
+            parameter=Parameter(preferred_lifetime=300, valid_lifetime=600),
+            subnets=[
+                Subnet6(
+                    subnet6_number=prefix,
+                    pools=[
+                        IANA(
+                            low_address=IPv6Address(low),
+                            high_address=IPv6Address(low + binds - 1),
+                            binds=[
+                                Bind.model_construct(
+                                    duid=f"0003{index:08X}{bind:012X}",
+                                    iaid=str(bind),
+                                    ip6_address=IPv6Address(low + bind),
+                                )
+                                for bind in range(binds)
+                            ],
+                        )
+                    ],
+                )
+            ],
+        )
+
+
+def get_max_rss() -> float:
+    """Return the peak resident memory of the process in MB."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Command(BaseCommand):
+    """Benchmark `my_pydantic.dhcpd.parse`."""
+
+    help = "Benchmark the dhcpd.conf parser on a generated config"
+
+    def add_arguments(self, parser):
+        """Override."""
+        parser.add_argument(
+            "--networks",
+            type=int,
+            default=10,
+            help="The number of shared networks (default: 10)",
+        )
+        parser.add_argument(
+            "--binds",
+            type=int,
+            default=10000,
+            help="The number of binds of each network (default: 10000)",
+        )
+
+    def handle(self, *args, **options):
+        """Override."""
+        with tempfile.NamedTemporaryFile("w+", suffix=".conf") as file:
+            start = time.perf_counter()
+            size = write(generate(options["networks"], options["binds"]), file)
+            file.flush()
+            file.seek(0)
+            rendered = time.perf_counter() - start
+            rss = get_max_rss()
+
+            start = time.perf_counter()
+            networks = binds = 0
+            for network in parse(file):
+                networks += 1
+                binds += sum(
+                    len(iana.binds or ())
+                    for subnet6 in network.subnets or ()
+                    for iana in subnet6.pools or ()
+                )
+            parsed = time.perf_counter() - start
+
+        megabytes = size / 1024 / 1024
+        self.stdout.write(f"config:  {megabytes:.1f} MB, rendered in {rendered:.2f}s")
+        self.stdout.write(
+            f"parsed:  {networks} networks, {binds} binds in {parsed:.2f}s, "
+            f"{megabytes / parsed:.1f} MB/s, {binds / parsed:.0f} binds/s"
+        )
+        self.stdout.write(
+            f"max rss: {rss:.1f} MB before parsing, {get_max_rss():.1f} MB after"
+        )
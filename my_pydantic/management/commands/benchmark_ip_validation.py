@@ -0,0 +1,114 @@
+"""Benchmark the validation of lists of IPAddress and IPNetwork.
+
+The strings are validated by the former types, parsing in the union then
+again in an after validator, and by `IPAddress` and `IPNetwork`, without and
+with the intern cache; then the parsed objects, as they come from the
+scalars, are validated again.
+
+Examples:
+    100k addresses, 1000 of them distinct::
+
+        python manage.py benchmark_ip_validation --values 100000 --distinct 1000
+"""
+
+import random
+import time
+from ipaddress import (
+    IPv4Address,
+    IPv4Network,
+    IPv6Address,
+    IPv6Network,
+    ip_address,
+    ip_network,
+)
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from pydantic import AfterValidator, PlainSerializer, TypeAdapter
+from typing_extensions import Annotated
+
+from ...pydantic import types
+from ...pydantic.types import IPAddress, IPNetwork, set_intern_cache
+
+FormerIPAddress = Annotated[
+    IPv4Address | IPv6Address,
+    AfterValidator(lambda v: ip_address(v)),
+    PlainSerializer(str, return_type=str),
+]
+
+FormerIPNetwork = Annotated[
+    IPv4Network | IPv6Network,
+    AfterValidator(lambda v: ip_network(v)),
+    PlainSerializer(str, return_type=str),
+]
+
+
+def get_values(count: int, distinct: int, network: bool) -> list[str]:
+    """Return ``count`` strings of ``distinct`` IPv4 and IPv6 values, shuffled."""
+    rng = random.Random(0)
+    values = []
+    for index in range(distinct):
+        if index % 2:
+            value = str(IPv6Address(0x2001_0DB8 << 96 | rng.getrandbits(64) << 64))
+        else:
+            value = str(IPv4Address(rng.getrandbits(24) << 8))
+        values.append(f"{value}/{64 if index % 2 else 24}" if network else value)
+    return [values[rng.randrange(distinct)] for _ in range(count)]
+
+
+class Command(BaseCommand):
+    """Benchmark `my_pydantic.pydantic.types.IPAddress` and `IPNetwork`."""
+
+    help = "Benchmark the validation of lists of IP addresses and networks"
+
+    def add_arguments(self, parser):
+        """Override."""
+        parser.add_argument(
+            "--values",
+            type=int,
+            default=100000,
+            help="The number of values of each list (default: 100000)",
+        )
+        parser.add_argument(
+            "--distinct",
+            type=int,
+            default=1000,
+            help="The number of distinct values (default: 1000)",
+        )
+        parser.add_argument(
+            "--cache-size",
+            type=int,
+            default=1024,
+            help="The size of the intern cache (default: 1024)",
+        )
+
+    def measure(self, name: str, adapter: TypeAdapter, values: list[Any]) -> Any:
+        """Write the throughput of the validation of the values."""
+        start = time.perf_counter()
+        validated = adapter.validate_python(values)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f"{name:<32} {len(values) / elapsed:>12,.0f} values/s ({elapsed:.3f}s)"
+        )
+        return validated
+
+    def handle(self, *args, **options):
+        """Override."""
+        previous = types.intern_caches[types.ADDRESS]
+        for kind, former, current in (
+            ("IPAddress", FormerIPAddress, IPAddress),
+            ("IPNetwork", FormerIPNetwork, IPNetwork),
+        ):
+            values = get_values(
+                options["values"], options["distinct"], kind == "IPNetwork"
+            )
+            former_adapter = TypeAdapter(list[former])
+            adapter = TypeAdapter(list[current])
+            self.measure(f"{kind} former", former_adapter, values)
+            set_intern_cache(0)
+            parsed = self.measure(f"{kind}", adapter, values)
+            set_intern_cache(options["cache_size"])
+            self.measure(f"{kind} interned", adapter, values)
+            self.measure(f"{kind} former, parsed", former_adapter, parsed)
+            self.measure(f"{kind}, parsed", adapter, parsed)
+        set_intern_cache(previous.maxsize if previous else 0)
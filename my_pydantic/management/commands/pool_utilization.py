@@ -0,0 +1,119 @@
+"""Report the utilization of the pools of a dhcpd.conf, as CSV.
+
+The config is parsed one shared network at a time, see
+`my_pydantic.dhcpd.parse`, and a row is written per Subnet6, and per IANA
+pool with ``--pools``, see `my_pydantic.pydantic.utilization`. The statements
+skipped by the parser are written to the standard error.
+
+Examples:
+    The subnets and their pools::
+
+        python manage.py pool_utilization dhcpd6.conf --pools
+
+    Or from the standard input::
+
+        cat dhcpd6.conf | python manage.py pool_utilization -
+"""
+
+import contextlib
+import csv
+import io
+import itertools
+import sys
+from typing import Iterable, Iterator
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...dhcpd.parse import ParseError, ParseWarning, parse
+from ...pydantic.models import SharedNetwork
+from ...pydantic.utilization import Utilization, get_subnet_utilizations
+
+HEADER = [
+    "shared_network",
+    "subnet6_number",
+    "low_address",
+    "high_address",
+    "size",
+    "used",
+    "free",
+    "percent",
+    "fragmentation",
+    "free_blocks",
+    "largest_free_block",
+]
+
+
+def get_columns(utilization: Utilization) -> list:
+    """Return the columns of the utilization, from size on."""
+    return [
+        utilization.size,
+        utilization.used,
+        utilization.free,
+        f"{utilization.percent:.2f}",
+        f"{utilization.fragmentation:.4f}",
+        utilization.free_blocks,
+        utilization.largest_free_block,
+    ]
+
+
+def get_rows(networks: Iterable[SharedNetwork], pools: bool) -> Iterator[list]:
+    """Yield the row of each subnet, followed by the rows of its pools."""
+    for subnet in get_subnet_utilizations(networks):
+        yield [subnet.shared_network, subnet.subnet6_number, "", ""] + get_columns(
+            subnet.utilization
+        )
+        if not pools:
+            continue
+        for pool in subnet.pools:
+            yield [
+                subnet.shared_network,
+                subnet.subnet6_number,
+                pool.pool.low_address,
+                pool.pool.high_address,
+            ] + get_columns(pool.utilization)
+
+
+class Command(BaseCommand):
+    """Report the utilization of the pools of a dhcpd.conf."""
+
+    help = "Report the utilization of the subnets and pools of a dhcpd.conf as CSV"
+
+    def add_arguments(self, parser):
+        """Override."""
+        parser.add_argument(
+            "input",
+            help="The dhcpd.conf (dhcpd -6) file, - for the standard input",
+        )
+        parser.add_argument(
+            "--pools",
+            action="store_true",
+            help="Write a row per pool after the row of its subnet",
+        )
+
+    def handle(self, *args, **options):
+        """Override."""
+        if options["input"] == "-":
+            source: contextlib.AbstractContextManager = contextlib.nullcontext(
+                sys.stdin
+            )
+        else:
+            try:
+                source = open(options["input"])
+            except OSError as e:
+                raise CommandError(str(e)) from e
+        # Each row is formatted into the buffer, then written as it is read.
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        warnings: list[ParseWarning] = []
+        with source as file:
+            rows = get_rows(parse(file, warnings), options["pools"])
+            try:
+                for row in itertools.chain([HEADER], rows):
+                    writer.writerow(row)
+                    self.stdout.write(buffer.getvalue(), ending="")
+                    buffer.seek(0)
+                    buffer.truncate()
+            except ParseError as e:
+                raise CommandError(str(e)) from e
+        for warning in warnings:
+            self.stderr.write(f"Warning: {warning}")
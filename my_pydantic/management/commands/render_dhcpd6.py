@@ -0,0 +1,73 @@
+"""Render SharedNetwork payloads to a dhcpd.conf, see `my_pydantic.dhcpd.render`.
+
+The payloads are JSON Lines, one SharedNetwork per line, validated and
+rendered one at a time, so the memory is bounded by the largest network.
+
+Examples:
+    Render a file of payloads::
+
+        python manage.py render_dhcpd6 networks.jsonl --output dhcpd6.conf
+
+    Or from the standard input::
+
+        cat networks.jsonl | python manage.py render_dhcpd6 -
+"""
+
+import contextlib
+import sys
+from typing import IO, Iterator
+
+from django.core.management.base import BaseCommand, CommandError
+from pydantic import ValidationError
+
+from ...dhcpd.render import render, write
+from ...exceptions import convert_errors
+from ...pydantic.models import SharedNetwork
+
+
+def read_networks(file: IO[str]) -> Iterator[SharedNetwork]:
+    """Yield the shared networks of the JSON Lines, skipping blank lines.
+
+    Raises:
+        CommandError: A line is not a valid SharedNetwork.
+    """
+    for number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield SharedNetwork.model_validate_json(line)
+        except ValidationError as e:
+            raise CommandError(f"Line {number}: {convert_errors(e)}") from e
+
+
+class Command(BaseCommand):
+    """Render SharedNetwork payloads to a dhcpd.conf."""
+
+    help = "Render SharedNetwork JSON Lines to dhcpd.conf (dhcpd -6) syntax"
+
+    def add_arguments(self, parser):
+        """Override."""
+        parser.add_argument(
+            "input",
+            help="The JSON Lines file of the payloads, - for the standard input",
+        )
+        parser.add_argument(
+            "--output",
+            help="The config file to write (default: the standard output)",
+        )
+
+    def handle(self, *args, **options):
+        """Override."""
+        if options["input"] == "-":
+            source: contextlib.AbstractContextManager = contextlib.nullcontext(
+                sys.stdin
+            )
+        else:
+            source = open(options["input"])
+        with source as file:
+            if options["output"]:
+                with open(options["output"], "w") as output:
+                    write(read_networks(file), output)
+            else:
+                for chunk in render(read_networks(file)):
+                    self.stdout.write(chunk, ending="")
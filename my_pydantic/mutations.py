@@ -5,20 +5,50 @@ References:
 
 """
 
+from django.conf import settings
 from graphql import GraphQLError
 from pydantic import ValidationError
+from pydantic_core import to_jsonable_python
+from strawberry.scalars import JSON
 from strawberry.types import Info
 
 from .exceptions import convert_errors
 from .inputs import SharedNetworkInput
-from .types import SharedNetwork
+from .registry import shared_networks
+from .types import SharedNetwork, SharedNetworkValidation
+from .validation import avalidate_shared_networks
 
 
 def save_shared_network(info: Info, input: SharedNetworkInput) -> SharedNetwork:
-    """Resolve save_shared_network."""
+    """Resolve save_shared_network, in the registry of the shared networks."""
     try:
         instance = input.to_pydantic()
     except ValidationError as e:
         errors = convert_errors(e)
         raise GraphQLError(f"{errors}") from e
+    try:
+        shared_networks.save(instance)
+    except ValueError as e:
+        raise GraphQLError(str(e)) from e
     return SharedNetwork.from_pydantic(instance)
+
+
+async def validate_shared_networks(
+    info: Info, payloads: list[JSON]
+) -> list[SharedNetworkValidation]:
+    """Resolve validate_shared_networks, in a process pool for large batches.
+
+    The payloads are JSON with the field names of the pydantic models, so an
+    invalid value fails its own payload only, not the whole operation.
+    """
+    results = await avalidate_shared_networks(
+        payloads, max_workers=settings.SHARED_NETWORK_VALIDATION_WORKERS
+    )
+    return [
+        SharedNetworkValidation(
+            index=index,
+            valid=not errors,
+            errors=to_jsonable_python(errors, fallback=str),
+        )
+        for index, errors in enumerate(results)
+    ]
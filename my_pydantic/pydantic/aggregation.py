@@ -0,0 +1,142 @@
+"""Aggregation of IPv4 and IPv6 networks: collapse, summarize and exclude.
+
+The networks are inclusive integer ranges, sorted once and merged in one
+sweep, O(n log n), then cut back into the fewest prefixes by the alignment of
+their bounds. `ipaddress.collapse_addresses` works on the network objects,
+and `IPv6Network.address_exclude` on one network at a time.
+
+Creating the network objects is most of the time, so the blocks which are
+networks of the input are not created again, they are the input objects.
+
+Examples:
+    The prefixes of the subnets, less the reserved ones::
+
+        exclude(subnets, [IPv6Network("2001:db8:ff::/48")])
+
+References:
+    https://docs.python.org/3/library/ipaddress.html#ipaddress.collapse_addresses
+    https://en.wikipedia.org/wiki/Supernetwork
+"""
+
+from ipaddress import IPv4Network, IPv6Network
+from operator import itemgetter
+from typing import Iterable, Iterator, Mapping
+
+from .types import IPNetwork
+
+# The network classes by the maximum prefix length, IPv4 first.
+NETWORKS: dict[int, type[IPv4Network] | type[IPv6Network]] = {
+    32: IPv4Network,
+    128: IPv6Network,
+}
+
+Range = tuple[int, int]
+
+
+def merge(ranges: list[Range]) -> list[Range]:
+    """Return the ranges merged when they overlap or touch, sorted."""
+    # By start only, comparing the tuples of large integers is twice slower.
+    ranges.sort(key=itemgetter(0))
+    merged: list[Range] = []
+    if not ranges:
+        return merged
+    low, high = ranges[0]
+    for start, end in ranges:
+        if start > high + 1:
+            merged.append((low, high))
+            low, high = start, end
+        elif end > high:
+            high = end
+    merged.append((low, high))
+    return merged
+
+
+def get_bounds(networks: Iterable[IPNetwork]) -> dict[int, dict[Range, IPNetwork]]:
+    """Return the networks by their range, by their maximum prefix length."""
+    bounds: dict[int, dict[Range, IPNetwork]] = {width: {} for width in NETWORKS}
+    for network in networks:
+        width = network.max_prefixlen
+        start = int(network.network_address)
+        end = start | (1 << (width - network.prefixlen)) - 1
+        bounds[width][start, end] = network
+    return bounds
+
+
+def get_networks(
+    width: int, ranges: Iterable[Range], known: Mapping[Range, IPNetwork]
+) -> Iterator[IPNetwork]:
+    """Yield the fewest networks of the ranges, the largest aligned ones first.
+
+    The blocks which are ``known`` networks, e.g. of the input, are not created.
+    """
+    network_class = NETWORKS[width]
+    for first, end in ranges:
+        start = first
+        while start <= end:
+            # The largest block aligned on the start and within the range.
+            bits = min(
+                (start & -start).bit_length() - 1 if start else width,
+                (end - start + 1).bit_length() - 1,
+            )
+            network = known.get((start, start + (1 << bits) - 1))
+            yield network_class((start, width - bits)) if network is None else network
+            start += 1 << bits
+
+
+def collapse(networks: Iterable[IPNetwork]) -> list[IPNetwork]:
+    """Return the fewest networks covering exactly the networks."""
+    return [
+        network
+        for width, known in get_bounds(networks).items()
+        for network in get_networks(width, merge(list(known)), known)
+    ]
+
+
+def summarize(networks: Iterable[IPNetwork]) -> list[IPNetwork]:
+    """Return the smallest network covering the networks, one per IP version."""
+    summaries = []
+    # The lowest and the highest addresses are enough, without sorting.
+    for width, known in get_bounds(networks).items():
+        if not known:
+            continue
+        start = min(low for low, _ in known)
+        end = max(high for _, high in known)
+        bits = (start ^ end).bit_length()
+        summaries.append(NETWORKS[width]((start >> bits << bits, width - bits)))
+    return summaries
+
+
+def cut(ranges: list[Range], holes: list[Range]) -> list[Range]:
+    """Return the parts of the sorted disjoint ranges outside of the holes."""
+    kept: list[Range] = []
+    remaining_holes = iter(holes)
+    hole = next(remaining_holes, None)
+    for first, end in ranges:
+        start = first
+        # The holes are sorted and disjoint, as are the ranges.
+        while hole is not None and hole[1] < start:
+            hole = next(remaining_holes, None)
+        while hole is not None and hole[0] <= end:
+            if hole[0] > start:
+                kept.append((start, hole[0] - 1))
+            start = hole[1] + 1
+            if hole[1] > end:
+                break
+            hole = next(remaining_holes, None)
+        if start <= end:
+            kept.append((start, end))
+    return kept
+
+
+def exclude(
+    networks: Iterable[IPNetwork], excluded: Iterable[IPNetwork]
+) -> list[IPNetwork]:
+    """Return the fewest networks covering the networks less the excluded ones."""
+    excluded_ranges = {
+        width: merge(list(known)) for width, known in get_bounds(excluded).items()
+    }
+    remaining = []
+    for width, known in get_bounds(networks).items():
+        kept = cut(merge(list(known)), excluded_ranges[width])
+        remaining.extend(get_networks(width, kept, known))
+    return remaining
@@ -0,0 +1,131 @@
+"""Allocator of the free addresses of a range, e.g. an IPv6 address pool.
+
+The free addresses are kept as sorted runs, the inclusive ranges between the
+used ones, so the memory is O(used addresses) whatever the size of the range,
+a /64 included, where a bitmap would need 2⁶⁴ bits. The next free address is
+found by bisecting the ends of the runs, O(log n), and a bulk allocation or
+reservation rewrites only the runs it touches.
+
+Examples:
+    The free addresses of a pool::
+
+        allocator = pool.get_allocator()
+        IPv6Address(allocator.next_free())  # The lowest free address.
+        allocator.allocate(1000)  # The 1000 lowest free addresses, now used.
+        allocator.reserve(int(bind.ip6_address) for bind in binds)
+
+References:
+    https://en.wikipedia.org/wiki/Free_list
+"""
+
+from bisect import bisect_left
+from typing import Iterable, Optional, SupportsInt
+
+
+class AddressAllocator:
+    """Free addresses of an inclusive range, as sorted runs."""
+
+    def __init__(
+        self, low: SupportsInt, high: SupportsInt, used: Iterable[SupportsInt] = ()
+    ) -> None:
+        """Initialize the AddressAllocator.
+
+        Args:
+            low: The lowest address of the range.
+            high: The highest address of the range.
+            used: The used addresses, the ones out of the range are ignored.
+        """
+        self.low = low = int(low)
+        self.high = high = int(high)
+        # The first and the last address of each run of free addresses.
+        self.starts: list[int] = []
+        self.ends: list[int] = []
+        start = low
+        for address in sorted({int(address) for address in used}):
+            if address < low or address > high:
+                continue
+            if address > start:
+                self.starts.append(start)
+                self.ends.append(address - 1)
+            start = address + 1
+        if start <= high:
+            self.starts.append(start)
+            self.ends.append(high)
+        # The number of free addresses, len() is bounded by sys.maxsize.
+        self.size = sum(end - start + 1 for start, end in zip(self.starts, self.ends))
+
+    def __contains__(self, address: SupportsInt) -> bool:
+        """Return whether the address is free."""
+        address = int(address)
+        position = bisect_left(self.ends, address)
+        return position < len(self.ends) and self.starts[position] <= address
+
+    def next_free(self, address: Optional[SupportsInt] = None) -> Optional[int]:
+        """Return the lowest free address, from the address if any."""
+        if address is None:
+            return self.starts[0] if self.starts else None
+        address = int(address)
+        position = bisect_left(self.ends, address)
+        if position == len(self.ends):
+            return None
+        return max(self.starts[position], address)
+
+    def allocate(self, count: int) -> list[int]:
+        """Use and return the ``count`` lowest free addresses.
+
+        Raises:
+            ValueError: ``count`` is negative, or less addresses are free.
+        """
+        if count < 0:
+            raise ValueError(f"{count} addresses requested, expected 0 or more")
+        if count > self.size:
+            raise ValueError(f"{count} addresses requested, {self.size} are free")
+        addresses: list[int] = []
+        position = 0
+        while len(addresses) < count:
+            start, end = self.starts[position], self.ends[position]
+            stop = min(end + 1, start + count - len(addresses))
+            addresses.extend(range(start, stop))
+            if stop <= end:
+                self.starts[position] = stop
+            else:
+                position += 1
+        del self.starts[:position]
+        del self.ends[:position]
+        self.size -= count
+        return addresses
+
+    def reserve(self, addresses: Iterable[SupportsInt]) -> None:
+        """Use the addresses, all or none of them.
+
+        Raises:
+            ValueError: An address is not free.
+        """
+        addresses = sorted({int(address) for address in addresses})
+        if not addresses:
+            return
+        starts: list[int] = []
+        ends: list[int] = []
+        # The runs from ``first`` to ``copied`` are rewritten, the untouched
+        # ones copied as slices; the rest of the run of the address is last.
+        first = copied = bisect_left(self.ends, addresses[0])
+        for address in addresses:
+            if copied == first or self.ends[copied - 1] < address:
+                position = bisect_left(self.ends, address, copied)
+                if position == len(self.ends) or self.starts[position] > address:
+                    raise ValueError(f"Address {address} is not free")
+                starts.extend(self.starts[copied : position + 1])
+                ends.extend(self.ends[copied : position + 1])
+                copied = position + 1
+            # Split the last run at the address.
+            if address > starts[-1]:
+                starts.append(address + 1)
+                ends.append(ends[-1])
+                ends[-2] = address - 1
+            else:
+                starts[-1] = address + 1
+            if starts[-1] > ends[-1]:
+                del starts[-1], ends[-1]
+        self.starts[first:copied] = starts
+        self.ends[first:copied] = ends
+        self.size -= len(addresses)
@@ -0,0 +1,66 @@
+"""Uniqueness of the binds, indexed in hash maps.
+
+A client, its DUID and IAID, must have one bind, and an address must be bound
+once. Both are checked in one linear pass: the DUID and the IAID are
+normalized to their canonical bytes, see `get_duid_bytes` and
+`get_iaid_bytes`, so ``"00:03:1A"`` and ``"00031a"`` are the same client, and
+each key is looked up in a dict of the first bind having it, O(n) instead of
+comparing the pairs, O(n²).
+
+Examples:
+    The conflicts of the binds of the pools::
+
+        find_bind_conflicts(
+            ((j, k), bind)
+            for j, pool in enumerate(pools)
+            for k, bind in enumerate(pool.binds or ())
+        )
+"""
+
+from typing import TYPE_CHECKING, Any, Iterable, NamedTuple
+
+from .types import get_duid_bytes, get_iaid_bytes
+
+if TYPE_CHECKING:
+    from .models import Bind
+
+CLIENT = "duid_iaid"
+ADDRESS = "ip6_address"
+
+
+class BindConflict(NamedTuple):
+    """Two binds of the same client or address, by their paths."""
+
+    kind: str
+    key: str
+    first: Any
+    second: Any
+
+
+def find_bind_conflicts(binds: Iterable[tuple[Any, "Bind"]]) -> list[BindConflict]:
+    """Return every conflict of the binds, by the path of the first one.
+
+    Args:
+        binds: The paths and the binds, a path is any object reported as is.
+
+    Raises:
+        ValueError: An IAID does not fit in 4 bytes.
+    """
+    clients: dict[bytes, Any] = {}
+    addresses: dict[int, Any] = {}
+    conflicts = []
+    for path, bind in binds:
+        # The IAID is 4 bytes, so the concatenation is unambiguous.
+        client = get_duid_bytes(bind.duid) + get_iaid_bytes(bind.iaid)
+        if client in clients:
+            key = f"{bind.duid}/{bind.iaid}"
+            conflicts.append(BindConflict(CLIENT, key, clients[client], path))
+        else:
+            clients[client] = path
+        address = int(bind.ip6_address)
+        if address in addresses:
+            key = bind.ip6_address.compressed
+            conflicts.append(BindConflict(ADDRESS, key, addresses[address], path))
+        else:
+            addresses[address] = path
+    return conflicts
@@ -0,0 +1,97 @@
+"""Interval index of inclusive integer ranges, e.g. IPv6 address pools.
+
+The intervals are sorted once by their low bound, O(n log n). Every
+overlapping pair is found by a sweep keeping the open intervals in a heap by
+their high bound, O(n log n + k) for k overlaps, instead of comparing the
+pairs, O(n²). A point is looked up by bisecting the low bounds, then walking
+back while the running maximum of the high bounds still reaches it, so
+O(log n) when the intervals do not overlap.
+
+Examples:
+    Index the pools by their addresses::
+
+        index = IntervalIndex(
+            (int(pool.low_address), int(pool.high_address), pool) for pool in pools
+        )
+        index.get(IPv6Address("2001:db8::1"))  # The pool of the address.
+        list(index.overlaps())  # The overlapping pools.
+
+References:
+    https://en.wikipedia.org/wiki/Interval_tree
+    https://en.wikipedia.org/wiki/Sweep_line_algorithm
+"""
+
+import heapq
+import itertools
+from bisect import bisect_right
+from typing import (
+    Generic,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    SupportsInt,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+
+class Interval(NamedTuple, Generic[T]):
+    """An inclusive range and its value."""
+
+    low: int
+    high: int
+    value: T
+
+
+class IntervalIndex(Generic[T]):
+    """Index of intervals, to find the overlapping ones and the ones of a point."""
+
+    def __init__(self, intervals: Iterable[tuple[int, int, T]]) -> None:
+        """Initialize the IntervalIndex.
+
+        Args:
+            intervals: The low bounds, the high bounds and the values.
+        """
+        self.intervals: list[Interval[T]] = sorted(
+            (Interval(*interval) for interval in intervals),
+            key=lambda interval: (interval.low, interval.high),
+        )
+        self.lows = [interval.low for interval in self.intervals]
+        # The maximum high bound of the intervals up to each one.
+        self.max_highs = list(
+            itertools.accumulate((interval.high for interval in self.intervals), max)
+        )
+
+    def __len__(self) -> int:
+        """Return the number of intervals."""
+        return len(self.intervals)
+
+    def overlaps(self) -> Iterator[tuple[Interval[T], Interval[T]]]:
+        """Yield the pairs of overlapping intervals, by their low bounds."""
+        # The high bounds and the positions of the intervals still open.
+        opened: list[tuple[int, int]] = []
+        for position, interval in enumerate(self.intervals):
+            while opened and opened[0][0] < interval.low:
+                heapq.heappop(opened)
+            for other in sorted(other for _, other in opened):
+                yield self.intervals[other], interval
+            heapq.heappush(opened, (interval.high, position))
+
+    def find(self, point: SupportsInt) -> list[Interval[T]]:
+        """Return the intervals containing the point, by their low bounds."""
+        point = int(point)
+        found = []
+        for position in range(bisect_right(self.lows, point) - 1, -1, -1):
+            if self.max_highs[position] < point:
+                break
+            if self.intervals[position].high >= point:
+                found.append(self.intervals[position])
+        found.reverse()
+        return found
+
+    def get(self, point: SupportsInt) -> Optional[T]:
+        """Return the value of the last interval containing the point, if any."""
+        found = self.find(point)
+        return found[-1].value if found else None
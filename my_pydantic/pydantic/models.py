@@ -12,6 +12,7 @@ References:
 """
 
 import abc
+import itertools
 from ipaddress import IPv6Address, IPv6Network
 from typing import Any, Self
 
@@ -25,8 +26,15 @@ from pydantic import (
 )
 from pydantic_core import PydanticCustomError
 
+from .allocator import AddressAllocator
+from .binds import find_bind_conflicts
+from .intervals import IntervalIndex
 from .types import DUID, IAID, IPAddress
 
+# The overlapping pools or conflicting binds listed in an error, at most.
+MAX_REPORTED = 10
+BIND_PATH = "subnets.{}.pools.{}.binds.{}"
+
 
 class AbstractBaseModel(BaseModel, abc.ABC):
     """Inheritance BaseModel and AbstractModel."""
@@ -145,6 +153,34 @@ class IANA(AbstractBaseModel):
     parameter: Parameter | None = Field(default=None)
     binds: list[Bind] | None = Field(default=None)
 
+    def get_allocator(self) -> AddressAllocator:
+        """Return the allocator of the addresses of the pool, binds excluded.
+
+        Examples:
+            The next free address of the pool::
+
+                IPv6Address(pool.get_allocator().next_free())
+        """
+        return AddressAllocator(
+            self.low_address,
+            self.high_address,
+            (bind.ip6_address for bind in self.binds or ()),
+        )
+
+    @model_validator(mode="after")
+    def check_low_address__lte__high_address(self) -> Self:
+        """Check low_address less than or equal high_address."""
+        if self.low_address > self.high_address:
+            raise PydanticCustomError(
+                "low_address__lte__high_address",
+                "Low Address 가 High Address 보다 큽니다: {low_address} <= {high_address} 은 올바르지 않습니다.",
+                {
+                    "low_address": str(self.low_address),
+                    "high_address": str(self.high_address),
+                },
+            )
+        return self
+
 
 class Subnet6(AbstractBaseModel):
     """Subnet IPv6Network.
@@ -161,6 +197,10 @@ class Subnet6(AbstractBaseModel):
         ),
         # alias="subnet6-number",
     )
+    pools: list[IANA] | None = Field(
+        default=None,
+        description="The `range6` pools of the subnet6, with their binds.",
+    )
 
 
 class SharedNetwork(AbstractBaseModel):
@@ -195,3 +235,62 @@ class SharedNetwork(AbstractBaseModel):
         default=None,
         description=Subnet6.__doc__,
     )
+
+    def get_pool_index(self) -> IntervalIndex[IANA]:
+        """Return the interval index of the pools of the subnets.
+
+        Examples:
+            The pool of an address::
+
+                network.get_pool_index().get(IPv6Address("2001:db8::1"))
+        """
+        return IntervalIndex(
+            (int(pool.low_address), int(pool.high_address), pool)
+            for subnet in self.subnets or ()
+            for pool in subnet.pools or ()
+        )
+
+    @model_validator(mode="after")
+    def check_pools__not_overlapping(self) -> Self:
+        """Check the pools of the subnets do not overlap, in O(n log n)."""
+        index = IntervalIndex(
+            (int(pool.low_address), int(pool.high_address), f"subnets.{i}.pools.{j}")
+            for i, subnet in enumerate(self.subnets or ())
+            for j, pool in enumerate(subnet.pools or ())
+        )
+        overlaps = [
+            f"{a.value} ~ {b.value}"
+            for a, b in itertools.islice(index.overlaps(), MAX_REPORTED)
+        ]
+        if overlaps:
+            raise PydanticCustomError(
+                "pools__not_overlapping",
+                "Pool 의 주소 범위가 겹칩니다: {overlaps}",
+                {"overlaps": ", ".join(overlaps)},
+            )
+        return self
+
+    @model_validator(mode="after")
+    def check_binds__unique(self) -> Self:
+        """Check a DUID and IAID and an ip6_address are bound once, in O(n)."""
+        conflicts = find_bind_conflicts(
+            ((i, j, k), bind)
+            for i, subnet in enumerate(self.subnets or ())
+            for j, pool in enumerate(subnet.pools or ())
+            for k, bind in enumerate(pool.binds or ())
+        )
+        if conflicts:
+            raise PydanticCustomError(
+                "binds__unique",
+                "Bind 가 {count} 개 중복됩니다: {conflicts}",
+                {
+                    "count": len(conflicts),
+                    "conflicts": ", ".join(
+                        f"{conflict.kind} {conflict.key} "
+                        f"{BIND_PATH.format(*conflict.first)} ~ "
+                        f"{BIND_PATH.format(*conflict.second)}"
+                        for conflict in conflicts[:MAX_REPORTED]
+                    ),
+                },
+            )
+        return self
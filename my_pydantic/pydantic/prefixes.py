@@ -0,0 +1,197 @@
+"""Prefix trie of IPv4 and IPv6 networks, for the longest-prefix match.
+
+A path-compressed binary trie (Patricia trie), one per IP version: a node
+keeps the top bits of its prefix, and only the nodes of a prefix or of a fork
+between two prefixes exist, so n prefixes need at most 2n nodes. An address is
+matched by walking down the bits it shares with the nodes, O(prefix length),
+instead of testing ``address in network`` for every network, O(n).
+
+Examples:
+    The subnet of an address::
+
+        trie = PrefixTrie[str]()
+        trie.insert(IPv6Network("2001:db8::/32"), "documentation")
+        trie.insert(IPv6Network("2001:db8:1::/48"), "subnet")
+        trie.get(IPv6Address("2001:db8:1::1"))  # "subnet"
+        trie.get(IPv6Address("2001:db8:2::1"))  # "documentation"
+
+References:
+    https://en.wikipedia.org/wiki/Radix_tree
+    https://en.wikipedia.org/wiki/Longest_prefix_match
+"""
+
+from typing import Generic, Iterator, NamedTuple, Optional, TypeVar
+
+from .types import IPAddress, IPNetwork
+
+T = TypeVar("T")
+
+
+class Prefix(NamedTuple, Generic[T]):
+    """A network and its value."""
+
+    network: IPNetwork
+    value: T
+
+
+class Node(Generic[T]):
+    """A node of the trie, its prefix is the top ``length`` bits ``key``."""
+
+    __slots__ = ("children", "key", "length", "prefix")
+
+    def __init__(
+        self, key: int, length: int, prefix: Optional[Prefix[T]] = None
+    ) -> None:
+        """Initialize the Node.
+
+        Args:
+            key: The top bits of the prefix.
+            length: The number of bits of the prefix.
+            prefix: The network and its value, None for a fork.
+        """
+        self.key = key
+        self.length = length
+        self.prefix = prefix
+        self.children: list[Optional[Node[T]]] = [None, None]
+
+
+class PrefixTrie(Generic[T]):
+    """Trie of networks, to find the longest prefix of an address."""
+
+    def __init__(self) -> None:
+        """Initialize the PrefixTrie."""
+        # The roots by the maximum prefix length, 32 for IPv4 and 128 for IPv6.
+        self.roots: dict[int, Node[T]] = {32: Node(0, 0), 128: Node(0, 0)}
+        self.size = 0
+
+    def __len__(self) -> int:
+        """Return the number of networks."""
+        return self.size
+
+    def __iter__(self) -> Iterator[Prefix[T]]:
+        """Yield the networks and their values, IPv4 first, by address."""
+        for root in self.roots.values():
+            stack = [root]
+            while stack:
+                node = stack.pop()
+                if node.prefix is not None:
+                    yield node.prefix
+                stack.extend(child for child in reversed(node.children) if child)
+
+    def insert(self, network: IPNetwork, value: T) -> None:
+        """Insert the network, or replace its value."""
+        width = network.max_prefixlen
+        length = network.prefixlen
+        key = int(network.network_address) >> (width - length)
+        prefix = Prefix(network, value)
+        node = self.roots[width]
+        while node.length < length:
+            bit = key >> (length - node.length - 1) & 1
+            child = node.children[bit]
+            if child is None:
+                node.children[bit] = Node(key, length, prefix)
+                self.size += 1
+                return
+            common = min(length, child.length)
+            diff = (key >> (length - common)) ^ (child.key >> (child.length - common))
+            if not diff and child.length <= length:
+                node = child
+                continue
+            # The nodes are attached once complete, for the lock-free readers.
+            if not diff:
+                # The network is a prefix of the child.
+                parent = Node(key, length, prefix)
+                parent.children[child.key >> (child.length - length - 1) & 1] = child
+                self.size += 1
+            else:
+                # The network and the child fork after their common bits.
+                split = common - diff.bit_length()
+                parent = Node(key >> (length - split), split)
+                parent.children[child.key >> (child.length - split - 1) & 1] = child
+                parent.children[key >> (length - split - 1) & 1] = Node(
+                    key, length, prefix
+                )
+                self.size += 1
+            node.children[bit] = parent
+            return
+        if node.prefix is None:
+            self.size += 1
+        node.prefix = prefix
+
+    def get_path(self, network: IPNetwork) -> list[Node[T]]:
+        """Return the nodes from the root to the one of the network.
+
+        Raises:
+            KeyError: The network is not in the trie.
+        """
+        width = network.max_prefixlen
+        length = network.prefixlen
+        key = int(network.network_address) >> (width - length)
+        path = [self.roots[width]]
+        while path[-1].length < length:
+            node = path[-1].children[key >> (length - path[-1].length - 1) & 1]
+            if node is None or node.length > length:
+                raise KeyError(network)
+            path.append(node)
+        if path[-1].key != key or path[-1].prefix is None:
+            raise KeyError(network)
+        return path
+
+    def __contains__(self, network: IPNetwork) -> bool:
+        """Return whether the network is in the trie."""
+        try:
+            self.get_path(network)
+        except KeyError:
+            return False
+        return True
+
+    def __getitem__(self, network: IPNetwork) -> T:
+        """Return the value of the network.
+
+        Raises:
+            KeyError: The network is not in the trie.
+        """
+        return self.get_path(network)[-1].prefix.value
+
+    def remove(self, network: IPNetwork) -> None:
+        """Remove the network, merging the nodes left without a prefix.
+
+        Raises:
+            KeyError: The network is not in the trie.
+        """
+        path = self.get_path(network)
+        node = path[-1]
+        node.prefix = None
+        self.size -= 1
+        # Drop the node, then its parent fork when left with a single child.
+        while len(path) > 1 and node.prefix is None:
+            children = [child for child in node.children if child]
+            if len(children) == 2:
+                break
+            parent = path[-2]
+            parent.children[parent.children.index(node)] = (
+                children[0] if children else None
+            )
+            if children:
+                break
+            path.pop()
+            node = path[-1]
+
+    def find(self, address: IPAddress) -> Optional[Prefix[T]]:
+        """Return the longest prefix of the address, if any."""
+        width = address.max_prefixlen
+        value = int(address)
+        node = self.roots[width]
+        found = node.prefix
+        while node.length < width:
+            node = node.children[value >> (width - node.length - 1) & 1]
+            if node is None or value >> (width - node.length) != node.key:
+                break
+            if node.prefix is not None:
+                found = node.prefix
+        return found
+
+    def get(self, address: IPAddress) -> Optional[T]:
+        """Return the value of the longest prefix of the address, if any."""
+        found = self.find(address)
+        return found.value if found else None
@@ -10,6 +10,7 @@ References:
     https://docs.python.org/3/library/ipaddress.html#ipaddress.ip_network
     https://docs.python.org/3/library/ipaddress.html#ipaddress.IPv4Network
     https://docs.python.org/3/library/ipaddress.html#ipaddress.IPv6Network
+    https://docs.pydantic.dev/latest/concepts/validators/#annotated-validators
 """
 
 from ipaddress import (
@@ -20,16 +21,78 @@ from ipaddress import (
     ip_address,
     ip_network,
 )
+from typing import Any, Optional
 
-from pydantic import AfterValidator, Field, PlainSerializer
+from pydantic import Field, PlainSerializer, PlainValidator, WithJsonSchema
 from typing_extensions import Annotated, TypeAliasType
 
+from utils.lru import LRUCache
+
+ADDRESS = "address"
+NETWORK = "network"
+
+# The parsed addresses and networks by their strings, see `set_intern_cache`.
+intern_caches: dict[str, Optional[LRUCache[str, Any]]] = {ADDRESS: None, NETWORK: None}
+
+
+def set_intern_cache(maxsize: int) -> None:
+    """Share the parsed addresses and networks of the same strings, or not.
+
+    Repeated values, e.g. the DNS servers of every shared network, are parsed
+    once and the same immutable object is reused.
+
+    Args:
+        maxsize: The strings kept of each kind, 0 disables the caches.
+    """
+    for kind in intern_caches:
+        intern_caches[kind] = LRUCache(maxsize) if maxsize > 0 else None
+
+
+def parse_ip_address(value: Any) -> IPv4Address | IPv6Address:
+    """Return the address of the value, an address as is, or parse it once.
+
+    Raises:
+        ValueError: The value is not an IPv4 or IPv6 address.
+    """
+    if isinstance(value, (IPv4Address, IPv6Address)):
+        return value
+    cache = intern_caches[ADDRESS]
+    if cache is None or not isinstance(value, str):
+        return ip_address(value)
+    address = cache.get(value)
+    if address is None:
+        address = ip_address(value)
+        cache.set(value, address)
+    return address
+
+
+def parse_ip_network(value: Any) -> IPv4Network | IPv6Network:
+    """Return the network of the value, a network as is, or parse it once.
+
+    Raises:
+        ValueError: The value is not an IPv4 or IPv6 network.
+    """
+    if isinstance(value, (IPv4Network, IPv6Network)):
+        return value
+    cache = intern_caches[NETWORK]
+    if cache is None or not isinstance(value, str):
+        return ip_network(value)
+    network = cache.get(value)
+    if network is None:
+        network = ip_network(value)
+        cache.set(value, network)
+    return network
+
+
+# The validators replace the ones of the union, which would parse the strings
+# once per member tried, then once more in an after validator.
 IPAddress = TypeAliasType(
     "IPAddress",
     Annotated[
         IPv4Address | IPv6Address,
-        AfterValidator(lambda v: ip_address(v)),
+        PlainValidator(parse_ip_address),
         PlainSerializer(str, return_type=str),
+        WithJsonSchema({"type": "string", "format": "ipvanyaddress"}),
     ],
 )
 
@@ -37,8 +100,9 @@ IPNetwork = TypeAliasType(
     "IPNetwork",
     Annotated[
         IPv4Network | IPv6Network,
-        AfterValidator(lambda v: ip_network(v)),
+        PlainValidator(parse_ip_network),
         PlainSerializer(str, return_type=str),
+        WithJsonSchema({"type": "string", "format": "ipvanynetwork"}),
     ],
 )
 
@@ -81,3 +145,21 @@ IAID = TypeAliasType(
         ),
     ],
 )
+
+
+def get_duid_bytes(duid: str) -> bytes:
+    """Return the canonical bytes of a DUID, whatever its separators and case."""
+    return bytes.fromhex(duid.replace(":", "").replace("-", ""))
+
+
+def get_iaid_bytes(iaid: str) -> bytes:
+    """Return the 4 canonical bytes of an IAID, hex octets or decimal.
+
+    Raises:
+        ValueError: The IAID does not fit in 4 bytes.
+    """
+    value = int(iaid.replace(":", ""), 16) if ":" in iaid else int(iaid)
+    try:
+        return value.to_bytes(4, "big")
+    except OverflowError as e:
+        raise ValueError(f"IAID {iaid} does not fit in 4 bytes") from e
@@ -0,0 +1,109 @@
+"""Utilization of the IANA pools and the Subnet6 of shared networks.
+
+The addresses are integers, the pools are scanned once each: their binds are
+subtracted from their range by an `AddressAllocator`, and its runs of free
+addresses give the free blocks, instead of testing the addresses of a range
+one by one.
+
+Examples:
+    The utilization of the subnets of saved shared networks::
+
+        for subnet in get_subnet_utilizations(networks):
+            print(subnet.subnet6_number, subnet.utilization.percent)
+"""
+
+from dataclasses import dataclass
+from ipaddress import IPv6Network
+from typing import Iterable, Iterator
+
+from .models import IANA, SharedNetwork
+
+
+@dataclass(frozen=True)
+class Utilization:
+    """Used and free addresses of ranges."""
+
+    size: int
+    used: int
+    free_blocks: int
+    largest_free_block: int
+
+    @property
+    def free(self) -> int:
+        """Return the number of free addresses."""
+        return self.size - self.used
+
+    @property
+    def percent(self) -> float:
+        """Return the percent of used addresses."""
+        return 100 * self.used / self.size if self.size else 0.0
+
+    @property
+    def fragmentation(self) -> float:
+        """Return the fraction of the free addresses outside the largest free block."""
+        return 1 - self.largest_free_block / self.free if self.free else 0.0
+
+    @classmethod
+    def from_pool(cls, pool: IANA) -> "Utilization":
+        """Return the utilization of the range of the pool, by its binds."""
+        allocator = pool.get_allocator()
+        size = allocator.high - allocator.low + 1
+        return cls(
+            size=size,
+            used=size - allocator.size,
+            free_blocks=len(allocator.starts),
+            largest_free_block=max(
+                (
+                    end - start + 1
+                    for start, end in zip(allocator.starts, allocator.ends)
+                ),
+                default=0,
+            ),
+        )
+
+    @classmethod
+    def combine(cls, utilizations: Iterable["Utilization"]) -> "Utilization":
+        """Return the utilization of disjoint ranges, e.g. the pools of a subnet."""
+        size = used = free_blocks = largest_free_block = 0
+        for utilization in utilizations:
+            size += utilization.size
+            used += utilization.used
+            free_blocks += utilization.free_blocks
+            largest_free_block = max(largest_free_block, utilization.largest_free_block)
+        return cls(size, used, free_blocks, largest_free_block)
+
+
+@dataclass(frozen=True)
+class PoolUtilization:
+    """Utilization of an IANA pool."""
+
+    pool: IANA
+    utilization: Utilization
+
+
+@dataclass(frozen=True)
+class SubnetUtilization:
+    """Utilization of the pools of a Subnet6."""
+
+    shared_network: str
+    subnet6_number: IPv6Network
+    utilization: Utilization
+    pools: list[PoolUtilization]
+
+
+def get_subnet_utilizations(
+    networks: Iterable[SharedNetwork],
+) -> Iterator[SubnetUtilization]:
+    """Yield the utilization of the subnets of the shared networks, in order."""
+    for network in networks:
+        for subnet in network.subnets or ():
+            pools = [
+                PoolUtilization(pool, Utilization.from_pool(pool))
+                for pool in subnet.pools or ()
+            ]
+            yield SubnetUtilization(
+                shared_network=network.name,
+                subnet6_number=subnet.subnet6_number,
+                utilization=Utilization.combine(pool.utilization for pool in pools),
+                pools=pools,
+            )
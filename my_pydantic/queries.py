@@ -1,11 +1,15 @@
 """Queries in the my_pydantic app."""
 
 from ipaddress import IPv4Address, IPv6Address, IPv6Network
+from typing import Optional
 
 from strawberry.types import Info
 
+from .pydantic import aggregation, utilization
 from .pydantic.models import Parameter
-from .types import Option, SharedNetwork, Subnet6
+from .pydantic.types import IPAddress, IPNetwork
+from .registry import shared_networks
+from .types import Option, SharedNetwork, Subnet6, SubnetUtilization
 
 
 def get_shared_network(info: Info) -> SharedNetwork:
@@ -29,3 +33,41 @@ def get_shared_network(info: Info) -> SharedNetwork:
         ],
     )
     return instance
+
+
+def get_serving_shared_network(
+    info: Info, address: IPAddress
+) -> Optional[SharedNetwork]:
+    """Resolves the saved shared network of the longest prefix of an address."""
+    instance = shared_networks.find(address)
+    return None if instance is None else SharedNetwork.from_pydantic(instance)
+
+
+def get_subnet_utilizations(
+    info: Info, shared_network: Optional[str] = None
+) -> list[SubnetUtilization]:
+    """Resolves the utilization of the subnets of the saved shared networks."""
+    networks = list(shared_networks.networks.values())
+    if shared_network is not None:
+        networks = [network for network in networks if network.name == shared_network]
+    return [
+        SubnetUtilization.from_utilization(instance)
+        for instance in utilization.get_subnet_utilizations(networks)
+    ]
+
+
+def collapse_networks(info: Info, networks: list[IPNetwork]) -> list[IPNetwork]:
+    """Resolves the fewest networks covering exactly the networks."""
+    return aggregation.collapse(networks)
+
+
+def summarize_networks(info: Info, networks: list[IPNetwork]) -> list[IPNetwork]:
+    """Resolves the smallest network covering the networks, per IP version."""
+    return aggregation.summarize(networks)
+
+
+def exclude_networks(
+    info: Info, networks: list[IPNetwork], excluded: list[IPNetwork]
+) -> list[IPNetwork]:
+    """Resolves the fewest networks covering the networks less the excluded."""
+    return aggregation.exclude(networks, excluded)
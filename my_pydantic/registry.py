@@ -0,0 +1,69 @@
+"""Registry of the saved shared networks, in memory.
+
+The subnets of the shared networks are indexed in a `PrefixTrie`, so the
+shared network serving an address is its longest-prefix match. Saving a
+shared network updates only the prefixes it adds or drops, and the readers do
+not lock: a node is attached to the trie once complete.
+"""
+
+import threading
+from ipaddress import IPv6Network
+from typing import Optional
+
+from .pydantic.models import SharedNetwork
+from .pydantic.prefixes import PrefixTrie
+from .pydantic.types import IPAddress
+
+
+def get_prefixes(network: SharedNetwork) -> set[IPv6Network]:
+    """Return the prefixes of the subnets of the shared network."""
+    return {subnet.subnet6_number for subnet in network.subnets or ()}
+
+
+class SharedNetworkRegistry:
+    """Shared networks by name, and by the prefixes of their subnets."""
+
+    def __init__(self) -> None:
+        """Initialize the SharedNetworkRegistry."""
+        self.networks: dict[str, SharedNetwork] = {}
+        self.prefixes: PrefixTrie[str] = PrefixTrie()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of shared networks."""
+        return len(self.networks)
+
+    def save(self, network: SharedNetwork) -> None:
+        """Add or replace the shared network, by its name.
+
+        Raises:
+            ValueError: A subnet is served by another shared network.
+        """
+        new = get_prefixes(network)
+        with self._lock:
+            for prefix in new:
+                name = self.prefixes[prefix] if prefix in self.prefixes else None
+                if name not in (None, network.name):
+                    raise ValueError(
+                        f"Subnet {prefix} is served by the shared network {name}"
+                    )
+            old = self.networks.get(network.name)
+            for prefix in get_prefixes(old) - new if old else ():
+                self.prefixes.remove(prefix)
+            for prefix in new:
+                self.prefixes.insert(prefix, network.name)
+            self.networks[network.name] = network
+
+    def clear(self) -> None:
+        """Remove every shared network."""
+        with self._lock:
+            self.networks = {}
+            self.prefixes = PrefixTrie()
+
+    def find(self, address: IPAddress) -> Optional[SharedNetwork]:
+        """Return the shared network of the longest prefix of the address."""
+        name = self.prefixes.get(address)
+        return None if name is None else self.networks.get(name)
+
+
+shared_networks = SharedNetworkRegistry()
@@ -10,14 +10,12 @@ from ipaddress import (
     IPv4Network,
     IPv6Address,
     IPv6Network,
-    ip_address,
-    ip_network,
 )
 from typing import NewType
 
 import strawberry
 
-from .pydantic.types import IPAddress, IPNetwork
+from .pydantic.types import IPAddress, IPNetwork, parse_ip_address, parse_ip_network
 
 IPv4AddressScalar = strawberry.scalar(
     NewType("IPv4Address", IPv4Address),
@@ -36,7 +34,7 @@ IPv6AddressScalar = strawberry.scalar(
 IPAddressScalar = strawberry.scalar(
     IPAddress,
     serialize=str,
-    parse_value=lambda x: ip_address(x),
+    parse_value=parse_ip_address,
     description="The IPAddress scalar type represents `IPv4Address` or `IPv6Address`.",
 )
 
@@ -57,6 +55,16 @@ IPv6NetworkScalar = strawberry.scalar(
 IPNetworkScalar = strawberry.scalar(
     IPNetwork,
     serialize=str,
-    parse_value=lambda x: ip_network(x),
+    parse_value=parse_ip_network,
     description="The IPNetwork scalar type represents `IPv4Network` or `IPv6Network`.",
 )
+
+BigIntScalar = strawberry.scalar(
+    NewType("BigInt", int),
+    serialize=str,
+    parse_value=lambda x: int(x),
+    description=(
+        "The BigInt scalar type represents an `int` beyond 32 bits, e.g. a number of"
+        " IPv6 addresses, serialized as a string."
+    ),
+)
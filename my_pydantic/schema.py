@@ -1,13 +1,21 @@
 """Schema in my_pydantic app."""
 
 from ipaddress import IPv4Address, IPv4Network, IPv6Address, IPv6Network
+from typing import Optional
 
 import strawberry
 import strawberry_django
 
-from .mutations import save_shared_network
+from .mutations import save_shared_network, validate_shared_networks
 from .pydantic.types import IPAddress, IPNetwork
-from .queries import get_shared_network
+from .queries import (
+    collapse_networks,
+    exclude_networks,
+    get_serving_shared_network,
+    get_shared_network,
+    get_subnet_utilizations,
+    summarize_networks,
+)
 from .scalars import (
     IPAddressScalar,
     IPNetworkScalar,
@@ -16,7 +24,7 @@ from .scalars import (
     IPv6AddressScalar,
     IPv6NetworkScalar,
 )
-from .types import SharedNetwork
+from .types import SharedNetwork, SharedNetworkValidation, SubnetUtilization
 
 
 @strawberry.type
@@ -27,6 +35,26 @@ class Query:
     shared_network: SharedNetwork = strawberry.field(
         resolver=get_shared_network,
     )
+    serving_shared_network: Optional[SharedNetwork] = strawberry.field(
+        resolver=get_serving_shared_network,
+        description="The saved shared network of the longest prefix of the address.",
+    )
+    subnet_utilizations: list[SubnetUtilization] = strawberry.field(
+        resolver=get_subnet_utilizations,
+        description="The utilization of the subnets of the saved shared networks.",
+    )
+    collapse_networks: list[IPNetwork] = strawberry.field(
+        resolver=collapse_networks,
+        description="The fewest networks covering exactly the networks.",
+    )
+    summarize_networks: list[IPNetwork] = strawberry.field(
+        resolver=summarize_networks,
+        description="The smallest network covering the networks, per IP version.",
+    )
+    exclude_networks: list[IPNetwork] = strawberry.field(
+        resolver=exclude_networks,
+        description="The fewest networks covering the networks less the excluded.",
+    )
 
 
 @strawberry.type
@@ -36,6 +64,10 @@ class Mutation:
     save_shared_network: SharedNetwork = strawberry_django.field(
         resolver=save_shared_network,
     )
+    validate_shared_networks: list[SharedNetworkValidation] = strawberry.field(
+        resolver=validate_shared_networks,
+        description="Validate SharedNetwork payloads, the results in input order.",
+    )
 
 
 schema = strawberry.Schema(
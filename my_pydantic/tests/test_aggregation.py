@@ -0,0 +1,100 @@
+"""Tests pydantic.aggregation in the my_pydantic app.
+
+References:
+    https://docs.pytest.org/en/stable/how-to/index.html
+"""
+
+import random
+from ipaddress import IPv4Network, IPv6Network, collapse_addresses
+
+from project.schema import schema
+
+from ..pydantic.aggregation import collapse, exclude, summarize
+
+
+def get_networks(rng: random.Random, count: int) -> list[IPv4Network]:
+    """Return random networks of 10.0.0.0/16, overlapping and adjacent ones."""
+    return [
+        IPv4Network((10 << 24 | rng.getrandbits(16), rng.randrange(18, 33)), False)
+        for _ in range(count)
+    ]
+
+
+def get_addresses(networks) -> set[int]:
+    """Return the addresses of the networks, as integers."""
+    return {
+        address
+        for network in networks
+        for address in range(
+            int(network.network_address), int(network.broadcast_address) + 1
+        )
+    }
+
+
+def test_collapse():
+    """Test the networks are collapsed as `ipaddress.collapse_addresses` does."""
+    rng = random.Random(0)
+    networks = get_networks(rng, 500)
+    assert collapse(networks) == list(collapse_addresses(networks))
+    assert collapse(
+        [
+            IPv6Network("2001:db8::/33"),
+            IPv4Network("0.0.0.0/0"),
+            IPv6Network("2001:db8:8000::/33"),
+        ]
+    ) == [IPv4Network("0.0.0.0/0"), IPv6Network("2001:db8::/32")]
+    assert collapse([]) == []
+
+    # The networks of the input are not created again.
+    network = IPv6Network("2001:db8::/48")
+    [collapsed] = collapse([network, IPv6Network("2001:db8::/64")])
+    assert collapsed is network
+
+
+def test_summarize():
+    """Test the smallest network covering the networks, per IP version."""
+    assert summarize(
+        [
+            IPv4Network("10.0.1.0/24"),
+            IPv4Network("10.0.6.0/24"),
+            IPv6Network("2001:db8::/64"),
+        ]
+    ) == [IPv4Network("10.0.0.0/21"), IPv6Network("2001:db8::/64")]
+    assert summarize([IPv4Network("0.0.0.0/32"), IPv4Network("255.0.0.0/8")]) == [
+        IPv4Network("0.0.0.0/0")
+    ]
+
+
+def test_exclude():
+    """Test the addresses left are the ones of the networks, less the excluded."""
+    rng = random.Random(1)
+    networks = get_networks(rng, 100)
+    excluded = get_networks(rng, 100)
+    remaining = exclude(networks, excluded)
+    assert get_addresses(remaining) == get_addresses(networks) - get_addresses(excluded)
+    assert remaining == collapse(remaining)
+    assert exclude(
+        [IPv6Network("2001:db8::/32")], [IPv6Network("2001:db8:8000::/33")]
+    ) == [IPv6Network("2001:db8::/33")]
+
+
+def test_query():
+    """Test the collapse, summarize and exclude fields of the IPNetwork scalar."""
+    query = """query Aggregate($networks: [IPNetwork!]!, $excluded: [IPNetwork!]!) {
+      collapseNetworks(networks: $networks)
+      summarizeNetworks(networks: $networks)
+      excludeNetworks(networks: $networks, excluded: $excluded)
+    }"""
+    response = schema.execute_sync(
+        query,
+        variable_values={
+            "networks": ["10.0.0.0/25", "10.0.0.128/25", "2001:db8::/48"],
+            "excluded": ["10.0.0.0/26", "2001:db8::/49"],
+        },
+    )
+    assert response.errors is None
+    assert response.data == {
+        "collapseNetworks": ["10.0.0.0/24", "2001:db8::/48"],
+        "summarizeNetworks": ["10.0.0.0/24", "2001:db8::/48"],
+        "excludeNetworks": ["10.0.0.64/26", "10.0.0.128/25", "2001:db8:0:8000::/49"],
+    }
@@ -0,0 +1,74 @@
+"""Tests pydantic.allocator in the my_pydantic app.
+
+References:
+    https://docs.pytest.org/en/stable/how-to/index.html
+"""
+
+import random
+from ipaddress import IPv6Address
+
+import pytest
+
+from ..pydantic.allocator import AddressAllocator
+from ..pydantic.models import IANA
+
+
+def test_allocate():
+    """Test allocations and reservations, as a set of free addresses does."""
+    rng = random.Random(0)
+    used = rng.sample(range(900, 2100), 300)
+    allocator = AddressAllocator(1000, 2000, used)
+    free = set(range(1000, 2001)) - set(used)
+    for _ in range(20):
+        assert allocator.size == len(free)
+        assert allocator.next_free() == min(free)
+        address = rng.randrange(1000, 2001)
+        assert allocator.next_free(address) == min(
+            (free_address for free_address in free if free_address >= address),
+            default=None,
+        )
+        addresses = allocator.allocate(10)
+        assert addresses == sorted(free)[:10]
+        free -= set(addresses)
+        reserved = rng.sample(sorted(free), 15)
+        allocator.reserve(reserved)
+        free -= set(reserved)
+    assert [address for address in range(1000, 2001) if address in allocator] == (
+        sorted(free)
+    )
+
+
+def test_errors():
+    """Test an allocation or a reservation fails whole."""
+    allocator = AddressAllocator(0, 9, [3])
+    with pytest.raises(ValueError, match="11 addresses requested, 9 are free"):
+        allocator.allocate(11)
+    with pytest.raises(ValueError, match="-1 addresses requested, expected 0 or"):
+        allocator.allocate(-1)
+    with pytest.raises(ValueError, match="Address 3 is not free"):
+        allocator.reserve([2, 3, 4])
+    with pytest.raises(ValueError, match="Address 10 is not free"):
+        allocator.reserve([9, 10])
+    assert allocator.size == 9
+    assert allocator.allocate(9) == [0, 1, 2, 4, 5, 6, 7, 8, 9]
+    assert allocator.next_free() is None
+    assert allocator.allocate(0) == []
+
+
+def test_pool():
+    """Test the allocator of a /64 pool stays as small as its binds."""
+    pool = IANA(
+        low_address="2001:db8::",
+        high_address="2001:db8::ffff:ffff:ffff:ffff",
+        binds=[
+            {"duid": "0003AA", "iaid": "1", "ip6_address": "2001:db8::"},
+            {"duid": "0003AA", "iaid": "2", "ip6_address": "2001:db8::2"},
+        ],
+    )
+    allocator = pool.get_allocator()
+    assert allocator.size == 2**64 - 2
+    assert len(allocator.starts) == 2
+    assert IPv6Address(allocator.next_free()) == IPv6Address("2001:db8::1")
+    addresses = allocator.allocate(5000)
+    assert IPv6Address(addresses[-1]) == IPv6Address("2001:db8::1389")
+    assert len(allocator.starts) == 1
@@ -0,0 +1,74 @@
+"""Tests pydantic.binds in the my_pydantic app.
+
+References:
+    https://docs.pytest.org/en/stable/how-to/index.html
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from ..pydantic.binds import ADDRESS, CLIENT, BindConflict, find_bind_conflicts
+from ..pydantic.models import Bind, SharedNetwork
+from ..pydantic.types import get_duid_bytes, get_iaid_bytes
+
+
+def test_canonical_bytes(duid_list):
+    """Test the spellings of a DUID and an IAID have the same bytes."""
+    assert {get_duid_bytes(duid) for duid in duid_list} == {
+        bytes.fromhex("000300011a2b3c4d5e6f7a8b")
+    }
+    assert get_duid_bytes("00-03-1a") == get_duid_bytes("00031A")
+    assert get_iaid_bytes("00:00:01:00") == get_iaid_bytes("256") == b"\0\0\1\0"
+    assert get_iaid_bytes("4294967295") == b"\xff" * 4
+    with pytest.raises(ValueError, match="does not fit"):
+        get_iaid_bytes("4294967296")
+
+
+def test_find_bind_conflicts():
+    """Test every conflict is reported, by the path of the first bind."""
+    binds = [
+        Bind(duid="0003AA", iaid="1", ip6_address="2001:db8::1"),
+        Bind(duid="00:03:aa", iaid="00:00:00:01", ip6_address="2001:db8::2"),
+        Bind(duid="0003AA", iaid="2", ip6_address="2001:db8::1"),
+        Bind(duid="0003BB", iaid="1", ip6_address="2001:db8::1"),
+    ]
+    assert find_bind_conflicts(enumerate(binds)) == [
+        BindConflict(CLIENT, "00:03:aa/00:00:00:01", 0, 1),
+        BindConflict(ADDRESS, "2001:db8::1", 0, 2),
+        BindConflict(ADDRESS, "2001:db8::1", 0, 3),
+    ]
+    assert find_bind_conflicts(enumerate(binds[:1])) == []
+    # The same path object for every bind, e.g. None, still conflicts.
+    assert find_bind_conflicts((None, bind) for bind in binds[:2]) == [
+        BindConflict(CLIENT, "00:03:aa/00:00:00:01", None, None),
+    ]
+
+
+def test_shared_network_binds():
+    """Test the binds of a shared network are unique across its pools."""
+    bind = {"duid": "0003AA", "iaid": "1", "ip6_address": "2001:db8::1"}
+    pools = [
+        {"low_address": "2001:db8::", "high_address": "2001:db8::ff", "binds": [bind]},
+        {
+            "low_address": "2001:db8::100",
+            "high_address": "2001:db8::1ff",
+            "binds": [{**bind, "ip6_address": "2001:db8::101"}],
+        },
+    ]
+    with pytest.raises(ValidationError) as e:
+        SharedNetwork.model_validate(
+            {
+                "name": "network",
+                "option": {},
+                "parameter": {"preferred_lifetime": 1, "valid_lifetime": 1},
+                "subnets": [{"subnet6_number": "2001:db8::/64", "pools": pools}],
+            }
+        )
+    [error] = e.value.errors()
+    assert error["type"] == "binds__unique"
+    assert error["ctx"] == {
+        "count": 1,
+        "conflicts": (
+            "duid_iaid 0003AA/1 subnets.0.pools.0.binds.0 ~ subnets.0.pools.1.binds.0"
+        ),
+    }
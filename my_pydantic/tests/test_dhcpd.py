@@ -0,0 +1,205 @@
+"""Tests dhcpd.conf syntax in the my_pydantic app."""
+
+import io
+import json
+import tempfile
+from ipaddress import IPv6Address
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase
+
+from ..dhcpd.parse import ParseError, ParseWarning, parse
+from ..dhcpd.render import render, write
+from ..pydantic.models import SharedNetwork
+
+PAYLOAD = {
+    "name": "office",
+    "description": "Office network.",
+    "option": {
+        "dns_servers": ["8.8.8.8", "2001:4860:4860::8888"],
+        "domain_list": ["example.com"],
+    },
+    "parameter": {"preferred_lifetime": 300, "valid_lifetime": 600},
+    "subnets": [
+        {
+            "subnet6_number": "2001:db8::/64",
+            "pools": [
+                {
+                    "low_address": "2001:db8::100",
+                    "high_address": "2001:db8::1ff",
+                    "klass": "phones",
+                    "binds": [
+                        {
+                            "duid": "000300011A2B3C4D5E6F7A8B",
+                            "iaid": "1A:2B:3C:4D",
+                            "ip6_address": "2001:db8::101",
+                        }
+                    ],
+                }
+            ],
+        }
+    ],
+}
+
+CONFIG = """\
+# Office network.
+shared-network office {
+    option dhcp6.name-servers 2001:4860:4860::8888;
+    option dhcp6.domain-search "example.com";
+    preferred-lifetime 300;
+    default-lease-time 600;
+    subnet6 2001:db8::/64 {
+        pool6 {
+            allow members of "phones";
+            range6 2001:db8::100 2001:db8::1ff;
+        }
+        host 000300011a2b3c4d5e6f7a8b-1a2b3c4d {
+            host-identifier option dhcp6.client-id 00:03:00:01:1a:2b:3c:4d:5e:6f:7a:8b;
+            fixed-address6 2001:db8::101;
+        }
+    }
+}
+"""
+
+
+class RenderTestCase(SimpleTestCase):
+    """Tests rendering shared networks to dhcpd.conf."""
+
+    def test_render(self):
+        """Test the blocks of a shared network."""
+        network = SharedNetwork.model_validate(PAYLOAD)
+        assert "".join(render([network])) == CONFIG
+        assert "".join(render([network, network])) == f"{CONFIG}\n{CONFIG}"
+
+    def test_streamed(self):
+        """Test the networks are consumed one chunk at a time."""
+        consumed = []
+
+        def networks():
+            for index in range(3):
+                consumed.append(index)
+                yield SharedNetwork.model_validate({**PAYLOAD, "name": f"n{index}"})
+
+        chunks = render(networks(), chunk_size=1)
+        assert next(chunks) == "# Office network.\n"
+        assert consumed == [0]
+        file = io.StringIO()
+        assert write(networks(), file) == len(file.getvalue())
+        assert file.getvalue() == "\n".join(
+            CONFIG.replace("office", f"n{index}") for index in range(3)
+        )
+
+    def test_command(self):
+        """Test the command renders JSON Lines and reports the invalid line."""
+        with tempfile.TemporaryDirectory() as directory:
+            source = Path(directory, "networks.jsonl")
+            source.write_text(f"{json.dumps(PAYLOAD)}\n\n")
+            stdout = io.StringIO()
+            call_command("render_dhcpd6", str(source), stdout=stdout)
+            assert stdout.getvalue() == CONFIG
+
+            source.write_text(f"{json.dumps(PAYLOAD)}\n{{}}\n")
+            with self.assertRaisesMessage(CommandError, "Line 2:"):
+                call_command("render_dhcpd6", str(source), stdout=io.StringIO())
+
+
+class ParseTestCase(SimpleTestCase):
+    """Tests parsing dhcpd.conf into shared networks."""
+
+    def test_parse(self):
+        """Test the rendered config is parsed back."""
+        [network] = parse(io.StringIO(f"authoritative;\n\n{CONFIG}"))
+        assert network.description == "Office network."
+        [bind] = network.subnets[0].pools[0].binds
+        assert bind.iaid == "1a:2b:3c:4d"
+        assert bind.ip6_address == IPv6Address("2001:db8::101")
+        assert "".join(render([network])) == CONFIG
+
+    def test_streamed(self):
+        """Test each network is yielded once its block is read."""
+        read = []
+
+        def lines():
+            for index in range(3):
+                for line in CONFIG.replace("office", f"n{index}").splitlines(True):
+                    read.append(index)
+                    yield line
+
+        networks = parse(lines())
+        assert next(networks).name == "n0"
+        assert set(read) == {0}
+        assert [network.name for network in networks] == ["n1", "n2"]
+
+    def test_warnings(self):
+        """Test unknown statements are skipped with their block, with a warning."""
+        config = CONFIG.replace(
+            "    default-lease-time 600;\n",
+            "    default-lease-time 600;\n"
+            "    max-lease-time 7200;\n"
+            "    prefix6 2001:db8:1:: 2001:db8:ff:: /56;\n"
+            "    on commit {\n        set x = 1;\n    }\n",
+        ).replace(
+            "        pool6 {\n", "        pool6 {\n            deny unknown-clients;\n"
+        )
+        warnings: list[ParseWarning] = []
+        [network] = parse(io.StringIO(config), warnings)
+        assert "".join(render([network])) == CONFIG
+        assert warnings == [
+            ParseWarning("Skipped statement 'max-lease-time' in shared-network", 7, 5),
+            ParseWarning("Skipped statement 'prefix6' in shared-network", 8, 5),
+            ParseWarning("Skipped block 'on' in shared-network", 9, 5),
+            ParseWarning("Skipped statement 'deny' in pool6", 14, 13),
+        ]
+        assert str(warnings[0]).endswith("(line 7, column 5)")
+
+    def test_errors(self):
+        """Test the errors are located at their line and column."""
+        cases = [
+            ('shared-network x {\n    option "a;\n}', "Unexpected '\"'", 2, 12),
+            ("shared-network x {\n    subnet6 2001:db8::/64 {\n", "end of file", 2, 27),
+            (
+                "shared-network x {\n    pool6 {\n    }\n}",
+                "Unexpected block 'pool6' in shared-network",
+                2,
+                5,
+            ),
+            (
+                f"{CONFIG}\nhost h {{\n    fixed-address6 2001:db8::102;\n}}\n",
+                "Unexpected block 'host' in the global scope",
+                CONFIG.count("\n") + 2,
+                1,
+            ),
+            (
+                "option dhcp6.name-servers 2001:db8::1;\n"
+                "subnet6 2001:db8::/64 {\n    range6 2001:db8::1 2001:db8::ff;\n}",
+                "Unexpected block 'subnet6' in the global scope",
+                2,
+                1,
+            ),
+            (
+                CONFIG.replace("preferred-lifetime 300", "preferred-lifetime 900"),
+                "Invalid shared-network 'office'",
+                2,
+                1,
+            ),
+            (
+                CONFIG.replace("default-lease-time 600", "default-lease-time 0"),
+                "Invalid shared-network 'office'",
+                6,
+                24,
+            ),
+            (
+                CONFIG.replace("fixed-address6 2001:db8::101", "fixed-address6 ::1"),
+                "is in no range6",
+                14,
+                28,
+            ),
+        ]
+        for config, message, line, column in cases:
+            with self.subTest(message):
+                with self.assertRaisesMessage(ParseError, message) as context:
+                    list(parse(io.StringIO(config)))
+                error = context.exception
+                assert (error.line, error.column) == (line, column), error
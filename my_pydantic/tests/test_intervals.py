@@ -0,0 +1,83 @@
+"""Tests pydantic.intervals in the my_pydantic app.
+
+References:
+    https://docs.pytest.org/en/stable/how-to/index.html
+"""
+
+import itertools
+import random
+from ipaddress import IPv6Address
+
+import pytest
+from pydantic import ValidationError
+
+from ..pydantic.intervals import IntervalIndex
+from ..pydantic.models import SharedNetwork
+
+
+def test_overlaps():
+    """Test every overlapping pair is found, as pairwise comparisons do."""
+    rng = random.Random(0)
+    intervals = []
+    for value in range(300):
+        low = rng.randrange(10_000)
+        intervals.append((low, low + rng.randrange(100), value))
+    index = IntervalIndex(intervals)
+    expected = {
+        frozenset((a[2], b[2]))
+        for a, b in itertools.combinations(intervals, 2)
+        if a[0] <= b[1] and b[0] <= a[1]
+    }
+    found = [frozenset((a.value, b.value)) for a, b in index.overlaps()]
+    assert len(found) == len(expected)
+    assert set(found) == expected
+
+
+def test_find():
+    """Test the intervals of a point, bounds included."""
+    index = IntervalIndex([(0, 100, "a"), (10, 20, "b"), (30, 40, "c"), (50, 50, "d")])
+    assert [interval.value for interval in index.find(15)] == ["a", "b"]
+    assert [interval.value for interval in index.find(40)] == ["a", "c"]
+    assert index.get(50) == "d"
+    assert index.get(101) is None
+    assert index.get(-1) is None
+    assert list(IntervalIndex([(0, 1, "a"), (2, 3, "b")]).overlaps()) == []
+
+
+def get_payload(*ranges: tuple[str, str]) -> dict:
+    """Return a SharedNetwork payload with a pool per range, in two subnets."""
+    pools = [{"low_address": low, "high_address": high} for low, high in ranges]
+    return {
+        "name": "network",
+        "option": {},
+        "parameter": {"preferred_lifetime": 1, "valid_lifetime": 1},
+        "subnets": [
+            {"subnet6_number": "2001:db8::/64", "pools": pools[:1]},
+            {"subnet6_number": "2001:db8:1::/64", "pools": pools[1:]},
+        ],
+    }
+
+
+def test_shared_network_pools():
+    """Test overlapping pools are invalid and pools are found by address."""
+    network = SharedNetwork.model_validate(
+        get_payload(("2001:db8::1", "2001:db8::ff"), ("2001:db8::100", "2001:db8::1ff"))
+    )
+    pool = network.get_pool_index().get(IPv6Address("2001:db8::100"))
+    assert pool is network.subnets[1].pools[0]
+
+    with pytest.raises(ValidationError) as e:
+        SharedNetwork.model_validate(
+            get_payload(
+                ("2001:db8::1", "2001:db8::ff"), ("2001:db8::ff", "2001:db8::1ff")
+            )
+        )
+    [error] = e.value.errors()
+    assert error["type"] == "pools__not_overlapping"
+    assert error["ctx"]["overlaps"] == "subnets.0.pools.0 ~ subnets.1.pools.0"
+
+    with pytest.raises(ValidationError) as e:
+        SharedNetwork.model_validate(get_payload(("2001:db8::2", "2001:db8::1")))
+    [error] = e.value.errors()
+    assert error["type"] == "low_address__lte__high_address"
+    assert error["loc"] == ("subnets", 0, "pools", 0)
@@ -0,0 +1,63 @@
+"""Tests pydantic.prefixes in the my_pydantic app.
+
+References:
+    https://docs.pytest.org/en/stable/how-to/index.html
+"""
+
+import random
+from ipaddress import IPv4Address, IPv4Network, IPv6Address, IPv6Network
+
+import pytest
+
+from ..pydantic.prefixes import PrefixTrie
+
+
+def get_longest_prefix(networks, address):
+    """Return the longest network containing the address, as a scan does."""
+    found = [network for network in networks if address in network]
+    return max(found, key=lambda network: network.prefixlen, default=None)
+
+
+def test_find():
+    """Test the longest-prefix match of random networks, as a scan does."""
+    rng = random.Random(0)
+    trie = PrefixTrie()
+    networks = set()
+    for _ in range(500):
+        length = rng.randrange(16, 65)
+        address = 0x2001_0DB8 << 96 | rng.getrandbits(24) << 80
+        network = IPv6Network((address, length), strict=False)
+        networks.add(network)
+        trie.insert(network, network)
+    for network in rng.sample(sorted(networks), 200):
+        networks.remove(network)
+        trie.remove(network)
+    assert len(trie) == len(networks)
+    assert [prefix.network for prefix in trie] == sorted(networks)
+    for _ in range(1000):
+        address = IPv6Address(0x2001_0DB8 << 96 | rng.getrandbits(24) << 80)
+        assert trie.get(address) == get_longest_prefix(networks, address)
+
+
+def test_ip_versions():
+    """Test IPv4 and IPv6 networks are matched apart, and replaced by value."""
+    trie = PrefixTrie()
+    trie.insert(IPv4Network("0.0.0.0/0"), "default")
+    trie.insert(IPv4Network("10.0.0.0/8"), "private")
+    trie.insert(IPv4Network("10.1.0.0/16"), "site")
+    trie.insert(IPv6Network("2001:db8::/32"), "documentation")
+    trie.insert(IPv4Network("10.1.0.0/16"), "office")
+    assert len(trie) == 4
+    assert trie.get(IPv4Address("10.1.2.3")) == "office"
+    assert trie.get(IPv4Address("10.2.0.1")) == "private"
+    assert trie.get(IPv4Address("8.8.8.8")) == "default"
+    assert trie.get(IPv6Address("2001:db8::1")) == "documentation"
+    assert trie.get(IPv6Address("2001:db9::1")) is None
+    assert IPv4Network("10.0.0.0/8") in trie
+    assert IPv4Network("10.0.0.0/9") not in trie
+
+    trie.remove(IPv4Network("10.0.0.0/8"))
+    assert trie.get(IPv4Address("10.2.0.1")) == "default"
+    assert trie.find(IPv4Address("10.1.2.3")).network == IPv4Network("10.1.0.0/16")
+    with pytest.raises(KeyError):
+        trie.remove(IPv4Network("10.0.0.0/8"))
@@ -6,9 +6,11 @@ References:
 
 from ipaddress import IPv4Address, IPv4Network, IPv6Address, IPv6Network
 
-from pydantic import TypeAdapter
+import pytest
+from pydantic import TypeAdapter, ValidationError
 
-from ..pydantic.types import DUID, IAID, IPAddress, IPNetwork
+from ..pydantic import types
+from ..pydantic.types import DUID, IAID, IPAddress, IPNetwork, set_intern_cache
 
 
 def test_ip_address_type(
@@ -43,6 +45,52 @@ def test_ip_network_type(
     assert ta.dump_python(ipv6_network_str) == ipv6_network_str
 
 
+def test_parse_once(ipv6_address_str, ipv6_address, ipv4_network):
+    """Test parsed values are returned as is, and invalid strings fail."""
+    addresses: TypeAdapter[list[IPAddress]] = TypeAdapter(list[IPAddress])
+    networks: TypeAdapter[list[IPNetwork]] = TypeAdapter(list[IPNetwork])
+    assert addresses.validate_python([ipv6_address])[0] is ipv6_address
+    assert networks.validate_python([ipv4_network])[0] is ipv4_network
+    assert addresses.validate_python([ipv6_address_str, 1]) == [
+        ipv6_address,
+        IPv4Address(1),
+    ]
+    with pytest.raises(ValidationError) as e:
+        networks.validate_python(["2001:db8::1/64"])
+    assert e.value.errors()[0]["type"] == "value_error"
+    assert TypeAdapter(IPAddress).json_schema() == {
+        "type": "string",
+        "format": "ipvanyaddress",
+    }
+
+
+@pytest.fixture
+def intern_cache():
+    """Enable the intern cache of 2 strings, then restore it."""
+    previous = types.intern_caches[types.ADDRESS]
+    set_intern_cache(2)
+    yield
+    set_intern_cache(previous.maxsize if previous else 0)
+
+
+def test_intern_cache(intern_cache, ipv4_address_str, ipv6_address_str):
+    """Test the same strings share their parsed objects, the last ones only."""
+    ta: TypeAdapter[list[IPAddress]] = TypeAdapter(list[IPAddress])
+    first, second, third = ta.validate_python(
+        [ipv4_address_str, ipv4_address_str, ipv6_address_str]
+    )
+    assert first is second
+    assert third is not first
+    ta.validate_python(["10.0.0.1"])
+    assert ta.validate_python([ipv4_address_str])[0] is not first
+    with pytest.raises(ValidationError):
+        ta.validate_python(["10.0.0.256"])
+    assert "10.0.0.256" not in types.intern_caches[types.ADDRESS]
+
+    nta: TypeAdapter[IPNetwork] = TypeAdapter(IPNetwork)
+    assert nta.validate_python("10.0.0.0/8") is nta.validate_python("10.0.0.0/8")
+
+
 def test_duid_type(duid_list):
     """Test DUID type."""
     ta: TypeAdapter[DUID] = TypeAdapter(DUID)
@@ -5,6 +5,14 @@ from strawberry.utils.str_converters import capitalize_first, to_camel_case
 
 from project.schema import schema  # noqa: E402
 
+from ..registry import shared_networks
+
+SAVE_SHARED_NETWORK = """mutation SaveSharedNetwork($input: SharedNetworkInput!) {
+  saveSharedNetwork(input: $input) {
+    name
+  }
+}"""
+
 
 class QueryTestCase(TestCase):
     """Tests fields at the schema query in the my_pydantic app."""
@@ -42,12 +50,63 @@ class QueryTestCase(TestCase):
         response = schema.execute_sync(query)
         assert "sharedNetwork" in response.data
 
+    def test_serving_shared_network(self):
+        """Test serving_shared_network field, after saving shared networks."""
+        self.addCleanup(shared_networks.clear)
+        input = {
+            "name": "Site",
+            "option": {},
+            "parameter": {"preferredLifetime": 1, "validLifetime": 1},
+            "subnets": [{"subnet6Number": "2001:db8::/48"}],
+        }
+        for name, subnet in (("Site", "2001:db8::/48"), ("Lab", "2001:db8:0:1::/64")):
+            input = {**input, "name": name, "subnets": [{"subnet6Number": subnet}]}
+            response = schema.execute_sync(
+                SAVE_SHARED_NETWORK, variable_values={"input": input}
+            )
+            assert response.errors is None
+        query = """query ServingSharedNetwork($address: IPAddress!) {
+          servingSharedNetwork(address: $address) {
+            name
+          }
+        }"""
+        served = {
+            "2001:db8::1": {"name": "Site"},
+            "2001:db8:0:1::1": {"name": "Lab"},
+            "2001:db9::1": None,
+            "8.8.8.8": None,
+        }
+        for address, expected in served.items():
+            response = schema.execute_sync(query, variable_values={"address": address})
+            assert response.errors is None
+            assert response.data["servingSharedNetwork"] == expected
+
+        # Lab moves to another subnet, so its former one is served by Site.
+        input["subnets"] = [{"subnet6Number": "2001:db8:1::/64"}]
+        response = schema.execute_sync(
+            SAVE_SHARED_NETWORK, variable_values={"input": input}
+        )
+        assert response.errors is None
+        response = schema.execute_sync(
+            query, variable_values={"address": "2001:db8:0:1::1"}
+        )
+        assert response.data["servingSharedNetwork"] == {"name": "Site"}
+
+        input["name"] = "Other"
+        response = schema.execute_sync(
+            SAVE_SHARED_NETWORK, variable_values={"input": input}
+        )
+        assert response.errors[0].message == (
+            "Subnet 2001:db8:1::/64 is served by the shared network Lab"
+        )
+
 
 class MutationTestCase(TestCase):
     """Tests fields at the schema mutation in the my_pydantic app."""
 
     def test_save_shared_network(self):
         """Test save_shared_network field."""
+        self.addCleanup(shared_networks.clear)
         query = """mutation SaveSharedNetwork($input: SharedNetworkInput!) {
           saveSharedNetwork(input: $input) {
             name
@@ -0,0 +1,154 @@
+"""Tests pydantic.utilization in the my_pydantic app."""
+
+import io
+import tempfile
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase
+
+from project.schema import schema
+
+from ..dhcpd.render import render
+from ..pydantic.models import IANA, SharedNetwork
+from ..pydantic.utilization import Utilization, get_subnet_utilizations
+from ..registry import shared_networks
+
+
+def get_bind(address: str, iaid: int) -> dict:
+    """Return the payload of a bind of the address."""
+    return {"duid": "0003AA", "iaid": str(iaid), "ip6_address": address}
+
+
+PAYLOAD = {
+    "name": "office",
+    "option": {},
+    "parameter": {"preferred_lifetime": 300, "valid_lifetime": 600},
+    "subnets": [
+        {
+            "subnet6_number": "2001:db8::/64",
+            "pools": [
+                {
+                    "low_address": "2001:db8::",
+                    "high_address": "2001:db8::f",
+                    "binds": [
+                        get_bind(f"2001:db8::{address:x}", address)
+                        for address in (0, 1, 2, 8)
+                    ],
+                },
+                {"low_address": "2001:db8::100", "high_address": "2001:db8::1ff"},
+            ],
+        }
+    ],
+}
+
+
+class UtilizationTestCase(SimpleTestCase):
+    """Tests the utilization of the pools and subnets."""
+
+    def test_pool(self):
+        """Test the free blocks of a pool, between its binds."""
+        pool = IANA.model_validate(PAYLOAD["subnets"][0]["pools"][0])
+        utilization = Utilization.from_pool(pool)
+        assert utilization == Utilization(
+            size=16, used=4, free_blocks=2, largest_free_block=7
+        )
+        assert utilization.free == 12
+        assert utilization.percent == 25.0
+        assert utilization.fragmentation == 1 - 7 / 12
+
+        full = IANA(low_address="2001:db8::", high_address="2001:db8::")
+        assert Utilization.from_pool(full).fragmentation == 0.0
+
+    def test_subnet(self):
+        """Test the utilization of a subnet is the one of its pools."""
+        network = SharedNetwork.model_validate(PAYLOAD)
+        [subnet] = get_subnet_utilizations([network])
+        assert subnet.shared_network == "office"
+        assert [pool.utilization.size for pool in subnet.pools] == [16, 256]
+        assert subnet.utilization == Utilization(
+            size=272, used=4, free_blocks=3, largest_free_block=256
+        )
+
+    def test_query(self):
+        """Test subnet_utilizations field, of the saved shared networks."""
+        self.addCleanup(shared_networks.clear)
+        shared_networks.save(SharedNetwork.model_validate(PAYLOAD))
+        query = """query SubnetUtilizations($sharedNetwork: String) {
+          subnetUtilizations(sharedNetwork: $sharedNetwork) {
+            sharedNetwork
+            subnet6Number
+            utilization {
+              size
+              used
+              percent
+              largestFreeBlock
+            }
+            pools {
+              lowAddress
+            }
+          }
+        }"""
+        response = schema.execute_sync(query)
+        assert response.errors is None
+        assert response.data["subnetUtilizations"] == [
+            {
+                "sharedNetwork": "office",
+                "subnet6Number": "2001:db8::/64",
+                "utilization": {
+                    "size": "272",
+                    "used": "4",
+                    "percent": 100 * 4 / 272,
+                    "largestFreeBlock": "256",
+                },
+                "pools": [
+                    {"lowAddress": "2001:db8::"},
+                    {"lowAddress": "2001:db8::100"},
+                ],
+            }
+        ]
+        response = schema.execute_sync(
+            query, variable_values={"sharedNetwork": "other"}
+        )
+        assert response.data["subnetUtilizations"] == []
+
+    def test_command(self):
+        """Test the command reports the subnets and the pools of a config."""
+        network = SharedNetwork.model_validate(PAYLOAD)
+        with tempfile.TemporaryDirectory() as directory:
+            source = Path(directory, "dhcpd6.conf")
+            source.write_text("".join(render([network])))
+            stdout = io.StringIO()
+            call_command("pool_utilization", str(source), "--pools", stdout=stdout)
+            assert stdout.getvalue().splitlines() == [
+                "shared_network,subnet6_number,low_address,high_address,size,used,"
+                "free,percent,fragmentation,free_blocks,largest_free_block",
+                "office,2001:db8::/64,,,272,4,268,1.47,0.0448,3,256",
+                "office,2001:db8::/64,2001:db8::,2001:db8::f,16,4,12,25.00,0.4167,2,7",
+                "office,2001:db8::/64,2001:db8::100,2001:db8::1ff,256,0,256,0.00,"
+                "0.0000,1,256",
+            ]
+
+            config = "".join(render([network]))
+            line = config[: config.index("shared-network")].count("\n") + 2
+            source.write_text(
+                config.replace("office {\n", "office {\n    max-lease-time 7200;\n")
+            )
+            stderr = io.StringIO()
+            call_command(
+                "pool_utilization", str(source), stdout=io.StringIO(), stderr=stderr
+            )
+            assert stderr.getvalue() == (
+                "Warning: Skipped statement 'max-lease-time' in shared-network "
+                f"(line {line}, column 5)\n"
+            )
+
+            with self.assertRaisesMessage(CommandError, "No such file"):
+                call_command(
+                    "pool_utilization", f"{source}.missing", stdout=io.StringIO()
+                )
+
+            source.write_text("shared-network office {\n    pool6 {\n    }\n}\n")
+            with self.assertRaisesMessage(CommandError, "line 2"):
+                call_command("pool_utilization", str(source), stdout=io.StringIO())
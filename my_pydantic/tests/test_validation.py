@@ -0,0 +1,81 @@
+"""Tests batch validation in the my_pydantic app."""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from asgiref.sync import async_to_sync
+from django.test import SimpleTestCase
+
+from project.schema import schema
+
+from ..validation import MIN_PARALLEL, validate_shared_networks
+
+
+def get_payload(index: int) -> dict:
+    """Return a SharedNetwork payload, invalid when the index is odd."""
+    return {
+        "name": f"network_{index}",
+        "option": {"dns_servers": ["8.8.8.8"]},
+        "parameter": {"preferred_lifetime": 1 + index % 2 * 9, "valid_lifetime": 5},
+        "subnets": [{"subnet6_number": "2001:4860:4860::/64"}],
+    }
+
+
+class ValidateSharedNetworksTestCase(SimpleTestCase):
+    """Tests the results of the payloads, in input order."""
+
+    def assert_results(self, results: list) -> None:
+        """Assert the odd payloads only are invalid."""
+        for index, errors in enumerate(results):
+            if index % 2:
+                [error] = errors
+                assert error["type"] == (
+                    "preferred_lifetime__lte__valid_lifetime__is_greater"
+                )
+                assert error["loc"] == ("parameter",)
+            else:
+                assert errors == []
+
+    def test_in_process(self):
+        """Test small batches are validated without the pool."""
+        results = validate_shared_networks(
+            [get_payload(index) for index in range(3)], executor=object()
+        )
+        assert len(results) == 3
+        self.assert_results(results)
+
+    def test_pool(self):
+        """Test large batches are validated by chunks in the pool."""
+        count = MIN_PARALLEL * 2 + 1
+        with ProcessPoolExecutor(
+            max_workers=2, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            results = validate_shared_networks(
+                (get_payload(index) for index in range(count)),
+                executor=executor,
+                max_workers=2,
+            )
+        assert len(results) == count
+        self.assert_results(results)
+
+    def test_mutation(self):
+        """Test an invalid value fails its own payload only."""
+        payloads = [get_payload(0), get_payload(1), {"name": "bad name"}]
+        response = async_to_sync(schema.execute)(
+            """mutation Validate($payloads: [JSON!]!) {
+              validateSharedNetworks(payloads: $payloads) { index valid errors }
+            }""",
+            variable_values={"payloads": payloads},
+        )
+        assert response.errors is None, response.errors
+        results = response.data["validateSharedNetworks"]
+        assert [(r["index"], r["valid"]) for r in results] == [
+            (0, True),
+            (1, False),
+            (2, False),
+        ]
+        assert {tuple(error["loc"]) for error in results[2]["errors"]} == {
+            ("name",),
+            ("option",),
+            ("parameter",),
+        }
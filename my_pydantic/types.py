@@ -1,8 +1,13 @@
 """Strawberry types in my_pydantic app."""
 
+from ipaddress import IPv6Address, IPv6Network
+
+import strawberry
 from strawberry.experimental import pydantic
+from strawberry.scalars import JSON
 
-from .pydantic import models
+from .pydantic import models, utilization
+from .scalars import BigIntScalar
 
 
 @pydantic.type(model=models.Option, all_fields=True)
@@ -13,9 +18,98 @@ class Option: ...
 class Parameter: ...
 
 
+@pydantic.type(model=models.Bind)
+class Bind:
+    # DUID and IAID are constrained strings, validated by the pydantic model.
+    duid: str
+    iaid: str
+    ip6_address: strawberry.auto
+
+
+@pydantic.type(model=models.IANA, all_fields=True)
+class IANA: ...
+
+
 @pydantic.type(model=models.Subnet6, all_fields=True)
 class Subnet6: ...
 
 
 @pydantic.type(model=models.SharedNetwork, all_fields=True)
 class SharedNetwork: ...
+
+
+@strawberry.type
+class SharedNetworkValidation:
+    """Validation result of a SharedNetwork payload."""
+
+    index: int = strawberry.field(description="The index of the payload.")
+    valid: bool
+    errors: JSON = strawberry.field(
+        description="The errors of the payload, see `convert_errors`."
+    )
+
+
+@strawberry.type
+class Utilization:
+    """Used and free addresses of ranges, see `utilization.Utilization`."""
+
+    size: BigIntScalar
+    used: BigIntScalar
+    free: BigIntScalar
+    percent: float = strawberry.field(description="The percent of used addresses.")
+    fragmentation: float = strawberry.field(
+        description="The fraction of the free addresses outside the largest block."
+    )
+    free_blocks: int
+    largest_free_block: BigIntScalar
+
+    @classmethod
+    def from_utilization(cls, instance: utilization.Utilization) -> "Utilization":
+        """Return the Utilization of the computed one."""
+        return cls(
+            size=instance.size,
+            used=instance.used,
+            free=instance.free,
+            percent=instance.percent,
+            fragmentation=instance.fragmentation,
+            free_blocks=instance.free_blocks,
+            largest_free_block=instance.largest_free_block,
+        )
+
+
+@strawberry.type
+class PoolUtilization:
+    """Utilization of an IANA pool."""
+
+    low_address: IPv6Address
+    high_address: IPv6Address
+    utilization: Utilization
+
+
+@strawberry.type
+class SubnetUtilization:
+    """Utilization of the pools of a Subnet6."""
+
+    shared_network: str
+    subnet6_number: IPv6Network
+    utilization: Utilization
+    pools: list[PoolUtilization]
+
+    @classmethod
+    def from_utilization(
+        cls, instance: utilization.SubnetUtilization
+    ) -> "SubnetUtilization":
+        """Return the SubnetUtilization of the computed one."""
+        return cls(
+            shared_network=instance.shared_network,
+            subnet6_number=instance.subnet6_number,
+            utilization=Utilization.from_utilization(instance.utilization),
+            pools=[
+                PoolUtilization(
+                    low_address=pool.pool.low_address,
+                    high_address=pool.pool.high_address,
+                    utilization=Utilization.from_utilization(pool.utilization),
+                )
+                for pool in instance.pools
+            ],
+        )
@@ -0,0 +1,124 @@
+"""Batch validation of SharedNetwork payloads in a process pool.
+
+Validating a `SharedNetwork` is CPU bound Python, so threads do not help;
+large batches are split into chunks validated by the processes of a pool, a
+few chunks per process so a slow chunk does not leave the others idle, and a
+chunk costs one round trip instead of one per payload. Small batches are
+validated in this process, where the round trips would cost more than they
+save.
+
+The results are the `convert_errors` of each payload, in input order, an empty
+list when the payload is valid.
+
+Examples:
+    Validate the payloads of a rollout::
+
+        results = validate_shared_networks(payloads)
+        invalid = {index: errors for index, errors in enumerate(results) if errors}
+
+References:
+    https://docs.python.org/3/library/concurrent.futures.html#processpoolexecutor
+    https://docs.python.org/3/library/multiprocessing.html#contexts-and-start-methods
+"""
+
+import asyncio
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Iterable, Optional, Sequence
+
+from pydantic import ValidationError
+from pydantic_core import ErrorDetails
+
+from .exceptions import convert_errors
+from .pydantic.models import SharedNetwork
+
+# Below it, the payloads are validated in this process.
+MIN_PARALLEL = 64
+CHUNKS_PER_WORKER = 4
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def validate_shared_network(data: Any) -> list[ErrorDetails]:
+    """Return the errors of the payload, empty when it is valid."""
+    try:
+        SharedNetwork.model_validate(data)
+    except ValidationError as e:
+        return convert_errors(e)
+    return []
+
+
+def validate_chunk(chunk: Sequence[Any]) -> list[list[ErrorDetails]]:
+    """Return the errors of each payload of the chunk, run by the workers."""
+    return [validate_shared_network(data) for data in chunk]
+
+
+def get_executor(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Return the pool shared by the calls, started on first use.
+
+    The workers are spawned, forking a server running threads is unsafe.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def get_chunks(items: list[Any], max_workers: Optional[int]) -> list[list[Any]]:
+    """Split the items in `CHUNKS_PER_WORKER` chunks per worker."""
+    count = (max_workers or os.cpu_count() or 1) * CHUNKS_PER_WORKER
+    size = max(1, math.ceil(len(items) / count))
+    return [items[start : start + size] for start in range(0, len(items), size)]
+
+
+def validate_shared_networks(
+    payloads: Iterable[Any],
+    *,
+    executor: Optional[Executor] = None,
+    max_workers: Optional[int] = None,
+) -> list[list[ErrorDetails]]:
+    """Return the errors of each payload, in input order.
+
+    Args:
+        payloads: The `SharedNetwork` payloads, e.g. parsed JSON.
+        executor: The pool of the chunks, `get_executor` by default.
+        max_workers: The number of workers of the default pool, the CPU
+            count when None.
+    """
+    items = list(payloads)
+    if len(items) < MIN_PARALLEL:
+        return validate_chunk(items)
+    executor = executor or get_executor(max_workers)
+    futures = [
+        executor.submit(validate_chunk, chunk)
+        for chunk in get_chunks(items, max_workers)
+    ]
+    return [errors for future in futures for errors in future.result()]
+
+
+async def avalidate_shared_networks(
+    payloads: Iterable[Any],
+    *,
+    executor: Optional[Executor] = None,
+    max_workers: Optional[int] = None,
+) -> list[list[ErrorDetails]]:
+    """Async `validate_shared_networks`, the event loop is not blocked."""
+    items = list(payloads)
+    if len(items) < MIN_PARALLEL:
+        return validate_chunk(items)
+    executor = executor or get_executor(max_workers)
+    results = await asyncio.gather(
+        *(
+            asyncio.wrap_future(executor.submit(validate_chunk, chunk))
+            for chunk in get_chunks(items, max_workers)
+        )
+    )
+    return [errors for chunk in results for errors in chunk]
@@ -21,10 +21,7 @@ from channels.routing import ProtocolTypeRouter, URLRouter
 from channels.security.websocket import AllowedHostsOriginValidator
 from django.core.asgi import get_asgi_application
 from django.urls import re_path
-from strawberry.channels import (
-    GraphQLHTTPConsumer,
-    GraphQLWSConsumer,
-)
+from strawberry.channels import GraphQLWSConsumer
 
 from .settings import DEBUG
 
@@ -37,10 +34,17 @@ django_asgi_app = get_asgi_application()
 # Import your Strawberry schema after creating the django ASGI application
 # This ensures django.setup() has been called before any ORM models are imported
 # for the schema.
-from .schema import schema  # noqa: E402
+from utils.strawberry.views import GraphQLHTTPConsumer  # noqa: E402
+
+from .schema import persisted_query_store, schema  # noqa: E402
 
 # Consumers
-gql_http_consumer = AuthMiddlewareStack(GraphQLHTTPConsumer.as_asgi(schema=schema))
+gql_http_consumer = AuthMiddlewareStack(
+    GraphQLHTTPConsumer.as_asgi(
+        schema=schema,
+        persisted_query_store=persisted_query_store,
+    )
+)
 gql_ws_consumer = GraphQLWSConsumer.as_asgi(schema=schema, debug=DEBUG)
 
 # Patterns
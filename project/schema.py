@@ -6,16 +6,21 @@ References:
 """
 
 import asyncio
+import contextlib
 from ipaddress import IPv4Address, IPv4Network, IPv6Address, IPv6Network
-from typing import TYPE_CHECKING, AsyncGenerator
-from uuid import uuid4
+from typing import TYPE_CHECKING, AsyncGenerator, Optional
 
 import strawberry
+from django.conf import settings
+from strawberry.scalars import JSON
 from strawberry_django.optimizer import DjangoOptimizerExtension
 
+from app.dataloaders import DataLoadersExtension
+from app.models import Color, Fruit, FruitCategory
 from app.mutations import Mutation as AppMutation
 from app.queries import Query as AppQuery
 from app.subscriptions import Subscription as AppSubscription
+from app.types import ColorChange, FruitChange
 from my_pydantic.pydantic.types import IPAddress, IPNetwork
 from my_pydantic.scalars import (
     IPAddressScalar,
@@ -27,8 +32,24 @@ from my_pydantic.scalars import (
 )
 from my_pydantic.schema import Mutation as MyPydanticMutation
 from my_pydantic.schema import Query as MyPydanticQuery
+from utils.broker.base import Broker
+from utils.broker.channels import ChannelsBroker
+from utils.broker.local import LocalBroker
+from utils.broker.model_events import ModelEvents
+from utils.lru import LRUCache
+from utils.strawberry.document_cache import CachedDocument, DocumentCacheExtension
+from utils.strawberry.live_query import LiveQueryResult, run_live_query
+from utils.strawberry.query_cost import QueryCostExtension
+from utils.strawberry.response_cache import (
+    DjangoResponseCacheBackend,
+    LocalResponseCacheBackend,
+    ResponseCache,
+    ResponseCacheBackend,
+    ResponseCacheExtension,
+)
 
 if TYPE_CHECKING:
+    from strawberry.extensions import SchemaExtension
     from strawberry.types.field import StrawberryField
 
 
@@ -42,7 +63,24 @@ class Mutation(AppMutation, MyPydanticMutation):
     """Root mutation class."""
 
 
-event_messages = {}
+def get_broker() -> Broker:
+    """Return the broker of the ``GRAPHQL_SUBSCRIPTION_BROKER`` setting.
+
+    ``"channels"`` shares the events between the workers through the channel
+    layer, ``"local"`` keeps them in this process.
+    """
+    if settings.GRAPHQL_SUBSCRIPTION_BROKER == "channels":
+        return ChannelsBroker()
+    return LocalBroker()
+
+
+# Events of the subscriptions, e.g. ``await broker.publish("message", 1)``.
+broker = get_broker()
+
+# Changes of the models, published on commit, see ``fruitChanged``.
+model_events = ModelEvents(broker)
+model_events.connect(Fruit, fields=["category", "color_id"])
+model_events.connect(Color)
 
 
 @strawberry.type
@@ -58,20 +96,53 @@ class Subscription(AppSubscription):
 
     @strawberry.subscription
     async def message(self) -> AsyncGenerator[int, None]:
-        try:
-            subscription_id = uuid4()
+        """Messages published to the ``message`` topic of the broker."""
+        async with broker.subscribe("message") as messages:
+            async for message in messages:
+                yield message
 
-            event_messages[subscription_id] = []
+    @strawberry.subscription
+    async def fruit_changed(
+        self,
+        category: Optional[FruitCategory] = None,
+        color_id: Optional[strawberry.ID] = None,
+    ) -> AsyncGenerator[list[FruitChange], None]:
+        """Fruits changed by each commit, filtered by category and color."""
+        changes = model_events.changes(Fruit, category=category, color_id=color_id)
+        async with contextlib.aclosing(changes):
+            async for events in changes:
+                yield [FruitChange.from_event(event) for event in events]
 
-            while True:
-                if len(event_messages[subscription_id]) > 0:
-                    yield event_messages[subscription_id]
-                    event_messages[subscription_id].clear()
+    @strawberry.subscription
+    async def color_changed(
+        self, id: Optional[strawberry.ID] = None
+    ) -> AsyncGenerator[list[ColorChange], None]:
+        """Colors changed by each commit, filtered by id."""
+        changes = model_events.changes(Color, pk=id)
+        async with contextlib.aclosing(changes):
+            async for events in changes:
+                yield [ColorChange.from_event(event) for event in events]
 
-                await asyncio.sleep(1)
-        except asyncio.CancelledError:
-            # stop listening to events
-            del event_messages[subscription_id]
+    @strawberry.subscription
+    async def live_query(
+        self,
+        info: strawberry.Info,
+        query: str,
+        variables: Optional[JSON] = None,
+        operation_name: Optional[str] = None,
+    ) -> AsyncGenerator[LiveQueryResult, None]:
+        """The query, executed again when its models change, as JSON patches."""
+        revisions = run_live_query(
+            info.schema,
+            model_events,
+            query,
+            variables=variables,  # type: ignore[arg-type]
+            operation_name=operation_name,
+            context=info.context,
+        )
+        async with contextlib.aclosing(revisions):
+            async for revision in revisions:
+                yield revision
 
 
 def public_field_filter(field: "StrawberryField") -> bool:
@@ -103,11 +174,65 @@ def public_field_filter(field: "StrawberryField") -> bool:
 class PublicSchema(strawberry.Schema):
     """Override Schema class."""
 
+    def __init__(
+        self,
+        *args,
+        document_cache_maxsize: int = 1000,
+        response_cache: Optional[ResponseCache] = None,
+        **kwargs,
+    ) -> None:
+        """Add a bounded cache of parsed and validated documents.
+
+        Counters are available from ``schema.document_cache.cache_info()``.
+        The opt-in ``response_cache`` answers async executions of queries.
+        """
+        self.document_cache: LRUCache[str, CachedDocument] = LRUCache(
+            maxsize=document_cache_maxsize
+        )
+        self.response_cache = response_cache
+        kwargs["extensions"] = [
+            *kwargs.get("extensions", ()),
+            DocumentCacheExtension(cache=self.document_cache),
+        ]
+        if response_cache is not None:
+            kwargs["extensions"].append(ResponseCacheExtension(cache=response_cache))
+        super().__init__(*args, **kwargs)
+
+    def get_extensions(self, sync: bool = False) -> list["SchemaExtension"]:
+        """Override to leave the async `ResponseCacheExtension` out of sync runs."""
+        extensions = super().get_extensions(sync=sync)
+        if sync:
+            return [e for e in extensions if not isinstance(e, ResponseCacheExtension)]
+        return extensions
+
     def get_fields(self, type_definition) -> list:  # type: ignore
         """Override get_fields function."""
         return list(filter(public_field_filter, type_definition.fields))
 
 
+# Automatic persisted queries, shared by the schema and the HTTP entry points.
+persisted_query_store: "LRUCache[str, str]" = LRUCache(maxsize=1000)
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Return the response cache of the ``GRAPHQL_RESPONSE_CACHE`` setting.
+
+    ``"local"`` keeps the responses in the memory of the process, any other
+    value is the alias of a Django cache shared by the workers.
+    """
+    alias = getattr(settings, "GRAPHQL_RESPONSE_CACHE", None)
+    if not alias:
+        return None
+    backend: ResponseCacheBackend = (
+        LocalResponseCacheBackend()
+        if alias == "local"
+        else DjangoResponseCacheBackend(alias=alias)
+    )
+    response_cache = ResponseCache(backend=backend)
+    response_cache.connect(Fruit, Color)
+    return response_cache
+
+
 # Root Schema
 schema = PublicSchema(
     query=Query,
@@ -115,6 +240,11 @@ schema = PublicSchema(
     subscription=Subscription,
     extensions=[
         DjangoOptimizerExtension,  # not required, but highly recommended
+        DataLoadersExtension,
+        QueryCostExtension(
+            max_cost=settings.GRAPHQL_MAX_QUERY_COST,
+            max_depth=settings.GRAPHQL_MAX_QUERY_DEPTH,
+        ),
     ],
     scalar_overrides={
         IPAddress: IPAddressScalar,
@@ -124,4 +254,5 @@ schema = PublicSchema(
         IPv6Address: IPv6AddressScalar,
         IPv6Network: IPv6NetworkScalar,
     },
+    response_cache=get_response_cache(),
 )
@@ -165,3 +165,51 @@ STRAWBERRY_DJANGO = {
     "FIELD_DESCRIPTION_FROM_HELP_TEXT": True,
     "TYPE_DESCRIPTION_FROM_MODEL_DOCSTRING": True,
 }
+
+# Opt-in response cache of `project.schema.schema`, invalidated by model signals.
+# "local" keeps responses in the process memory, any other value is a `CACHES` alias.
+GRAPHQL_RESPONSE_CACHE = os.environ.get("GRAPHQL_RESPONSE_CACHE")
+
+# Operations of `project.schema.schema` over these limits are rejected before execution.
+GRAPHQL_MAX_QUERY_COST = int(os.environ.get("GRAPHQL_MAX_QUERY_COST", "5000"))
+GRAPHQL_MAX_QUERY_DEPTH = int(os.environ.get("GRAPHQL_MAX_QUERY_DEPTH", "10"))
+
+# https://channels.readthedocs.io/en/latest/topics/channel_layers.html
+# Set CHANNEL_LAYER_REDIS_URL to share the layer between workers, requires channels_redis:
+# poetry install --with redis
+CHANNEL_LAYERS = {
+    "default": {
+        "BACKEND": "channels.layers.InMemoryChannelLayer",
+    },
+}
+if channel_layer_redis_url := os.environ.get("CHANNEL_LAYER_REDIS_URL"):
+    CHANNEL_LAYERS["default"] = {
+        "BACKEND": "channels_redis.core.RedisChannelLayer",
+        "CONFIG": {"hosts": [channel_layer_redis_url]},
+    }
+
+# Broker of the subscription events, "channels" (every worker) or "local" (this process).
+GRAPHQL_SUBSCRIPTION_BROKER = os.environ.get("GRAPHQL_SUBSCRIPTION_BROKER", "channels")
+
+# Admission control of the `runCommand` subscriptions, each one runs a subprocess.
+# At most LIMIT run at once, MAX_QUEUED more wait at most MAX_WAIT seconds, the next are rejected.
+COMMAND_SUBSCRIPTION_LIMIT = int(
+    os.environ.get("COMMAND_SUBSCRIPTION_LIMIT", str(os.cpu_count() or 1))
+)
+COMMAND_SUBSCRIPTION_MAX_QUEUED = int(
+    os.environ.get("COMMAND_SUBSCRIPTION_MAX_QUEUED", "100")
+)
+COMMAND_SUBSCRIPTION_MAX_WAIT = float(
+    os.environ.get("COMMAND_SUBSCRIPTION_MAX_WAIT", "30")
+)
+
+# Identical `runCommand` subscriptions share one subprocess, late ones get the last REPLAY lines.
+COMMAND_SUBSCRIPTION_REPLAY = int(os.environ.get("COMMAND_SUBSCRIPTION_REPLAY", "100"))
+
+# Worker processes validating large `validateSharedNetworks` batches.
+SHARED_NETWORK_VALIDATION_WORKERS = int(
+    os.environ.get("SHARED_NETWORK_VALIDATION_WORKERS", str(os.cpu_count() or 1))
+)
+
+# Parsed IP addresses and networks shared by their strings, 0 to disable.
+IP_INTERN_CACHE_SIZE = int(os.environ.get("IP_INTERN_CACHE_SIZE", "0"))
@@ -20,9 +20,10 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
-from strawberry.django.views import AsyncGraphQLView
 
-from .schema import schema
+from utils.strawberry.views import AsyncGraphQLView
+
+from .schema import persisted_query_store, schema
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -32,7 +33,14 @@ urlpatterns = [
     # strawberry-django: Serving as ASGI (async)
     # https://strawberry.rocks/docs/integrations/django#async-django
     # https://strawberry-graphql.github.io/strawberry-django/guide/views/#serving-as-asgi-async
-    path("graphql/", AsyncGraphQLView.as_view(schema=schema)),
+    # Automatic persisted queries: utils/strawberry/persisted_queries.py
+    path(
+        "graphql/",
+        AsyncGraphQLView.as_view(
+            schema=schema,
+            persisted_query_store=persisted_query_store,
+        ),
+    ),
     # django-debug-toolbar: Add the URLs
     # https://django-debug-toolbar.readthedocs.io/en/latest/installation.html#add-the-urls
     path("__debug__/", include("debug_toolbar.urls")),
@@ -0,0 +1,103 @@
+"""Admission control of expensive tasks, e.g. subprocesses.
+
+At most ``limit`` tasks run at once, the next ones wait in a FIFO queue of at
+most ``max_queued`` tasks for at most ``max_wait`` seconds, and are rejected
+beyond that, so a burst of requests can not fork without bound.
+
+Examples:
+    Run at most 4 commands, queue at most 16 more for 10 seconds::
+
+        admission = AdmissionController(4, max_queued=16, max_wait=10)
+
+        async with admission.admit():
+            proc = await asyncio.create_subprocess_exec(...)
+
+References:
+    https://docs.python.org/3/library/asyncio-sync.html#semaphore
+"""
+
+import asyncio
+import contextlib
+from collections import deque
+from typing import AsyncIterator, Deque, Optional
+
+
+class AdmissionRejected(Exception):
+    """The task is rejected, the queue is full or the wait is over."""
+
+
+class AdmissionController:
+    """Concurrency limiter with a bounded waiting queue."""
+
+    def __init__(
+        self, limit: int, *, max_queued: int = 0, max_wait: Optional[float] = None
+    ) -> None:
+        """Initialize the AdmissionController.
+
+        Args:
+            limit: The maximum number of running tasks.
+            max_queued: The maximum number of waiting tasks, none wait when 0.
+            max_wait: The maximum seconds a task waits, unbounded when None.
+        """
+        if limit < 1:
+            raise ValueError("The limit must be at least 1.")
+        self.limit = limit
+        self.max_queued = max_queued
+        self.max_wait = max_wait
+        self.running = 0
+        self._waiters: Deque[asyncio.Future[None]] = deque()
+
+    @property
+    def queued(self) -> int:
+        """The number of waiting tasks."""
+        return sum(not waiter.done() for waiter in self._waiters)
+
+    @contextlib.asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """Run the context once admitted.
+
+        Raises:
+            AdmissionRejected: The queue is full or the wait is over.
+        """
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self) -> None:
+        """Wait for a running slot, see `admit`."""
+        if self.running < self.limit and not self.queued:
+            self.running += 1
+            return
+        if self.queued >= self.max_queued:
+            raise AdmissionRejected(
+                f"{self.running} tasks are running and {self.queued} are queued."
+            )
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            async with asyncio.timeout(self.max_wait):
+                await waiter
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over while this task was cancelled.
+                self.release()
+            else:
+                with contextlib.suppress(ValueError):
+                    self._waiters.remove(waiter)
+            if isinstance(e, TimeoutError):
+                raise AdmissionRejected(
+                    f"No slot was free after {self.max_wait} seconds."
+                ) from e
+            raise
+
+    def release(self) -> None:
+        """Hand the running slot over to the next waiting task."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.running -= 1
@@ -0,0 +1,34 @@
+"""Publish/subscribe broker of subscription events.
+
+Examples:
+    Subscribe in a strawberry subscription::
+
+        @strawberry.subscription
+        async def message(self) -> AsyncGenerator[int, None]:
+            async with broker.subscribe("message") as messages:
+                async for message in messages:
+                    yield message
+
+    Publish from anywhere in the process::
+
+        await broker.publish("message", 1)
+"""
+
+import abc
+from typing import Any, AsyncContextManager, AsyncIterator
+
+
+class Broker(abc.ABC):
+    """Deliver the messages published to a topic to its subscribers."""
+
+    @abc.abstractmethod
+    def subscribe(self, topic: str) -> AsyncContextManager[AsyncIterator[Any]]:
+        """Subscribe to the topic until the context exits.
+
+        The context yields an async iterator of the published messages, it is
+        removed from the topic on exit however the subscription ends.
+        """
+
+    @abc.abstractmethod
+    async def publish(self, topic: str, message: Any) -> None:
+        """Push the message to the subscribers of the topic."""
@@ -0,0 +1,173 @@
+"""Broker shared by the workers through the Channels layer.
+
+Each topic is a group of the channel layer. A worker joins the group of a topic
+with one channel while it has subscribers of the topic, and one reader task
+fans the messages of that channel out to its local subscribers, so a message
+is sent once per worker, not once per subscriber. When the layer fails, e.g.
+its Redis connection is lost, the local subscribers of the topic end with the
+error and the next subscription joins the group again.
+
+Examples:
+    Configure a channel layer shared by the workers, ``settings.py``::
+
+        CHANNEL_LAYERS = {
+            "default": {
+                "BACKEND": "channels_redis.core.RedisChannelLayer",
+                "CONFIG": {"hosts": ["redis://127.0.0.1:6379"]},
+            },
+        }
+
+    And use the broker::
+
+        broker = ChannelsBroker()
+        await broker.publish("message", 1)
+
+References:
+    https://channels.readthedocs.io/en/latest/topics/channel_layers.html#groups
+    https://github.com/django/channels_redis
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import re
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from channels.layers import DEFAULT_CHANNEL_LAYER, get_channel_layer
+
+from .base import Broker
+from .local import LocalBroker, Subscriber
+
+MESSAGE_TYPE = "broker.message"
+GROUP_NAME_MAX_LENGTH = 100
+GROUP_NAME_PATTERN = re.compile(r"^[a-zA-Z0-9_.-]+$")
+
+
+class ChannelsBroker(Broker):
+    """Broker of the subscribers of every worker sharing the channel layer."""
+
+    def __init__(
+        self,
+        alias: str = DEFAULT_CHANNEL_LAYER,
+        *,
+        group_prefix: str = "broker",
+        maxsize: int = 0,
+    ) -> None:
+        """Initialize the ChannelsBroker.
+
+        Args:
+            alias: The alias of the ``CHANNEL_LAYERS`` setting to use.
+            group_prefix: The prefix of the group names of the topics.
+            maxsize: The maximum number of pending messages per subscriber,
+                unbounded when 0.
+        """
+        self.alias = alias
+        self.group_prefix = group_prefix
+        self.local = LocalBroker(maxsize=maxsize)
+        self.readers: Dict[str, Tuple[str, asyncio.Task[None]]] = {}
+        self._lock: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Lock]] = None
+
+    @property
+    def layer(self) -> Any:
+        """The channel layer of the alias."""
+        layer = get_channel_layer(self.alias)
+        if layer is None:
+            raise RuntimeError(f"The channel layer '{self.alias}' is not configured.")
+        return layer
+
+    @property
+    def lock(self) -> asyncio.Lock:
+        """The lock of the readers, created in the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock[0] is not loop:
+            self._lock = (loop, asyncio.Lock())
+        return self._lock[1]
+
+    def get_group_name(self, topic: str) -> str:
+        """Return the group name of the topic, hashed when it is not valid."""
+        name = f"{self.group_prefix}.{topic}"
+        if len(name) < GROUP_NAME_MAX_LENGTH and GROUP_NAME_PATTERN.match(name):
+            return name
+        return f"{self.group_prefix}.{hashlib.sha256(topic.encode()).hexdigest()}"
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, topic: str) -> AsyncIterator[Subscriber]:
+        """Subscribe to the topic until the context exits."""
+        try:
+            async with self.local.subscribe(topic) as subscriber:
+                await self._start_reader(topic)
+                yield subscriber
+        finally:
+            await self._stop_reader(topic)
+
+    async def publish(self, topic: str, message: Any) -> None:
+        """Send the message to the workers subscribed to the topic.
+
+        The message must be serializable by the channel layer.
+        """
+        await self.layer.group_send(
+            self.get_group_name(topic), {"type": MESSAGE_TYPE, "message": message}
+        )
+
+    def count_subscribers(self, topic: str) -> int:
+        """Return the number of subscribers of the topic in this worker.
+
+        Subscribers are counted once the worker has joined the group.
+        """
+        if topic not in self.readers:
+            return 0
+        return self.local.count_subscribers(topic)
+
+    async def _start_reader(self, topic: str) -> None:
+        """Join the group of the topic, once per worker."""
+        async with self.lock:
+            if topic in self.readers:
+                return
+            layer = self.layer
+            channel = await layer.new_channel()
+            await layer.group_add(self.get_group_name(topic), channel)
+            task = asyncio.create_task(self._read(topic, channel))
+            self.readers[topic] = (channel, task)
+
+    async def _stop_reader(self, topic: str) -> None:
+        """Leave the group of the topic after its last local subscriber."""
+        async with self.lock:
+            if self.local.count_subscribers(topic) or topic not in self.readers:
+                return
+            channel, task = self.readers.pop(topic)
+            task.cancel()
+            await self.layer.group_discard(self.get_group_name(topic), channel)
+
+    async def _read(self, topic: str, channel: str) -> None:
+        """Fan the messages of the channel out until the layer fails."""
+        try:
+            async with asyncio.TaskGroup() as tasks:
+                tasks.create_task(self._receive(topic, channel))
+                tasks.create_task(self._refresh(topic, channel))
+        except* Exception as errors:
+            self._fail(topic, channel, errors.exceptions[0])
+            with contextlib.suppress(Exception):
+                # The membership expires anyway when the layer is still down.
+                await self.layer.group_discard(self.get_group_name(topic), channel)
+
+    def _fail(self, topic: str, channel: str, error: Exception) -> None:
+        """Drop the reader of the channel and end the subscribers of the topic."""
+        reader = self.readers.get(topic)
+        if reader is not None and reader[0] == channel:
+            del self.readers[topic]
+        self.local.fail_nowait(topic, error)
+
+    async def _receive(self, topic: str, channel: str) -> None:
+        """Fan the messages of the channel out to the local subscribers."""
+        layer = self.layer
+        while True:
+            event = await layer.receive(channel)
+            self.local.publish_nowait(topic, event["message"])
+
+    async def _refresh(self, topic: str, channel: str) -> None:
+        """Join the group again before the membership expires."""
+        layer = self.layer
+        interval = getattr(layer, "group_expiry", 86400) / 2
+        while True:
+            await asyncio.sleep(interval)
+            await layer.group_add(self.get_group_name(topic), channel)
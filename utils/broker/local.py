@@ -0,0 +1,132 @@
+"""In-process broker.
+
+Every subscriber owns an `asyncio.Queue`, publishing pushes the message to the
+queues of the topic, so subscribers wake up only when there is a message.
+
+References:
+    https://docs.python.org/3/library/asyncio-queue.html
+    https://docs.python.org/3/library/asyncio-dev.html#concurrency-and-multithreading
+"""
+
+import asyncio
+import contextlib
+import threading
+from typing import Any, AsyncIterator, Dict, NamedTuple, Set
+
+from .base import Broker
+
+
+class Failure(NamedTuple):
+    """The error ending the iteration of a subscriber."""
+
+    error: Exception
+
+
+class Subscriber:
+    """Queue of the messages of one subscription, an async iterator."""
+
+    def __init__(self, maxsize: int = 0) -> None:
+        """Initialize the Subscriber in the running event loop.
+
+        Args:
+            maxsize: The maximum number of pending messages, unbounded when 0.
+                The oldest pending message is dropped for a new one.
+        """
+        self.queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=maxsize)
+        self.loop = asyncio.get_running_loop()
+
+    def __aiter__(self) -> "Subscriber":
+        """Return the iterator."""
+        return self
+
+    async def __anext__(self) -> Any:
+        """Wait for the next message.
+
+        Raises:
+            Exception: The error of `fail`, after the pending messages.
+        """
+        message = await self.queue.get()
+        if isinstance(message, Failure):
+            raise message.error
+        return message
+
+    def put(self, message: Any) -> None:
+        """Push the message, from the event loop of the subscriber only."""
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+
+    def fail(self, error: Exception) -> None:
+        """End the iteration with the error, from any thread."""
+        self.put_threadsafe(Failure(error))
+
+    def put_threadsafe(self, message: Any) -> None:
+        """Push the message from any thread."""
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self.loop:
+            self.put(message)
+            return
+        with contextlib.suppress(RuntimeError):
+            # The loop is closed, so the subscription is over.
+            self.loop.call_soon_threadsafe(self.put, message)
+
+
+class LocalBroker(Broker):
+    """Broker of the subscribers of this process."""
+
+    def __init__(self, maxsize: int = 0) -> None:
+        """Initialize the LocalBroker.
+
+        Args:
+            maxsize: The maximum number of pending messages per subscriber,
+                unbounded when 0.
+        """
+        self.maxsize = maxsize
+        self.topics: Dict[str, Set[Subscriber]] = {}
+        self._lock = threading.Lock()
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, topic: str) -> AsyncIterator[Subscriber]:
+        """Subscribe to the topic until the context exits."""
+        subscriber = Subscriber(maxsize=self.maxsize)
+        with self._lock:
+            self.topics.setdefault(topic, set()).add(subscriber)
+        try:
+            yield subscriber
+        finally:
+            with self._lock:
+                subscribers = self.topics[topic]
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self.topics[topic]
+
+    def publish_nowait(self, topic: str, message: Any) -> int:
+        """Push the message to the subscribers of the topic, from any thread.
+
+        Returns:
+            The number of subscribers.
+        """
+        with self._lock:
+            subscribers = list(self.topics.get(topic, ()))
+        for subscriber in subscribers:
+            subscriber.put_threadsafe(message)
+        return len(subscribers)
+
+    def fail_nowait(self, topic: str, error: Exception) -> None:
+        """End the subscribers of the topic with the error, from any thread."""
+        with self._lock:
+            subscribers = list(self.topics.get(topic, ()))
+        for subscriber in subscribers:
+            subscriber.fail(error)
+
+    async def publish(self, topic: str, message: Any) -> None:
+        """Push the message to the subscribers of the topic."""
+        self.publish_nowait(topic, message)
+
+    def count_subscribers(self, topic: str) -> int:
+        """Return the number of subscribers of the topic."""
+        with self._lock:
+            return len(self.topics.get(topic, ()))
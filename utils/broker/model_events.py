@@ -0,0 +1,256 @@
+"""Created, updated and deleted events of Django models, through a broker.
+
+`post_save` and `post_delete` are collected per transaction and published on
+commit, one message per model, so a transaction saving thousands of rows sends
+one batch. Events of a rolled back transaction or savepoint are never sent.
+A message is a list of events, an event is a dict of the ``action``, the
+``pk`` and the values of the connected fields, so subscribers filter without
+a query.
+
+Signals are not sent by `QuerySet.update` and bulk operations, `record` their
+events or send `utils.signals.post_bulk_save` instead.
+
+Examples:
+    Publish the events of fruits with their category::
+
+        model_events = ModelEvents(broker)
+        model_events.connect(Fruit, fields=["category", "color_id"])
+
+    And subscribe to the citrus ones::
+
+        async for events in model_events.changes(Fruit, category="citrus"):
+            ...
+
+References:
+    https://docs.djangoproject.com/en/5.0/topics/db/transactions/#performing-actions-after-commit
+"""
+
+import asyncio
+import threading
+from enum import Enum
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+
+from asgiref.sync import async_to_sync
+from django.db import DEFAULT_DB_ALIAS, models, transaction
+from django.db.models.signals import post_delete, post_save
+
+from utils.signals import post_bulk_save
+
+from .base import Broker
+
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+
+Event = Dict[str, Any]
+
+
+def merge_events(previous: Event, event: Event) -> Optional[Event]:
+    """Coalesce two events of the same row, None when they cancel out."""
+    if previous["action"] == CREATED:
+        if event["action"] == DELETED:
+            return None
+        return {**event, "action": CREATED}
+    if previous["action"] == DELETED and event["action"] == CREATED:
+        return {**event, "action": UPDATED}
+    return event
+
+
+class EventBatch:
+    """Events of one transaction, by topic and primary key."""
+
+    def __init__(self, publish: Any, hooks: Optional[list]) -> None:
+        """Initialize the EventBatch.
+
+        Args:
+            publish: Called with the topic and the events of each topic.
+            hooks: The `run_on_commit` list of the connection, Django replaces
+                it when the transaction commits or rolls back. None in
+                autocommit.
+        """
+        self.publish = publish
+        self.hooks = hooks
+        self.events: Dict[Tuple[str, Any], Event] = {}
+        self.flushed = False
+
+    def add(self, topic: str, event: Event) -> None:
+        """Add the event, coalesced with the previous one of the row."""
+        key = (topic, event["pk"])
+        previous = self.events.get(key)
+        merged = event if previous is None else merge_events(previous, event)
+        if merged is None:
+            del self.events[key]
+        else:
+            self.events[key] = merged
+
+    def __call__(self) -> None:
+        """Publish the events, the `on_commit` callback."""
+        self.flushed = True
+        topics: Dict[str, List[Event]] = {}
+        for (topic, _), event in self.events.items():
+            topics.setdefault(topic, []).append(event)
+        for topic, events in topics.items():
+            self.publish(topic, events)
+
+
+class ModelEvents:
+    """Publish the events of the connected models on commit."""
+
+    def __init__(self, broker: Broker, *, topic_prefix: str = "model") -> None:
+        """Initialize the ModelEvents.
+
+        Args:
+            broker: The broker of the events.
+            topic_prefix: The prefix of the topics of the models.
+        """
+        self.broker = broker
+        self.topic_prefix = topic_prefix
+        self.fields: Dict[type[models.Model], List[str]] = {}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._local = threading.local()
+        self._dispatch_uid = f"{topic_prefix}-{id(self)}"
+
+    def get_topic(self, model: type[models.Model]) -> str:
+        """Return the topic of the events of the model."""
+        return f"{self.topic_prefix}.{model._meta.label_lower}"
+
+    def connect(self, model: type[models.Model], fields: Iterable[str] = ()) -> None:
+        """Publish the events of the model, with the values of the fields."""
+        self.fields[model] = list(fields)
+        post_save.connect(
+            self._post_save, sender=model, weak=False, dispatch_uid=self._dispatch_uid
+        )
+        post_delete.connect(
+            self._post_delete,
+            sender=model,
+            weak=False,
+            dispatch_uid=self._dispatch_uid,
+        )
+        post_bulk_save.connect(
+            self._post_bulk_save,
+            sender=model,
+            weak=False,
+            dispatch_uid=self._dispatch_uid,
+        )
+
+    def disconnect(self) -> None:
+        """Stop publishing, the counterpart of `connect`."""
+        for model in self.fields:
+            for signal in (post_save, post_delete, post_bulk_save):
+                signal.disconnect(sender=model, dispatch_uid=self._dispatch_uid)
+        self.fields.clear()
+
+    def _post_save(self, sender: Any, instance: Any, created: bool, **kwargs) -> None:
+        """Receive `post_save`."""
+        self.record(instance, CREATED if created else UPDATED, using=kwargs["using"])
+
+    def _post_bulk_save(
+        self, sender: Any, instances: Iterable[Any], created: bool, **kwargs
+    ) -> None:
+        """Receive `post_bulk_save`."""
+        for instance in instances:
+            self.record(instance, CREATED if created else UPDATED, kwargs["using"])
+
+    def _post_delete(self, sender: Any, instance: Any, **kwargs) -> None:
+        """Receive `post_delete`."""
+        self.record(instance, DELETED, using=kwargs["using"])
+
+    def record(
+        self, instance: models.Model, action: str, using: str = DEFAULT_DB_ALIAS
+    ) -> None:
+        """Add the event of the instance to the batch of the transaction."""
+        model = type(instance)._meta.concrete_model
+        event: Event = {"action": action, "pk": instance.pk}
+        for name in self.fields.get(model, ()):  # type: ignore[call-overload]
+            value = getattr(instance, name)
+            event[name] = value.value if isinstance(value, Enum) else value
+        batch = self._get_batch(using)
+        batch.add(self.get_topic(model), event)  # type: ignore[arg-type]
+        if batch.hooks is None:
+            # Autocommit, the row is committed already.
+            batch()
+
+    def _get_batch(self, using: str) -> EventBatch:
+        """Return the batch of the transaction or savepoint, flushed on commit.
+
+        A batch per savepoint, so Django discards it with a rolled back one.
+        """
+        connection = transaction.get_connection(using)
+        if not connection.in_atomic_block:
+            return EventBatch(self._publish, None)
+        batches: Dict[Tuple[str, Tuple[str, ...]], EventBatch] = (
+            self._local.__dict__.setdefault("batches", {})
+        )
+        # Blocks without a savepoint (None) can not roll back on their own.
+        key = (using, tuple(filter(None, connection.savepoint_ids)))
+        batch = batches.get(key)
+        if (
+            batch is None
+            or batch.flushed
+            or batch.hooks is not connection.run_on_commit
+        ):
+            # Forget the batches of the committed or rolled back transactions.
+            for other in [k for k in batches if k[0] == using]:
+                if batches[other].hooks is not connection.run_on_commit:
+                    del batches[other]
+            batch = batches[key] = EventBatch(self._publish, connection.run_on_commit)
+            transaction.on_commit(batch, using=using)
+        return batch
+
+    def _publish(self, topic: str, events: List[Event]) -> None:
+        """Publish the events from the thread of the transaction.
+
+        The events are published in the event loop of the subscribers, once
+        known. A nested `async_to_sync` would swap the executor of
+        `sync_to_async` under the concurrent tasks of that loop meanwhile.
+        """
+        loop = self.loop
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if loop is None or not loop.is_running():
+            async_to_sync(self.broker.publish)(topic, events)
+        elif loop is running_loop:
+            # Unsafe sync code in the loop, waiting would deadlock.
+            loop.create_task(self.broker.publish(topic, events))
+        else:
+            publish = self.broker.publish(topic, events)
+            asyncio.run_coroutine_threadsafe(publish, loop).result()
+
+    def subscribe(self, model: type[models.Model]) -> AsyncContextManager[Any]:
+        """Subscribe to the events of the model, see `Broker.subscribe`."""
+        self.loop = asyncio.get_running_loop()
+        return self.broker.subscribe(self.get_topic(model))
+
+    async def changes(
+        self, model: type[models.Model], **filters: Any
+    ) -> AsyncIterator[List[Event]]:
+        """Yield the events of the model matching the filters, per commit.
+
+        Filters are values of connected fields, None filters are ignored.
+        Values are compared as strings, so IDs and enums match their values.
+        """
+        expected = {
+            name: str(value.value if isinstance(value, Enum) else value)
+            for name, value in filters.items()
+            if value is not None
+        }
+        async with self.subscribe(model) as messages:
+            async for events in messages:
+                matched = [
+                    event
+                    for event in events
+                    if all(str(event[k]) == v for k, v in expected.items())
+                ]
+                if matched:
+                    yield matched
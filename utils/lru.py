@@ -0,0 +1,104 @@
+"""Bounded LRU cache with hit/miss/eviction counters.
+
+References:
+    https://docs.python.org/3/library/collections.html#collections.OrderedDict
+    https://docs.python.org/3/library/functools.html#functools.lru_cache
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass(frozen=True)
+class CacheInfo:
+    """Snapshot of the cache counters."""
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class LRUCache(Generic[K, V]):
+    """Least recently used cache bounded by ``maxsize`` entries.
+
+    Unlike `functools.lru_cache`, values are set explicitly, so callers can
+    decide what is worth caching (e.g. only successfully parsed documents).
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        """Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept before the least recently
+                used one is evicted.
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be greater than 0.")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: OrderedDict[K, V] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of cached entries."""
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        """Whether key is cached, without touching the recency order."""
+        return key in self._data
+
+    def get(self, key: K) -> Optional[V]:
+        """Get the cached value and mark it as most recently used."""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def peek(self, key: K) -> Optional[V]:
+        """Get the cached value without updating recency or counters."""
+        return self._data.get(key)
+
+    def set(self, key: K, value: V) -> None:
+        """Set the value, evicting the least recently used entry when full."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+            self._data[key] = value
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: K) -> Optional[V]:
+        """Remove the key and return its value if any."""
+        with self._lock:
+            return self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries and reset counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def cache_info(self) -> CacheInfo:
+        """Return the counters, like `functools.lru_cache.cache_info`."""
+        return CacheInfo(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            maxsize=self.maxsize,
+            currsize=len(self._data),
+        )
@@ -0,0 +1,296 @@
+"""Benchmark the throughput and the latency of the subscription brokers.
+
+Examples:
+    In-process broker::
+
+        python manage.py benchmark_broker --broker local --subscribers 1000
+
+    Channels broker, 4 brokers stand for 4 workers sharing the channel layer,
+    set ``CHANNEL_LAYER_REDIS_URL`` to go through Redis::
+
+        python manage.py benchmark_broker --broker channels --workers 4
+
+    Channels broker, 4 worker processes sharing Redis, the messages are
+    published by this process::
+
+        export CHANNEL_LAYER_REDIS_URL=redis://127.0.0.1:6379
+        python manage.py benchmark_broker --workers 4 --processes
+"""
+
+import asyncio
+import multiprocessing
+import os
+import queue
+import statistics
+import time
+from typing import Any, Sequence
+
+import django
+from channels.layers import InMemoryChannelLayer, get_channel_layer
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.broker.channels import ChannelsBroker
+from utils.broker.local import LocalBroker
+
+TOPIC = "benchmark"
+
+
+class Deliveries:
+    """The latencies of the messages received, and the time of the last one.
+
+    Times are `time.time`, comparable between processes.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the Deliveries."""
+        self.latencies: list[float] = []
+        self.last = 0.0
+
+
+async def start_subscribers(
+    brokers: Sequence[LocalBroker | ChannelsBroker],
+    count: int,
+    messages: int,
+    deliveries: Deliveries,
+) -> list[asyncio.Task[None]]:
+    """Start ``count`` subscribers spread over the brokers, once all subscribed.
+
+    Each one receives ``messages`` messages into the deliveries.
+    """
+    ready = asyncio.Event()
+
+    async def subscribe(index: int) -> None:
+        async with brokers[index % len(brokers)].subscribe(TOPIC) as received:
+            if sum(b.count_subscribers(TOPIC) for b in brokers) == count:
+                ready.set()
+            for _ in range(messages):
+                message = await anext(received)
+                deliveries.last = time.time()
+                deliveries.latencies.append(deliveries.last - message["sent"])
+
+    if not count:
+        return []
+    tasks = [asyncio.create_task(subscribe(i)) for i in range(count)]
+    await ready.wait()
+    return tasks
+
+
+async def wait_subscribers(tasks: list[asyncio.Task[None]], timeout: float) -> None:
+    """Wait for the subscribers, messages dropped are waited for until the timeout."""
+    if not tasks:
+        return
+    _, pending = await asyncio.wait(tasks, timeout=timeout)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def publish(
+    broker: LocalBroker | ChannelsBroker, messages: int
+) -> tuple[float, float]:
+    """Publish the messages, return when it started and how long it took."""
+    started = time.time()
+    for index in range(messages):
+        await broker.publish(TOPIC, {"index": index, "sent": time.time()})
+        # Let the readers drain their channel, channel layers drop messages
+        # sent to full channels.
+        await asyncio.sleep(0)
+    return started, time.time() - started
+
+
+def run_worker(
+    settings_module: str,
+    subscribers: int,
+    messages: int,
+    timeout: float,
+    results: Any,
+) -> None:
+    """Run the subscribers of one worker process, a target of `Process`.
+
+    Puts None once they are subscribed, then their latencies and last delivery.
+    """
+    os.environ["DJANGO_SETTINGS_MODULE"] = settings_module
+    django.setup()
+
+    async def run() -> Deliveries:
+        deliveries = Deliveries()
+        tasks = await start_subscribers(
+            [ChannelsBroker()], subscribers, messages, deliveries
+        )
+        results.put(None)
+        await wait_subscribers(tasks, timeout)
+        return deliveries
+
+    deliveries = asyncio.run(run())
+    results.put((deliveries.latencies, deliveries.last))
+
+
+class Command(BaseCommand):
+    """Benchmark the brokers of `utils.broker`."""
+
+    help = "Benchmark the throughput and the latency of the subscription brokers"
+
+    def add_arguments(self, parser):
+        """Override."""
+        parser.add_argument(
+            "--broker",
+            choices=["local", "channels"],
+            default="channels",
+            help="The broker to benchmark (default: channels)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=2,
+            help="The number of channels brokers sharing the layer (default: 2)",
+        )
+        parser.add_argument(
+            "--processes",
+            action="store_true",
+            help="Run each channels broker in a worker process, the channel layer "
+            "must be shared by processes, e.g. Redis",
+        )
+        parser.add_argument(
+            "--subscribers",
+            type=int,
+            default=100,
+            help="The number of subscribers, spread over the workers (default: 100)",
+        )
+        parser.add_argument(
+            "--messages",
+            type=int,
+            default=1000,
+            help="The number of published messages (default: 1000)",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=30,
+            help="Seconds to wait for the deliveries (default: 30)",
+        )
+
+    def handle(self, *args, **options):
+        """Override."""
+        if options["processes"]:
+            if options["broker"] != "channels":
+                raise CommandError("--processes needs the channels broker.")
+            if isinstance(get_channel_layer(), InMemoryChannelLayer):
+                raise CommandError(
+                    "--processes needs a channel layer shared by processes, "
+                    "set CHANNEL_LAYER_REDIS_URL."
+                )
+            self.benchmark_processes(**options)
+        else:
+            asyncio.run(self.benchmark(**options))
+
+    async def benchmark(
+        self,
+        broker: str,
+        workers: int,
+        subscribers: int,
+        messages: int,
+        timeout: float,
+        **options,
+    ) -> None:
+        """Publish the messages and measure their deliveries, in this process."""
+        brokers: list[LocalBroker | ChannelsBroker] = (
+            [LocalBroker()]
+            if broker == "local"
+            else [ChannelsBroker() for _ in range(workers)]
+        )
+        deliveries = Deliveries()
+        tasks = await asyncio.wait_for(
+            start_subscribers(brokers, subscribers, messages, deliveries), timeout
+        )
+        started, published = await publish(brokers[0], messages)
+        await wait_subscribers(tasks, timeout)
+        self.report(
+            f"broker={broker} workers={len(brokers)}",
+            subscribers,
+            messages,
+            started,
+            published,
+            deliveries,
+        )
+
+    def benchmark_processes(
+        self,
+        workers: int,
+        subscribers: int,
+        messages: int,
+        timeout: float,
+        **options,
+    ) -> None:
+        """Publish the messages and measure their deliveries, in worker processes."""
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        processes = [
+            context.Process(
+                target=run_worker,
+                args=(
+                    settings.SETTINGS_MODULE,
+                    subscribers // workers + (index < subscribers % workers),
+                    messages,
+                    timeout,
+                    results,
+                ),
+            )
+            for index in range(workers)
+        ]
+        deliveries = Deliveries()
+        try:
+            for process in processes:
+                process.start()
+            for _ in processes:
+                # Starting a process imports Django, it is not counted.
+                results.get(timeout=timeout)
+            started, published = asyncio.run(publish(ChannelsBroker(), messages))
+            for _ in processes:
+                latencies, last = results.get(timeout=timeout + published + 10)
+                deliveries.latencies.extend(latencies)
+                deliveries.last = max(deliveries.last, last)
+        except queue.Empty as e:
+            raise CommandError("A worker process did not answer in time.") from e
+        finally:
+            for process in processes:
+                process.join(timeout=1)
+                if process.is_alive():
+                    process.terminate()
+        self.report(
+            f"broker=channels processes={workers}",
+            subscribers,
+            messages,
+            started,
+            published,
+            deliveries,
+        )
+
+    def report(
+        self,
+        setup: str,
+        subscribers: int,
+        messages: int,
+        started: float,
+        published: float,
+        deliveries: Deliveries,
+    ) -> None:
+        """Write the throughput and the latency quantiles."""
+        latencies = deliveries.latencies
+        elapsed = max(deliveries.last, started + published) - started
+        expected = messages * subscribers
+        self.stdout.write(f"{setup} subscribers={subscribers} messages={messages}")
+        self.stdout.write(
+            f"published: {messages / published:,.0f} messages/s "
+            f"delivered: {len(latencies):,}/{expected:,} "
+            f"({len(latencies) / elapsed:,.0f} deliveries/s)"
+        )
+        if len(latencies) > 1:
+            quantiles = statistics.quantiles(latencies, n=100)
+            self.stdout.write(
+                "latency ms: "
+                f"p50={quantiles[49] * 1000:.3f} "
+                f"p95={quantiles[94] * 1000:.3f} "
+                f"p99={quantiles[98] * 1000:.3f} "
+                f"max={max(latencies) * 1000:.3f}"
+            )
@@ -0,0 +1,22 @@
+"""Signals of the utils app.
+
+`QuerySet.bulk_create` and `QuerySet.bulk_update` do not send `post_save`, the
+bulk writers send `post_bulk_save` once per write instead, so receivers, e.g.
+the response cache and the model events, handle thousands of rows at once.
+
+Examples:
+    Send it after a bulk write::
+
+        Fruit.objects.bulk_create(fruits)
+        post_bulk_save.send(
+            sender=Fruit, instances=fruits, created=True, using="default"
+        )
+
+References:
+    https://docs.djangoproject.com/en/5.0/topics/signals/#defining-signals
+"""
+
+from django.dispatch import Signal
+
+# Arguments: ``sender`` (the model), ``instances``, ``created`` and ``using``.
+post_bulk_save = Signal()
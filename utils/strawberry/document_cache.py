@@ -0,0 +1,86 @@
+"""LRU cache of parsed and validated documents.
+
+Combines strawberry's `ParserCache` and `ValidationCache` into one bounded
+cache keyed by the document text, with counters. Parsing and validation do not
+depend on the operation name, so every operation of a document shares it.
+
+References:
+    https://strawberry.rocks/docs/extensions/parser-cache
+    https://strawberry.rocks/docs/extensions/validation-cache
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple, Type
+
+from strawberry.extensions import SchemaExtension
+
+if TYPE_CHECKING:
+    from graphql import GraphQLError
+    from graphql.language import DocumentNode
+    from graphql.validation import ASTValidationRule
+
+    from utils.lru import LRUCache
+
+
+@dataclass
+class CachedDocument:
+    """Parsed document and the result of its last validation."""
+
+    document: "DocumentNode"
+    validation_rules: Optional[Tuple[Type["ASTValidationRule"], ...]] = None
+    errors: Optional[List["GraphQLError"]] = None
+
+
+class DocumentCacheExtension(SchemaExtension):
+    """Skip parsing and validation of documents seen before.
+
+    Extensions are shared between concurrent executions, so no per-execution
+    state is kept on the instance.
+    """
+
+    def __init__(self, cache: "LRUCache[str, CachedDocument]") -> None:
+        """Initialize the DocumentCacheExtension.
+
+        Args:
+            cache: The cache to use, its counters are exposed to operators.
+        """
+        self.cache = cache
+
+    def on_parse(self) -> Iterator[None]:
+        """Set the cached document, or cache the newly parsed one."""
+        execution_context = self.execution_context
+        key = execution_context.query
+        if not key:
+            yield
+            return
+
+        entry = self.cache.get(key)
+        if entry is not None:
+            execution_context.graphql_document = entry.document
+        yield
+        if entry is None and execution_context.graphql_document is not None:
+            self.cache.set(key, CachedDocument(execution_context.graphql_document))
+
+    def on_validate(self) -> Iterator[None]:
+        """Set the cached validation errors, or cache the new ones."""
+        execution_context = self.execution_context
+        key = execution_context.query
+        entry = self.cache.peek(key) if key else None
+        if (
+            entry is None
+            or entry.document is not execution_context.graphql_document
+            or execution_context.errors is not None
+        ):
+            yield
+            return
+
+        validation_rules = execution_context.validation_rules
+        if entry.validation_rules == validation_rules:
+            # An empty list tells strawberry validation has already run.
+            execution_context.errors = entry.errors or []
+            yield
+            return
+
+        yield
+        entry.validation_rules = validation_rules
+        entry.errors = execution_context.errors
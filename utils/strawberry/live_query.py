@@ -0,0 +1,198 @@
+"""Live queries, re-executed when their models change and sent as JSON patches.
+
+A live query subscribes to the events of the Django models its document
+selects, see `utils.broker.model_events`. It is executed once and sent in
+full, then executed again only after a commit changed one of those models, and
+only the JSON patch (RFC 6902) from the previous result is sent, if any.
+
+Events arriving while the query is executed are coalesced into one more
+execution, so a burst of commits costs at most two executions.
+
+Examples:
+    Subscribe to a query over the WebSocket consumer::
+
+        subscription {
+          liveQuery(query: "{ colors { edges { node { name } } } }")
+        }
+
+    The first message has the ``result``, the next ones the ``patch``::
+
+        {"revision": 1, "result": {"data": {...}}, "patch": null}
+        {"revision": 2, "result": null, "patch": [{"op": "replace", ...}]}
+
+References:
+    https://datatracker.ietf.org/doc/html/rfc6902
+    https://datatracker.ietf.org/doc/html/rfc6901
+"""
+
+import asyncio
+import contextlib
+import copy
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional
+
+import strawberry
+from graphql import GraphQLError, OperationDefinitionNode, OperationType, parse
+from strawberry.scalars import JSON
+
+from .response_cache import get_model_tags, get_tag
+
+if TYPE_CHECKING:
+    from strawberry import Schema
+
+    from utils.broker.model_events import ModelEvents
+
+Patch = List[Dict[str, Any]]
+
+
+def escape_pointer(token: str) -> str:
+    """Escape a token of a JSON pointer."""
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def make_patch(old: Any, new: Any, path: str = "") -> Patch:
+    """Return the JSON patch turning ``old`` into ``new``.
+
+    Objects are compared by key and lists by index, so appending to a list is
+    one ``add`` per new item.
+    """
+    if old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        patch: Patch = [
+            {"op": "remove", "path": f"{path}/{escape_pointer(key)}"}
+            for key in old
+            if key not in new
+        ]
+        for key, value in new.items():
+            pointer = f"{path}/{escape_pointer(key)}"
+            if key in old:
+                patch.extend(make_patch(old[key], value, pointer))
+            else:
+                patch.append({"op": "add", "path": pointer, "value": value})
+        return patch
+    if isinstance(old, list) and isinstance(new, list):
+        patch = []
+        for index in range(min(len(old), len(new))):
+            patch.extend(make_patch(old[index], new[index], f"{path}/{index}"))
+        # Remove from the end, so the indexes of the next ones still hold.
+        for index in reversed(range(len(new), len(old))):
+            patch.append({"op": "remove", "path": f"{path}/{index}"})
+        for index in range(len(old), len(new)):
+            patch.append({"op": "add", "path": f"{path}/{index}", "value": new[index]})
+        return patch
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def apply_patch(document: Any, patch: Patch) -> Any:
+    """Return a copy of the document with the operations of `make_patch`."""
+    document = copy.deepcopy(document)
+    for operation in patch:
+        if not operation["path"]:
+            document = copy.deepcopy(operation["value"])
+            continue
+        *parents, last = [
+            token.replace("~1", "/").replace("~0", "~")
+            for token in operation["path"][1:].split("/")
+        ]
+        target = document
+        for token in parents:
+            target = target[int(token) if isinstance(target, list) else token]
+        key: Any = int(last) if isinstance(target, list) else last
+        if operation["op"] == "remove":
+            del target[key]
+        elif operation["op"] == "add" and isinstance(target, list):
+            target.insert(key, copy.deepcopy(operation["value"]))
+        else:
+            target[key] = copy.deepcopy(operation["value"])
+    return document
+
+
+@strawberry.type
+class LiveQueryResult:
+    """A revision of a live query, the full result first, then patches."""
+
+    revision: int
+    result: Optional[JSON] = strawberry.field(
+        description="The full result of the first revision."
+    )
+    patch: Optional[JSON] = strawberry.field(
+        description="The JSON patch from the previous revision."
+    )
+
+
+async def run_live_query(
+    schema: "Schema",
+    model_events: "ModelEvents",
+    query: str,
+    variables: Optional[Dict[str, Any]] = None,
+    operation_name: Optional[str] = None,
+    context: Any = None,
+) -> AsyncIterator[LiveQueryResult]:
+    """Yield the revisions of the query, see the module.
+
+    Raises:
+        GraphQLError: The document is not a query or selects no model of
+            ``model_events``.
+    """
+    document = parse(query)
+    operations = [
+        definition
+        for definition in document.definitions
+        if isinstance(definition, OperationDefinitionNode)
+        and (
+            operation_name is None
+            or (definition.name is not None and definition.name.value == operation_name)
+        )
+    ]
+    if len(operations) != 1 or operations[0].operation != OperationType.QUERY:
+        raise GraphQLError("Live queries must be one query operation.")
+
+    watched = {get_tag(model): model for model in model_events.fields}
+    models = [
+        watched[tag]
+        for tag in sorted(get_model_tags(schema._schema, document))
+        if tag in watched
+    ]
+    if not models:
+        raise GraphQLError("Live queries must select a model with change events.")
+
+    changed = asyncio.Event()
+
+    async def watch(events: AsyncIterator[Any]) -> None:
+        async for _ in events:
+            changed.set()
+
+    async with contextlib.AsyncExitStack() as stack:
+        # Subscribed before the first execution, so no change is missed.
+        watchers = [
+            asyncio.create_task(
+                watch(await stack.enter_async_context(model_events.subscribe(model)))
+            )
+            for model in models
+        ]
+        try:
+            previous: Optional[Dict[str, Any]] = None
+            revision = 0
+            while True:
+                execution = await schema.execute(
+                    query,
+                    variable_values=variables,
+                    operation_name=operation_name,
+                    context_value=context,
+                )
+                result: Dict[str, Any] = {"data": execution.data}
+                if execution.errors:
+                    result["errors"] = [error.formatted for error in execution.errors]
+                if previous is None:
+                    revision += 1
+                    yield LiveQueryResult(revision=revision, result=result, patch=None)
+                elif patch := make_patch(previous, result):
+                    revision += 1
+                    yield LiveQueryResult(revision=revision, result=None, patch=patch)
+                previous = result
+                await changed.wait()
+                changed.clear()
+        finally:
+            for watcher in watchers:
+                watcher.cancel()
+            await asyncio.gather(*watchers, return_exceptions=True)
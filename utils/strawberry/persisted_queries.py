@@ -0,0 +1,173 @@
+"""Automatic persisted queries (APQ).
+
+Clients send the SHA-256 hash of the document in
+``extensions.persistedQuery.sha256Hash`` and only send the full ``query`` text
+when the server answers ``PersistedQueryNotFound``. The server keeps a bounded
+store of ``hash -> query`` of the queries registered with their hash, so hot
+operations are not sent again. Parsed documents are cached by the schema, see
+`utils.strawberry.document_cache`.
+
+Examples:
+    Share one store between the HTTP entry points::
+
+        store = LRUCache(maxsize=1000)
+        AsyncGraphQLView.as_view(schema=schema, persisted_query_store=store)
+
+    Request body::
+
+        {
+            "operationName": "Fruits",
+            "extensions": {
+                "persistedQuery": {"version": 1, "sha256Hash": "ecf4edb4..."}
+            }
+        }
+
+References:
+    https://www.apollographql.com/docs/apollo-server/performance/apq
+    https://github.com/apollographql/apollo-link-persisted-queries#protocol
+"""
+
+import hashlib
+from typing import TYPE_CHECKING, Any, Dict, Optional, Union
+
+from graphql import GraphQLError
+from strawberry.http import GraphQLRequestData
+from strawberry.http.exceptions import HTTPException
+from strawberry.http.parse_content_type import parse_content_type
+from strawberry.types import ExecutionResult
+
+if TYPE_CHECKING:
+    from strawberry.http.async_base_view import AsyncHTTPRequestAdapter
+    from strawberry.http.base import BaseRequestProtocol
+    from strawberry.http.types import QueryParams
+    from strawberry.types import SubscriptionExecutionResult
+
+    from utils.lru import LRUCache
+
+PERSISTED_QUERY_VERSION = 1
+PERSISTED_QUERY_NOT_FOUND = "PersistedQueryNotFound"
+
+
+class PersistedQueryNotFound(Exception):
+    """The hash is unknown; the client must resend the full query text."""
+
+
+def hash_query(query: str) -> str:
+    """Return the hex SHA-256 digest of the document text."""
+    return hashlib.sha256(query.encode()).hexdigest()
+
+
+class PersistedQueryViewMixin:
+    """Resolve ``extensions.persistedQuery`` for `AsyncBaseHTTPView` subclasses.
+
+    Must be placed before the view class in the bases.
+    """
+
+    persisted_query_store: Optional["LRUCache[str, str]"] = None
+
+    def __init__(
+        self,
+        *args: Any,
+        persisted_query_store: Optional["LRUCache[str, str]"] = None,
+        **kwargs: Any,
+    ) -> None:
+        """Pop ``persisted_query_store``, channels consumers reject unknown kwargs."""
+        if persisted_query_store is not None:
+            self.persisted_query_store = persisted_query_store
+        super().__init__(*args, **kwargs)
+
+    def should_render_graphql_ide(self, request: "BaseRequestProtocol") -> bool:
+        """Do not render the IDE for ``GET`` requests that only send a hash."""
+        if request.query_params.get("extensions") is not None:
+            return False
+        return super().should_render_graphql_ide(request)  # type: ignore[misc]
+
+    def parse_query_params(self, params: "QueryParams") -> Dict[str, Any]:
+        """Also decode the ``extensions`` JSON parameter of ``GET`` requests."""
+        data = super().parse_query_params(params)  # type: ignore[misc]
+        if extensions := data.get("extensions"):
+            data["extensions"] = self.parse_json(extensions)  # type: ignore[attr-defined]
+        return data
+
+    async def parse_http_body(
+        self, request: "AsyncHTTPRequestAdapter"
+    ) -> GraphQLRequestData:
+        """Override to keep the request ``extensions``.
+
+        Same as `AsyncBaseHTTPView.parse_http_body`, which drops them.
+        """
+        headers = {key.lower(): value for key, value in request.headers.items()}
+        content_type, _ = parse_content_type(request.content_type or "")
+        accept = headers.get("accept", "")
+
+        protocol = "http"
+        if self._is_multipart_subscriptions(*parse_content_type(accept)):  # type: ignore[attr-defined]
+            protocol = "multipart-subscription"
+
+        if request.method == "GET":
+            data = self.parse_query_params(request.query_params)
+        elif "application/json" in content_type:
+            data = self.parse_json(await request.get_body())  # type: ignore[attr-defined]
+        elif self.multipart_uploads_enabled and content_type == "multipart/form-data":  # type: ignore[attr-defined]
+            data = await self.parse_multipart(request)  # type: ignore[attr-defined]
+        else:
+            raise HTTPException(400, "Unsupported content type")
+
+        return GraphQLRequestData(
+            query=self.resolve_persisted_query(data),
+            variables=data.get("variables"),
+            operation_name=data.get("operationName"),
+            protocol=protocol,  # type: ignore[arg-type]
+        )
+
+    def resolve_persisted_query(self, data: Dict[str, Any]) -> Optional[str]:
+        """Return the query text for the request data.
+
+        Raises:
+            HTTPException: The persisted query is malformed or its hash does not
+                match the sent query.
+            PersistedQueryNotFound: Only the hash is sent and it is not stored.
+        """
+        query = data.get("query")
+        extensions = data.get("extensions")
+        if self.persisted_query_store is None or not isinstance(extensions, dict):
+            return query
+        persisted_query = extensions.get("persistedQuery")
+        if not persisted_query:
+            return query
+
+        if persisted_query.get("version") != PERSISTED_QUERY_VERSION:
+            raise HTTPException(400, "Unsupported persisted query version")
+        sha256_hash = persisted_query.get("sha256Hash")
+        if not isinstance(sha256_hash, str):
+            raise HTTPException(400, "Invalid persisted query hash")
+        sha256_hash = sha256_hash.lower()
+
+        if query is None:
+            query = self.persisted_query_store.get(sha256_hash)
+            if query is None:
+                raise PersistedQueryNotFound(sha256_hash)
+            return query
+
+        if hash_query(query) != sha256_hash:
+            raise HTTPException(400, "Provided sha does not match query")
+        if sha256_hash not in self.persisted_query_store:
+            self.persisted_query_store.set(sha256_hash, query)
+        return query
+
+    async def execute_operation(
+        self, *args: Any, **kwargs: Any
+    ) -> Union[ExecutionResult, "SubscriptionExecutionResult"]:
+        """Answer ``PersistedQueryNotFound`` as a GraphQL error, not an HTTP one."""
+        try:
+            return await super().execute_operation(*args, **kwargs)  # type: ignore[misc]
+        except PersistedQueryNotFound:
+            return ExecutionResult(
+                data=None,
+                errors=[
+                    GraphQLError(
+                        PERSISTED_QUERY_NOT_FOUND,
+                        extensions={"code": "PERSISTED_QUERY_NOT_FOUND"},
+                    )
+                ],
+            )
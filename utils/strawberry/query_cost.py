@@ -0,0 +1,326 @@
+"""Query cost analysis and depth limiting.
+
+The cost of an operation is estimated from its document before execution::
+
+    cost(field) = weight(field) + multiplier(field) * cost(selections)
+
+- ``weight`` is 1 for fields of object types and 0 for leaves, overridden by
+  ``metadata={"cost": n}`` on the strawberry field or by ``field_weights``.
+- ``multiplier`` is the ``first``/``last``/``pagination.limit`` argument of
+  the field, the ``relay_max_results`` of connections without them (or with
+  negative ones) and ``default_list_size`` for the other lists. The ``edges``
+  of a connection are already counted by the connection field.
+
+Operations over ``max_cost`` or deeper than ``max_depth`` are rejected before
+any resolver runs, and the estimate is reported in the ``cost`` key of the
+response ``extensions``. Subscriptions are limited too, the rejection is their
+only result; their cost is the one of each result.
+
+Examples:
+    Add the extension, ``schema.py``::
+
+        schema = strawberry.Schema(
+            query=Query,
+            extensions=[
+                QueryCostExtension(
+                    max_cost=5000,
+                    max_depth=10,
+                    field_weights={"Color.fruits": 2},
+                ),
+            ],
+        )
+
+    Response::
+
+        {
+            "data": {...},
+            "extensions": {
+                "cost": {"requestedCost": 131, "maximumCost": 5000, "depth": 5}
+            }
+        }
+
+References:
+    https://strawberry.rocks/docs/extensions/query-depth-limiter
+    https://docs.github.com/en/graphql/overview/rate-limits-and-node-limits-for-the-graphql-api
+    https://ibm.github.io/graphql-specs/cost-spec.html
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Mapping, Optional
+
+from graphql import ExecutionResult as GraphQLExecutionResult
+from graphql import (
+    GraphQLError,
+    GraphQLNonNull,
+    get_named_type,
+    get_operation_ast,
+    is_composite_type,
+    is_list_type,
+)
+from graphql.execution.values import get_argument_values
+from graphql.language import (
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    InlineFragmentNode,
+    OperationDefinitionNode,
+)
+from graphql.type import GraphQLInterfaceType, GraphQLObjectType
+from graphql.utilities import get_operation_root_type, type_from_ast
+from strawberry.extensions import SchemaExtension
+from strawberry.relay import Connection
+from strawberry.schema.schema_converter import GraphQLCoreConverter
+from strawberry.types.graphql import OperationType
+
+if TYPE_CHECKING:
+    from graphql import GraphQLField, GraphQLOutputType, GraphQLSchema
+    from graphql.language import SelectionSetNode
+    from strawberry.types import ExecutionContext
+
+QUERY_COST_EXCEEDED = "QUERY_COST_EXCEEDED"
+QUERY_DEPTH_EXCEEDED = "QUERY_DEPTH_EXCEEDED"
+PAGINATION_ARGUMENTS = ("first", "last")
+
+
+@dataclass
+class QueryCost:
+    """The estimated cost and the depth of an operation."""
+
+    cost: int
+    depth: int
+
+
+def is_connection(type_: "GraphQLOutputType") -> bool:
+    """Return whether the type is a relay connection type."""
+    named_type = get_named_type(type_)
+    definition = getattr(named_type, "extensions", {}).get(
+        GraphQLCoreConverter.DEFINITION_BACKREF
+    )
+    origin = getattr(definition, "origin", None)
+    return isinstance(origin, type) and issubclass(origin, Connection)
+
+
+class QueryCostCalculator:
+    """Estimate the cost of an operation of a validated document."""
+
+    def __init__(
+        self,
+        schema: "GraphQLSchema",
+        fragments: Dict[str, "FragmentDefinitionNode"],
+        variables: Optional[Dict[str, Any]],
+        *,
+        default_list_size: int,
+        connection_size: int,
+        field_weights: Mapping[str, int],
+    ) -> None:
+        """Initialize the QueryCostCalculator."""
+        self.schema = schema
+        self.fragments = fragments
+        self.variables = variables or {}
+        self.default_list_size = default_list_size
+        self.connection_size = connection_size
+        self.field_weights = field_weights
+
+    def get_cost(self, operation: OperationDefinitionNode) -> QueryCost:
+        """Return the cost of the operation."""
+        root_type = get_operation_root_type(self.schema, operation)
+        return self.get_selection_set_cost(operation.selection_set, root_type)
+
+    def get_selection_set_cost(
+        self,
+        selection_set: "SelectionSetNode",
+        parent_type: Any,
+        parent_is_connection: bool = False,
+    ) -> QueryCost:
+        """Return the sum of the costs and the maximum depth of the selections."""
+        total = QueryCost(cost=0, depth=0)
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                cost = self.get_field_cost(selection, parent_type, parent_is_connection)
+            elif isinstance(selection, InlineFragmentNode):
+                type_ = (
+                    type_from_ast(self.schema, selection.type_condition)
+                    if selection.type_condition
+                    else parent_type
+                )
+                cost = self.get_selection_set_cost(
+                    selection.selection_set, type_, parent_is_connection
+                )
+            elif isinstance(selection, FragmentSpreadNode):
+                fragment = self.fragments[selection.name.value]
+                cost = self.get_selection_set_cost(
+                    fragment.selection_set,
+                    type_from_ast(self.schema, fragment.type_condition),
+                    parent_is_connection,
+                )
+            else:  # pragma: no cover
+                continue
+            total.cost += cost.cost
+            total.depth = max(total.depth, cost.depth)
+        return total
+
+    def get_field_cost(
+        self,
+        node: FieldNode,
+        parent_type: Any,
+        parent_is_connection: bool,
+    ) -> QueryCost:
+        """Return the cost of the field and its selections."""
+        name = node.name.value
+        if name.startswith("__") or not isinstance(
+            parent_type, (GraphQLObjectType, GraphQLInterfaceType)
+        ):
+            # Introspection and fields of unions, which only have __typename.
+            return QueryCost(cost=0, depth=1)
+        field_def = parent_type.fields[name]
+
+        weight = self.get_weight(parent_type.name, name, field_def)
+        if node.selection_set is None:
+            return QueryCost(cost=weight, depth=1)
+
+        field_is_connection = is_connection(field_def.type)
+        multiplier = self.get_multiplier(
+            node, field_def, field_is_connection, parent_is_connection
+        )
+        selections = self.get_selection_set_cost(
+            node.selection_set,
+            get_named_type(field_def.type),
+            field_is_connection,
+        )
+        return QueryCost(
+            cost=weight + multiplier * selections.cost,
+            depth=selections.depth + 1,
+        )
+
+    def get_weight(
+        self, type_name: str, field_name: str, field_def: "GraphQLField"
+    ) -> int:
+        """Return the weight of the field."""
+        key = f"{type_name}.{field_name}"
+        if key in self.field_weights:
+            return self.field_weights[key]
+        field = field_def.extensions.get(GraphQLCoreConverter.DEFINITION_BACKREF)
+        metadata = getattr(field, "metadata", None) or {}
+        if "cost" in metadata:
+            return metadata["cost"]
+        return 1 if is_composite_type(get_named_type(field_def.type)) else 0
+
+    def get_multiplier(
+        self,
+        node: FieldNode,
+        field_def: "GraphQLField",
+        field_is_connection: bool,
+        parent_is_connection: bool,
+    ) -> int:
+        """Return how many times the selections of the field are resolved."""
+        try:
+            arguments = get_argument_values(field_def, node, self.variables)
+        except GraphQLError:
+            arguments = {}
+        # Negative arguments are rejected by the resolvers, count the default.
+        for argument in PAGINATION_ARGUMENTS:
+            value = arguments.get(argument)
+            if value is not None and value >= 0:
+                return value
+        pagination = arguments.get("pagination")
+        limit = getattr(pagination, "limit", None)
+        if limit is not None and limit >= 0:
+            return limit
+
+        if field_is_connection:
+            return self.connection_size
+        if not is_list_type(unwrap_non_null(field_def.type)) or parent_is_connection:
+            return 1
+        return self.default_list_size
+
+
+def unwrap_non_null(type_: "GraphQLOutputType") -> "GraphQLOutputType":
+    """Return the type without its non null wrapper."""
+    return type_.of_type if isinstance(type_, GraphQLNonNull) else type_
+
+
+class QueryCostExtension(SchemaExtension):
+    """Reject operations whose estimated cost or depth is over the limits.
+
+    The estimate is stored in ``execution_context.extensions_results``, which
+    strawberry adds to the response of async executions.
+    """
+
+    def __init__(
+        self,
+        max_cost: int,
+        *,
+        max_depth: Optional[int] = None,
+        default_list_size: int = 10,
+        field_weights: Optional[Mapping[str, int]] = None,
+    ) -> None:
+        """Initialize the QueryCostExtension.
+
+        Args:
+            max_cost: The maximum estimated cost of an operation.
+            max_depth: The maximum depth of an operation, not limited when None.
+            default_list_size: The estimated size of lists without pagination
+                arguments.
+            field_weights: The weights of fields by ``"Type.field"`` name.
+        """
+        self.max_cost = max_cost
+        self.max_depth = max_depth
+        self.default_list_size = default_list_size
+        self.field_weights = field_weights or {}
+
+    def get_cost(self, execution_context: "ExecutionContext") -> Optional[QueryCost]:
+        """Return the cost of the operation to execute."""
+        document = execution_context.graphql_document
+        if document is None:
+            return None
+        operation = get_operation_ast(document, execution_context.operation_name)
+        if operation is None:
+            # Execution reports the unknown or ambiguous operation.
+            return None
+        calculator = QueryCostCalculator(
+            execution_context.schema._schema,
+            {
+                definition.name.value: definition
+                for definition in document.definitions
+                if isinstance(definition, FragmentDefinitionNode)
+            },
+            execution_context.variables,
+            default_list_size=self.default_list_size,
+            connection_size=execution_context.schema.config.relay_max_results,
+            field_weights=self.field_weights,
+        )
+        return calculator.get_cost(operation)
+
+    def on_execute(self) -> Iterator[None]:
+        """Reject the operation before execution when it is over the limits."""
+        execution_context = self.execution_context
+        cost = self.get_cost(execution_context)
+        if cost is None:
+            yield
+            return
+
+        execution_context.extensions_results["cost"] = {
+            "requestedCost": cost.cost,
+            "maximumCost": self.max_cost,
+            "depth": cost.depth,
+        }
+        error = None
+        if self.max_depth is not None and cost.depth > self.max_depth:
+            error = GraphQLError(
+                f"Query depth {cost.depth} exceeds the maximum depth of "
+                f"{self.max_depth}.",
+                extensions={"code": QUERY_DEPTH_EXCEEDED},
+            )
+        elif cost.cost > self.max_cost:
+            error = GraphQLError(
+                f"Query cost {cost.cost} exceeds the maximum cost of {self.max_cost}.",
+                extensions={"code": QUERY_COST_EXCEEDED},
+            )
+        if error is not None and execution_context.operation_type == (
+            OperationType.SUBSCRIPTION
+        ):
+            # Subscriptions ignore the result, strawberry sends the error raised.
+            raise error
+        if error is not None and execution_context.result is None:
+            execution_context.result = GraphQLExecutionResult(data=None, errors=[error])
+        yield
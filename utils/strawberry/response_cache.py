@@ -0,0 +1,408 @@
+"""Response cache of read queries, invalidated by model signals.
+
+Responses are keyed by the normalized operation, its variables and the user,
+and tagged by the Django models of the types they select. Saving or deleting
+a row of a tagged model, or bulk saving rows with `post_bulk_save`, bumps the
+version of its tag, so every response that
+touched the model is missed afterwards.
+
+Only queries selecting at least one Django type, where every model they
+select is watched with `ResponseCache.connect`, are cached; anything else,
+e.g. ``users`` while only ``Fruit`` and ``Color`` are watched, is executed as
+usual.
+
+Examples:
+    Watch the models and add the cache to the schema::
+
+        response_cache = ResponseCache(backend=LocalResponseCacheBackend())
+        response_cache.connect(Fruit, Color)
+        schema = PublicSchema(query=Query, response_cache=response_cache)
+
+    Share the cache between workers with a Django cache alias::
+
+        ResponseCache(backend=DjangoResponseCacheBackend(alias="default"))
+
+References:
+    https://docs.djangoproject.com/en/5.0/topics/cache/
+    https://docs.djangoproject.com/en/5.0/ref/signals/#post-save
+    https://strawberry.rocks/docs/guides/custom-extensions
+"""
+
+import abc
+import hashlib
+import json
+import threading
+import time
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterable, Optional, Tuple
+
+from django.core.cache import caches
+from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
+from graphql import ExecutionResult as GraphQLExecutionResult
+from graphql import GraphQLObjectType, TypeInfo, TypeInfoVisitor, print_ast, visit
+from graphql.language import FieldNode, Visitor
+from strawberry.extensions import SchemaExtension
+from strawberry.schema.schema_converter import GraphQLCoreConverter
+from strawberry.types.graphql import OperationType
+from strawberry_django.utils.typing import get_django_definition
+
+from utils.lru import LRUCache
+from utils.signals import post_bulk_save
+
+if TYPE_CHECKING:
+    from graphql import GraphQLSchema
+    from graphql.language import DocumentNode
+    from strawberry.types import ExecutionContext
+
+Tags = frozenset[str]
+
+
+def get_tag(model: type[models.Model]) -> str:
+    """Return the tag of the model, its ``app_label.ModelName``."""
+    return model._meta.label
+
+
+class ResponseCacheBackend(abc.ABC):
+    """Store of responses and tag versions.
+
+    The async methods default to the sync ones, which must not block.
+    """
+
+    @abc.abstractmethod
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Return the stored values of the keys found."""
+
+    @abc.abstractmethod
+    def set(self, key: str, value: Any, timeout: Optional[float]) -> None:
+        """Store the value for ``timeout`` seconds, forever when None."""
+
+    @abc.abstractmethod
+    def incr(self, key: str) -> int:
+        """Increment the integer stored for the key, starting at 1."""
+
+    async def aget_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Async `get_many`."""
+        return self.get_many(keys)
+
+    async def aset(self, key: str, value: Any, timeout: Optional[float]) -> None:
+        """Async `set`."""
+        self.set(key, value, timeout)
+
+
+class LocalResponseCacheBackend(ResponseCacheBackend):
+    """In-memory backend of this process, bounded by ``maxsize`` responses."""
+
+    def __init__(self, maxsize: int = 1000) -> None:
+        """Initialize the LocalResponseCacheBackend.
+
+        Args:
+            maxsize: The maximum number of stored responses.
+        """
+        self.responses: LRUCache[str, Tuple[Optional[float], Any]] = LRUCache(
+            maxsize=maxsize
+        )
+        # One counter per model, so they are not evicted with the responses.
+        self.versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Return the stored values of the keys found."""
+        found = {}
+        now = time.monotonic()
+        for key in keys:
+            if key in self.versions:
+                found[key] = self.versions[key]
+                continue
+            entry = self.responses.get(key)
+            if entry is None:
+                continue
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= now:
+                self.responses.pop(key)
+                continue
+            found[key] = value
+        return found
+
+    def set(self, key: str, value: Any, timeout: Optional[float]) -> None:
+        """Store the value for ``timeout`` seconds, forever when None."""
+        expires_at = None if timeout is None else time.monotonic() + timeout
+        self.responses.set(key, (expires_at, value))
+
+    def incr(self, key: str) -> int:
+        """Increment the integer stored for the key, starting at 1."""
+        with self._lock:
+            self.versions[key] = self.versions.get(key, 0) + 1
+            return self.versions[key]
+
+
+class DjangoResponseCacheBackend(ResponseCacheBackend):
+    """Backend of the Django cache framework, shared by the workers."""
+
+    def __init__(self, alias: str = "default") -> None:
+        """Initialize the DjangoResponseCacheBackend.
+
+        Args:
+            alias: The alias of the ``CACHES`` setting to use.
+        """
+        self.alias = alias
+
+    @property
+    def cache(self) -> Any:
+        """The Django cache of the alias, one per thread."""
+        return caches[self.alias]
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Return the stored values of the keys found."""
+        return self.cache.get_many(list(keys))
+
+    def set(self, key: str, value: Any, timeout: Optional[float]) -> None:
+        """Store the value for ``timeout`` seconds, forever when None."""
+        self.cache.set(key, value, timeout)
+
+    def incr(self, key: str) -> int:
+        """Increment the integer stored for the key, starting at 1."""
+        if self.cache.add(key, 1, None):
+            return 1
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # Evicted between `add` and `incr`.
+            self.cache.set(key, 1, None)
+            return 1
+
+    async def aget_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Async `get_many`."""
+        return await self.cache.aget_many(list(keys))
+
+    async def aset(self, key: str, value: Any, timeout: Optional[float]) -> None:
+        """Async `set`."""
+        await self.cache.aset(key, value, timeout)
+
+
+class ModelTagsVisitor(Visitor):
+    """Collect the tags of the Django models selected by a document."""
+
+    def __init__(self, type_info: TypeInfo) -> None:
+        """Initialize the ModelTagsVisitor."""
+        super().__init__()
+        self.type_info = type_info
+        self.tags: set[str] = set()
+
+    def enter_field(self, node: FieldNode, *_args: Any) -> None:
+        """Tag the model of the parent type and the related model of the field."""
+        parent_type = self.type_info.get_parent_type()
+        if not isinstance(parent_type, GraphQLObjectType):
+            return
+        type_definition = parent_type.extensions.get(
+            GraphQLCoreConverter.DEFINITION_BACKREF
+        )
+        django_definition = get_django_definition(
+            getattr(type_definition, "origin", None)
+        )
+        if django_definition is None:
+            return
+        model = django_definition.model
+        self.tags.add(get_tag(model))
+
+        field_def = self.type_info.get_field_def()
+        field = field_def and field_def.extensions.get(
+            GraphQLCoreConverter.DEFINITION_BACKREF
+        )
+        field_name = getattr(field, "django_name", None)
+        if not field_name:
+            return
+        try:
+            model_field = model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            return
+        if model_field.related_model is not None:
+            self.tags.add(get_tag(model_field.related_model))  # type: ignore[arg-type]
+
+
+def get_model_tags(schema: "GraphQLSchema", document: "DocumentNode") -> Tags:
+    """Return the tags of the Django models selected by the document."""
+    type_info = TypeInfo(schema)
+    visitor = ModelTagsVisitor(type_info)
+    visit(document, TypeInfoVisitor(type_info, visitor))
+    return frozenset(visitor.tags)
+
+
+async def get_user_key(context: Any) -> Optional[Any]:
+    """Return the primary key of the authenticated user of the context."""
+    try:
+        request = context.request
+    except AttributeError:
+        request = context.get("request") if isinstance(context, dict) else None
+    if request is None:
+        return None
+
+    if hasattr(request, "auser"):
+        user = await request.auser()
+    elif hasattr(request, "consumer"):
+        # Channels HTTP consumers keep the user of `AuthMiddlewareStack` in scope.
+        user = request.consumer.scope.get("user")
+    else:
+        user = getattr(request, "scope", {}).get("user")
+    if user is None or not user.is_authenticated:
+        return None
+    return user.pk
+
+
+class ResponseCache:
+    """Cache of query responses tagged by the Django models they select."""
+
+    def __init__(
+        self,
+        backend: ResponseCacheBackend,
+        *,
+        timeout: Optional[float] = 60,
+        key_prefix: str = "graphql-response",
+        maxsize: int = 1000,
+    ) -> None:
+        """Initialize the ResponseCache.
+
+        Args:
+            backend: The store of the responses and the tag versions.
+            timeout: Seconds a response is kept, forever when None.
+            key_prefix: The prefix of the backend keys.
+            maxsize: The maximum number of documents whose normalized text and
+                tags are kept.
+        """
+        self.backend = backend
+        self.timeout = timeout
+        self.key_prefix = key_prefix
+        self.watched: Dict[str, type[models.Model]] = {}
+        self.documents: LRUCache[Tuple[str, Optional[str]], Tuple[str, Tags]] = (
+            LRUCache(maxsize=maxsize)
+        )
+        self._dispatch_uid = f"{key_prefix}-{id(self)}"
+
+    def connect(self, *models: type[models.Model]) -> None:
+        """Invalidate the responses of the models when their rows change."""
+        for model in models:
+            self.watched[get_tag(model)] = model
+            for signal in (post_save, post_delete, post_bulk_save):
+                signal.connect(
+                    self._receiver,
+                    sender=model,
+                    weak=False,
+                    dispatch_uid=self._dispatch_uid,
+                )
+
+    def disconnect(self) -> None:
+        """Stop invalidating, the counterpart of `connect`."""
+        for model in self.watched.values():
+            for signal in (post_save, post_delete, post_bulk_save):
+                signal.disconnect(sender=model, dispatch_uid=self._dispatch_uid)
+        self.watched.clear()
+
+    def _receiver(self, sender: type[models.Model], **kwargs: Any) -> None:
+        """Receive `post_save`, `post_delete` and `post_bulk_save`."""
+        self.invalidate(sender)
+
+    def invalidate(self, *models: type[models.Model]) -> None:
+        """Miss every response of the models.
+
+        The versions are bumped again on commit, otherwise a query running
+        before the commit would cache the old rows under the new version.
+        """
+        keys = [self.get_version_key(get_tag(model)) for model in models]
+        for key in keys:
+            self.backend.incr(key)
+        transaction.on_commit(lambda: [self.backend.incr(key) for key in keys])
+
+    def get_version_key(self, tag: str) -> str:
+        """Return the backend key of the version of the tag."""
+        return f"{self.key_prefix}:version:{tag}"
+
+    def get_document(
+        self, execution_context: "ExecutionContext"
+    ) -> Optional[Tuple[str, Tags]]:
+        """Return the normalized text and the tags of the operation.
+
+        Returns None when the operation must not be cached.
+        """
+        document = execution_context.graphql_document
+        if document is None or not execution_context.query:
+            return None
+        key = (execution_context.query, execution_context.operation_name)
+        entry = self.documents.get(key)
+        if entry is None:
+            schema = execution_context.schema._schema
+            entry = (print_ast(document), get_model_tags(schema, document))
+            self.documents.set(key, entry)
+        _, tags = entry
+        if not tags or not tags <= self.watched.keys():
+            return None
+        return entry
+
+    def get_response_key(
+        self,
+        document: str,
+        operation_name: Optional[str],
+        variables: Optional[Dict[str, Any]],
+        user_key: Optional[Any],
+    ) -> str:
+        """Return the backend key of the response."""
+        value = json.dumps(
+            [document, operation_name, variables, user_key],
+            sort_keys=True,
+            cls=DjangoJSONEncoder,
+        )
+        return (
+            f"{self.key_prefix}:response:{hashlib.sha256(value.encode()).hexdigest()}"
+        )
+
+
+class ResponseCacheExtension(SchemaExtension):
+    """Answer queries from the `ResponseCache`.
+
+    The hook is async, `PublicSchema` leaves it out of sync executions.
+    """
+
+    def __init__(self, cache: ResponseCache) -> None:
+        """Initialize the ResponseCacheExtension.
+
+        Args:
+            cache: The cache to use.
+        """
+        self.cache = cache
+
+    async def on_execute(self) -> AsyncIterator[None]:
+        """Set the cached result, or cache the new one."""
+        execution_context = self.execution_context
+        cache = self.cache
+        entry = None
+        if (
+            execution_context.operation_type is OperationType.QUERY
+            and execution_context.result is None
+        ):
+            entry = cache.get_document(execution_context)
+        if entry is None:
+            yield
+            return
+
+        document, tags = entry
+        key = cache.get_response_key(
+            document,
+            execution_context.operation_name,
+            execution_context.variables,
+            await get_user_key(execution_context.context),
+        )
+        version_keys = {cache.get_version_key(tag): tag for tag in tags}
+        found = await cache.backend.aget_many([key, *version_keys])
+        versions = {tag: found.get(k, 0) for k, tag in version_keys.items()}
+        cached = found.get(key)
+        if cached is not None and cached["versions"] == versions:
+            execution_context.result = GraphQLExecutionResult(data=cached["data"])
+            yield
+            return
+
+        yield
+        result = execution_context.result
+        if result is not None and not result.errors and result.data is not None:
+            # Versions read before executing, a concurrent change misses it.
+            value = {"versions": versions, "data": result.data}
+            await cache.backend.aset(key, value, cache.timeout)
@@ -0,0 +1,19 @@
+"""Strawberry HTTP entry points used by the project.
+
+References:
+    https://strawberry.rocks/docs/integrations/django#async-django
+    https://strawberry.rocks/docs/integrations/channels#graphqlhttpconsumer
+"""
+
+from strawberry.channels import GraphQLHTTPConsumer as BaseGraphQLHTTPConsumer
+from strawberry.django.views import AsyncGraphQLView as BaseAsyncGraphQLView
+
+from .persisted_queries import PersistedQueryViewMixin
+
+
+class AsyncGraphQLView(PersistedQueryViewMixin, BaseAsyncGraphQLView):  # type: ignore[misc]
+    """Django async view with automatic persisted queries."""
+
+
+class GraphQLHTTPConsumer(PersistedQueryViewMixin, BaseGraphQLHTTPConsumer):  # type: ignore[misc]
+    """Channels HTTP consumer with automatic persisted queries."""
@@ -0,0 +1,70 @@
+"""Tests admission control in the utils app."""
+
+import asyncio
+
+import pytest
+from django.test import SimpleTestCase
+
+from ..admission import AdmissionController, AdmissionRejected
+
+
+class AdmissionControllerTestCase(SimpleTestCase):
+    """Tests the concurrency limiter."""
+
+    async def test_limit(self):
+        """Test tasks over the limit wait for a slot, in order."""
+        admission = AdmissionController(2, max_queued=2)
+        started: list[int] = []
+        release = asyncio.Event()
+
+        async def run(index: int) -> None:
+            async with admission.admit():
+                started.append(index)
+                await release.wait()
+
+        tasks = [asyncio.create_task(run(i)) for i in range(4)]
+        await asyncio.sleep(0)
+        assert started == [0, 1]
+        assert (admission.running, admission.queued) == (2, 2)
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert started == [0, 1, 2, 3]
+        assert (admission.running, admission.queued) == (0, 0)
+
+    async def test_queue_full(self):
+        """Test tasks are rejected once the queue is full."""
+        admission = AdmissionController(1, max_queued=1)
+        await admission.acquire()
+        waiter = asyncio.create_task(admission.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected):
+            await admission.acquire()
+
+        admission.release()
+        await waiter
+        assert (admission.running, admission.queued) == (1, 0)
+
+    async def test_max_wait(self):
+        """Test waiting tasks are rejected after the maximum wait."""
+        admission = AdmissionController(1, max_queued=1, max_wait=0.01)
+        await admission.acquire()
+        with pytest.raises(AdmissionRejected):
+            await admission.acquire()
+        assert (admission.running, admission.queued) == (1, 0)
+
+        admission.release()
+        await admission.acquire()
+        assert admission.running == 1
+
+    async def test_cancel_after_handover(self):
+        """Test a slot handed over to a cancelled task is not leaked."""
+        admission = AdmissionController(1, max_queued=1)
+        await admission.acquire()
+        waiter = asyncio.create_task(admission.acquire())
+        await asyncio.sleep(0)
+        admission.release()
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert (admission.running, admission.queued) == (0, 0)
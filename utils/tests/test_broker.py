@@ -0,0 +1,155 @@
+"""Tests brokers in the utils app."""
+
+import asyncio
+import threading
+from unittest import mock
+
+import pytest
+from django.test import SimpleTestCase
+
+from project.schema import broker, schema
+
+from ..broker.channels import ChannelsBroker
+from ..broker.local import LocalBroker
+
+
+async def wait_for_subscribers(
+    broker: LocalBroker | ChannelsBroker, topic: str, count: int
+) -> None:
+    """Let the subscriptions start until the topic has ``count`` subscribers."""
+
+    async def wait() -> None:
+        while broker.count_subscribers(topic) != count:
+            await asyncio.sleep(0)
+
+    await asyncio.wait_for(wait(), timeout=1)
+
+
+class LocalBrokerTestCase(SimpleTestCase):
+    """Tests the in-process broker."""
+
+    async def test_publish(self):
+        """Test every subscriber of the topic receives the message in order."""
+        local_broker = LocalBroker()
+        async with (
+            local_broker.subscribe("a") as first,
+            local_broker.subscribe("a") as second,
+            local_broker.subscribe("b") as other,
+        ):
+            await local_broker.publish("a", 1)
+            await local_broker.publish("a", 2)
+            assert [await anext(first), await anext(first)] == [1, 2]
+            assert [await anext(second), await anext(second)] == [1, 2]
+            assert other.queue.empty()
+        assert local_broker.topics == {}
+
+    async def test_cleanup_on_error(self):
+        """Test the subscriber is removed however the subscription ends."""
+        local_broker = LocalBroker()
+        with pytest.raises(ValueError):
+            async with local_broker.subscribe("a"):
+                raise ValueError
+        assert local_broker.count_subscribers("a") == 0
+
+    async def test_publish_from_thread(self):
+        """Test messages published from other threads are delivered."""
+        local_broker = LocalBroker()
+        async with local_broker.subscribe("a") as messages:
+            thread = threading.Thread(
+                target=local_broker.publish_nowait, args=("a", "message")
+            )
+            thread.start()
+            assert await asyncio.wait_for(anext(messages), timeout=1) == "message"
+            thread.join()
+
+    async def test_maxsize_drops_oldest(self):
+        """Test slow subscribers keep the latest messages only."""
+        local_broker = LocalBroker(maxsize=2)
+        async with local_broker.subscribe("a") as messages:
+            for i in range(3):
+                local_broker.publish_nowait("a", i)
+            assert [await anext(messages), await anext(messages)] == [1, 2]
+
+    async def test_fail(self):
+        """Test the subscribers get the pending messages, then the error."""
+        local_broker = LocalBroker()
+        async with local_broker.subscribe("a") as messages:
+            local_broker.publish_nowait("a", 1)
+            local_broker.fail_nowait("a", ConnectionError())
+            assert await anext(messages) == 1
+            with pytest.raises(ConnectionError):
+                await anext(messages)
+
+
+class ChannelsBrokerTestCase(SimpleTestCase):
+    """Tests the broker shared by workers through the channel layer."""
+
+    async def test_publish_between_workers(self):
+        """Test messages reach the subscribers of every worker."""
+        # Brokers sharing the layer stand for brokers of different workers.
+        first_worker, second_worker = ChannelsBroker(), ChannelsBroker()
+        async with (
+            first_worker.subscribe("a") as first,
+            first_worker.subscribe("a") as second,
+            second_worker.subscribe("a") as third,
+        ):
+            # One channel per worker and topic.
+            group = first_worker.layer.groups[first_worker.get_group_name("a")]
+            assert len(group) == 2  # noqa: PLR2004
+
+            await first_worker.publish("a", {"value": 1})
+            for messages in (first, second, third):
+                message = await asyncio.wait_for(anext(messages), timeout=1)
+                assert message == {"value": 1}
+        assert first_worker.readers == second_worker.readers == {}
+        assert first_worker.get_group_name("a") not in first_worker.layer.groups
+
+    async def test_layer_failure(self):
+        """Test a failing layer ends the subscribers, the next ones read again."""
+        worker = ChannelsBroker()
+        error = ConnectionError("Connection lost")
+        with mock.patch.object(worker.layer, "receive", side_effect=error):
+            async with worker.subscribe("a") as messages:
+                with pytest.raises(ConnectionError):
+                    await asyncio.wait_for(anext(messages), timeout=1)
+                assert worker.readers == {}
+        assert worker.get_group_name("a") not in worker.layer.groups
+
+        async with worker.subscribe("a") as messages:
+            await worker.publish("a", 1)
+            assert await asyncio.wait_for(anext(messages), timeout=1) == 1
+
+    def test_group_name(self):
+        """Test topics which are not valid group names are hashed."""
+        broker = ChannelsBroker()
+        assert broker.get_group_name("fruit-1") == "broker.fruit-1"
+        assert broker.get_group_name("fruit:1").startswith("broker.")
+        assert ":" not in broker.get_group_name("fruit:1")
+
+
+class MessageSubscriptionTestCase(SimpleTestCase):
+    """Tests the message subscription of the root schema."""
+
+    async def test_message(self):
+        """Test published messages are pushed and the subscriber is removed.
+
+        Protocol handlers stop subscriptions by cancelling their task.
+        """
+        received = asyncio.Queue()
+
+        async def consume():
+            results = await schema.subscribe("subscription { message }")
+            async for result in results:
+                received.put_nowait(result.data)
+
+        task = asyncio.ensure_future(consume())
+        await wait_for_subscribers(broker, "message", 1)
+        await broker.publish("message", 42)
+        await broker.publish("message", 43)
+        assert await asyncio.wait_for(received.get(), timeout=1) == {"message": 42}
+        assert await asyncio.wait_for(received.get(), timeout=1) == {"message": 43}
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert broker.count_subscribers("message") == 0
@@ -0,0 +1,68 @@
+"""Tests document cache in the utils app."""
+
+import strawberry
+from strawberry.schema import execute
+
+from project.schema import PublicSchema
+
+
+@strawberry.type
+class Query:
+    """Query used to test the cache."""
+
+    @strawberry.field
+    def hello(self) -> str:
+        """Hello world."""
+        return "world"
+
+
+def test_document_cache_hits():
+    """Test documents are parsed and validated once per text, for any operation."""
+    schema = PublicSchema(query=Query, document_cache_maxsize=1)
+    query = "query A { hello } query B { hello }"
+
+    assert schema.execute_sync(query, operation_name="A").data == {"hello": "world"}
+    assert schema.execute_sync(query, operation_name="A").data == {"hello": "world"}
+    assert schema.execute_sync(query, operation_name="B").data == {"hello": "world"}
+    info = schema.document_cache.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (2, 1, 1)
+
+    schema.execute_sync("{ hello }")
+    assert schema.document_cache.cache_info().evictions == 1
+
+
+def test_document_cache_validation_errors():
+    """Test validation errors are cached along with the document."""
+    schema = PublicSchema(query=Query)
+    query = "{ unknown }"
+
+    first = schema.execute_sync(query)
+    second = schema.execute_sync(query)
+    assert first.errors
+    assert second.errors
+    assert [e.message for e in first.errors] == [e.message for e in second.errors]
+    assert schema.document_cache.cache_info().hits == 1
+
+
+def test_document_cache_parse_errors_are_not_cached():
+    """Test documents failing to parse are not cached."""
+    schema = PublicSchema(query=Query)
+
+    assert schema.execute_sync("{ hello").errors
+    assert len(schema.document_cache) == 0
+
+
+def test_document_cache_skips_validation(monkeypatch):
+    """Test cached documents are not validated again."""
+    calls = []
+    validate_document = execute.validate_document
+
+    def counting_validate_document(*args, **kwargs):
+        calls.append(args)
+        return validate_document(*args, **kwargs)
+
+    monkeypatch.setattr(execute, "validate_document", counting_validate_document)
+    schema = PublicSchema(query=Query)
+    schema.execute_sync("{ hello }")
+    schema.execute_sync("{ hello }")
+    assert len(calls) == 1
@@ -0,0 +1,105 @@
+"""Tests live queries in the utils app."""
+
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase
+
+from app.models import Color
+from project.schema import broker, model_events, schema
+
+from ..strawberry.live_query import apply_patch, make_patch
+from .test_broker import wait_for_subscribers
+
+LIVE_QUERY = """subscription Live($query: String!) {
+  liveQuery(query: $query) { revision result patch }
+}"""
+
+COLORS_QUERY = "{ colors { edges { node { name } } } }"
+
+
+class JSONPatchTestCase(SimpleTestCase):
+    """Tests the JSON patches between results."""
+
+    def test_make_patch(self):
+        """Test only the differences are in the patch."""
+        old = {"a": [1, 2, 3], "b": {"c": 1, "d/e": 2}, "f": 1}
+        new = {"a": [1, 4], "b": {"c": 1, "d/e": 3}, "g": 1}
+        patch = make_patch(old, new)
+        assert patch == [
+            {"op": "remove", "path": "/f"},
+            {"op": "replace", "path": "/a/1", "value": 4},
+            {"op": "remove", "path": "/a/2"},
+            {"op": "replace", "path": "/b/d~1e", "value": 3},
+            {"op": "add", "path": "/g", "value": 1},
+        ]
+        assert apply_patch(old, patch) == new
+        assert make_patch(new, new) == []
+
+    def test_apply_patch(self):
+        """Test applying the patch turns the old document into the new one."""
+        old = {"items": [{"id": 1}], "count": 1}
+        new = {"items": [{"id": 1}, {"id": 2}, {"id": 3}], "count": 3}
+        assert apply_patch(old, make_patch(old, new)) == new
+        assert apply_patch(new, make_patch(new, old)) == old
+        assert apply_patch(old, make_patch(old, None)) is None
+
+
+class LiveQueryTestCase(TestCase):
+    """Tests the live queries over the subscription."""
+
+    async def test_live_query(self):
+        """Test the query is sent in full, then patched after each commit."""
+        await Color.objects.acreate(name="Red")
+        received: list = []
+
+        async def consume() -> None:
+            results = await schema.subscribe(
+                LIVE_QUERY, variable_values={"query": COLORS_QUERY}
+            )
+            async for result in results:
+                received.append(result)
+
+        async def wait_for(count: int) -> None:
+            while len(received) < count:
+                await asyncio.sleep(0.01)
+
+        consumer = asyncio.create_task(consume())
+        try:
+            await asyncio.wait_for(wait_for(1), 1)
+            await wait_for_subscribers(broker, model_events.get_topic(Color), 1)
+
+            def save() -> None:
+                with self.captureOnCommitCallbacks(execute=True), transaction.atomic():
+                    Color.objects.create(name="Blue")
+
+            await sync_to_async(save)()
+            await asyncio.wait_for(wait_for(2), 1)
+        finally:
+            consumer.cancel()
+            await asyncio.gather(consumer, return_exceptions=True)
+
+        first, second = (result.data["liveQuery"] for result in received)
+        assert first["revision"] == 1
+        assert first["result"]["data"]["colors"]["edges"] == [{"node": {"name": "Red"}}]
+        assert second == {
+            "revision": 2,
+            "result": None,
+            "patch": [
+                {
+                    "op": "add",
+                    "path": "/data/colors/edges/1",
+                    "value": {"node": {"name": "Blue"}},
+                }
+            ],
+        }
+
+    async def test_not_live(self):
+        """Test only queries selecting watched models can be live."""
+        for query in ("{ hello }", "mutation { myPydantic }"):
+            results = await schema.subscribe(
+                LIVE_QUERY, variable_values={"query": query}
+            )
+            [error] = [result async for result in results][0].errors
+            assert error.message.startswith("Live queries must")
@@ -0,0 +1,36 @@
+"""Tests lru in the utils app."""
+
+import pytest
+
+from ..lru import LRUCache
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """Test the least recently used entry is evicted first."""
+    cache: LRUCache[str, int] = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    info = cache.cache_info()
+    assert (info.hits, info.misses, info.evictions, info.currsize) == (2, 1, 1, 2)
+
+
+def test_lru_cache_peek_does_not_count():
+    """Test peek neither counts nor refreshes the entry."""
+    cache: LRUCache[str, int] = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.peek("a") == 1
+    cache.set("c", 3)
+    assert "a" not in cache
+    assert cache.cache_info().hits == 0
+
+
+def test_lru_cache_maxsize():
+    """Test maxsize must be positive."""
+    with pytest.raises(ValueError, match="maxsize"):
+        LRUCache(maxsize=0)
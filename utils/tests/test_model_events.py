@@ -0,0 +1,119 @@
+"""Tests model events in the utils app."""
+
+import asyncio
+
+import pytest
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.test import TestCase
+
+from app.models import Color, Fruit, FruitCategory
+from project.schema import broker, model_events, schema
+
+from ..broker.local import LocalBroker
+from ..broker.model_events import ModelEvents
+from .test_broker import wait_for_subscribers
+
+
+class ModelEventsTestCase(TestCase):
+    """Tests the events of the models are published on commit."""
+
+    def setUp(self):
+        """Publish the events of fruits to a local broker."""
+        self.broker = LocalBroker()
+        self.model_events = ModelEvents(self.broker, topic_prefix="test")
+        self.model_events.connect(Fruit, fields=["category", "color_id"])
+        self.addCleanup(self.model_events.disconnect)
+
+    def save_fruits(self) -> list[Fruit]:
+        """Create, update and delete fruits in one transaction."""
+        with self.captureOnCommitCallbacks(execute=True), transaction.atomic():
+            fruits = [
+                Fruit.objects.create(name=f"Fruit {i}", category=FruitCategory.BERRY)
+                for i in range(3)
+            ]
+            fruits[0].name = "Strawberry"
+            fruits[0].save()
+            fruits[1].delete()
+        return fruits
+
+    async def test_coalesced(self):
+        """Test the events of a transaction are one message, per row."""
+        topic = self.model_events.get_topic(Fruit)
+        async with self.broker.subscribe(topic) as messages:
+            fruits = await sync_to_async(self.save_fruits)()
+            events = await asyncio.wait_for(anext(messages), 1)
+            assert messages.queue.empty()
+        assert events == [
+            {
+                "action": "created",
+                "pk": fruits[0].pk,
+                "category": "berry",
+                "color_id": None,
+            },
+            {
+                "action": "created",
+                "pk": fruits[2].pk,
+                "category": "berry",
+                "color_id": None,
+            },
+        ]
+
+    async def test_rollback(self):
+        """Test the events of a rolled back transaction are not sent."""
+
+        def save() -> Fruit:
+            with self.captureOnCommitCallbacks(execute=True):
+                with pytest.raises(ValueError), transaction.atomic():
+                    Fruit.objects.create(name="Lost", category=FruitCategory.BERRY)
+                    raise ValueError
+                with transaction.atomic():
+                    return Fruit.objects.create(
+                        name="Saved", category=FruitCategory.CITRUS
+                    )
+
+        async with self.broker.subscribe(
+            self.model_events.get_topic(Fruit)
+        ) as messages:
+            fruit = await sync_to_async(save)()
+            events = await asyncio.wait_for(anext(messages), 1)
+        assert [event["pk"] for event in events] == [fruit.pk]
+
+    async def test_fruit_changed(self):
+        """Test the subscription filters the events on the server."""
+        red = await Color.objects.acreate(name="Red")
+        query = "subscription { fruitChanged(category: CITRUS) { action id colorId } }"
+        received: list = []
+
+        async def consume() -> None:
+            results = await schema.subscribe(query)
+            async for result in results:
+                received.append(result)
+
+        consumer = asyncio.create_task(consume())
+        await wait_for_subscribers(broker, model_events.get_topic(Fruit), 1)
+
+        def save() -> Fruit:
+            with self.captureOnCommitCallbacks(execute=True), transaction.atomic():
+                Fruit.objects.create(name="Blueberry", category=FruitCategory.BERRY)
+                return Fruit.objects.create(
+                    name="Lemon", category=FruitCategory.CITRUS, color=red
+                )
+
+        lemon = await sync_to_async(save)()
+        await asyncio.wait_for(self.wait_for(received), 1)
+        consumer.cancel()
+        await asyncio.gather(consumer, return_exceptions=True)
+
+        [result] = received
+        assert result.errors is None, result.errors
+        assert result.data == {
+            "fruitChanged": [
+                {"action": "CREATED", "id": str(lemon.pk), "colorId": str(red.pk)}
+            ]
+        }
+
+    async def wait_for(self, received: list) -> None:
+        """Wait until a result is received."""
+        while not received:
+            await asyncio.sleep(0.01)
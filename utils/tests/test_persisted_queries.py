@@ -0,0 +1,127 @@
+"""Tests automatic persisted queries in the utils app."""
+
+import json
+from http import HTTPStatus
+
+from channels.testing import HttpCommunicator
+from django.test import AsyncRequestFactory, TestCase
+
+from project.schema import persisted_query_store, schema
+
+from ..strawberry.persisted_queries import hash_query
+from ..strawberry.views import AsyncGraphQLView, GraphQLHTTPConsumer
+
+QUERY = "query MyPydantic { myPydantic }"
+
+
+def persisted_query_extensions(query: str) -> dict:
+    """Build the request extensions for the query."""
+    return {"persistedQuery": {"version": 1, "sha256Hash": hash_query(query)}}
+
+
+class AsyncGraphQLViewTestCase(TestCase):
+    """Tests persisted queries through the Django view."""
+
+    def setUp(self):
+        """Start every test with an empty store."""
+        persisted_query_store.clear()
+        self.factory = AsyncRequestFactory()
+        self.view = AsyncGraphQLView.as_view(
+            schema=schema,
+            persisted_query_store=persisted_query_store,
+        )
+
+    async def post(self, payload: dict):
+        """Post the payload to the GraphQL view."""
+        request = self.factory.post(
+            "/graphql/", payload, content_type="application/json"
+        )
+        return await self.view(request)
+
+    async def test_not_found_then_registered(self):
+        """Test the hash is unknown until the full query is sent once."""
+        extensions = persisted_query_extensions(QUERY)
+
+        response = await self.post({"extensions": extensions})
+        assert response.status_code == HTTPStatus.OK
+        assert (
+            json.loads(response.content)["errors"][0]["message"]
+            == "PersistedQueryNotFound"
+        )
+
+        response = await self.post({"query": QUERY, "extensions": extensions})
+        assert json.loads(response.content)["data"] == {"myPydantic": True}
+        assert hash_query(QUERY) in persisted_query_store
+
+        response = await self.post({"extensions": extensions})
+        assert json.loads(response.content)["data"] == {"myPydantic": True}
+        assert persisted_query_store.cache_info().hits == 1
+
+    async def test_get(self):
+        """Test hash only GET requests do not render the IDE."""
+        extensions = persisted_query_extensions(QUERY)
+        await self.post({"query": QUERY, "extensions": extensions})
+        request = self.factory.get(
+            "/graphql/",
+            {"extensions": json.dumps(extensions)},
+            headers={"accept": "*/*"},
+        )
+        response = await self.view(request)
+        assert json.loads(response.content)["data"] == {"myPydantic": True}
+
+    async def test_hash_mismatch(self):
+        """Test the sent hash must match the sent query."""
+        response = await self.post(
+            {
+                "query": QUERY,
+                "extensions": persisted_query_extensions("{ myPydantic }"),
+            }
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    async def test_unsupported_version(self):
+        """Test only the version 1 protocol is supported."""
+        extensions = persisted_query_extensions(QUERY)
+        extensions["persistedQuery"]["version"] = 2
+        response = await self.post({"query": QUERY, "extensions": extensions})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    async def test_only_registered_queries_are_stored(self):
+        """Test queries sent without a hash are not stored, only parsed once."""
+        await self.post({"query": QUERY})
+        await self.post({"query": QUERY})
+        assert len(persisted_query_store) == 0
+        assert schema.document_cache.peek(QUERY) is not None
+
+
+class GraphQLHTTPConsumerTestCase(TestCase):
+    """Tests persisted queries through the channels HTTP consumer."""
+
+    async def request(self, payload: dict) -> dict:
+        """Post the payload to the GraphQL consumer."""
+        communicator = HttpCommunicator(
+            GraphQLHTTPConsumer.as_asgi(
+                schema=schema,
+                persisted_query_store=persisted_query_store,
+            ),
+            "POST",
+            "/graphql",
+            body=json.dumps(payload).encode(),
+            headers=[(b"content-type", b"application/json")],
+        )
+        response = await communicator.get_response()
+        return json.loads(response["body"])
+
+    async def test_not_found_then_registered(self):
+        """Test the hash is unknown until the full query is sent once."""
+        persisted_query_store.clear()
+        extensions = persisted_query_extensions(QUERY)
+
+        response = await self.request({"extensions": extensions})
+        assert response["errors"][0]["extensions"] == {
+            "code": "PERSISTED_QUERY_NOT_FOUND"
+        }
+
+        await self.request({"query": QUERY, "extensions": extensions})
+        response = await self.request({"extensions": extensions})
+        assert response["data"] == {"myPydantic": True}
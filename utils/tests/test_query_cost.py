@@ -0,0 +1,129 @@
+"""Tests query cost analysis in the utils app."""
+
+from asgiref.sync import async_to_sync
+from django.test import TestCase
+
+from app.models import Color, Fruit, FruitCategory
+from app.queries import Query
+from app.subscriptions import Subscription
+from project.schema import PublicSchema
+from utils.strawberry.query_cost import (
+    QUERY_COST_EXCEEDED,
+    QUERY_DEPTH_EXCEEDED,
+    QueryCostExtension,
+)
+
+COLORS_QUERY = """query Colors($first: Int) {
+  colors(first: $first) {
+    edges {
+      cursor
+      node {
+        name
+        fruits {
+          name
+        }
+      }
+    }
+  }
+}"""
+
+CYCLE_QUERY = """{
+  colors {
+    edges {
+      node {
+        fruits {
+          color {
+            fruits {
+              color {
+                name
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}"""
+
+
+class QueryCostTestCase(TestCase):
+    """Tests the query cost extension."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create a color with a fruit."""
+        red = Color.objects.create(name="Red")
+        Fruit.objects.create(name="Apple", category=FruitCategory.CITRUS, color=red)
+
+    def get_schema(self, **kwargs) -> PublicSchema:
+        """Return a schema limited by the extension."""
+        kwargs.setdefault("max_cost", 1000)
+        return PublicSchema(
+            query=Query,
+            subscription=Subscription,
+            extensions=[QueryCostExtension(**kwargs)],
+        )
+
+    def execute(self, schema: PublicSchema, query: str, **variables):
+        """Execute the query asynchronously, extensions are only reported then."""
+        return async_to_sync(schema.execute)(query, variable_values=variables)
+
+    def test_cost_is_reported(self):
+        """Test the cost uses pagination arguments and list multipliers."""
+        response = self.execute(self.get_schema(), COLORS_QUERY, first=2)
+        assert response.errors is None, response.errors
+        # colors 1 + 2 * (edges 1 + node 1 + fruits 1 + 10 * name 0)
+        assert response.extensions["cost"] == {
+            "requestedCost": 7,
+            "maximumCost": 1000,
+            "depth": 5,
+        }
+
+        # Connections without arguments are counted with `relay_max_results`.
+        response = self.execute(self.get_schema(), COLORS_QUERY)
+        assert response.extensions["cost"]["requestedCost"] == 301
+
+    def test_negative_pagination_arguments(self):
+        """Test negative arguments do not lower the cost below zero."""
+        response = self.execute(self.get_schema(), COLORS_QUERY, first=-100000)
+        assert response.extensions["cost"]["requestedCost"] == 301
+
+    def test_field_weights(self):
+        """Test the weights of the fields are configurable."""
+        schema = self.get_schema(field_weights={"Color.fruits": 5, "Fruit.name": 1})
+        response = self.execute(schema, COLORS_QUERY, first=2)
+        # colors 1 + 2 * (edges 1 + node 1 + fruits 5 + 10 * name 1)
+        assert response.extensions["cost"]["requestedCost"] == 35
+
+    def test_over_budget(self):
+        """Test operations over the budget are not executed."""
+        with self.assertNumQueries(0):
+            response = self.execute(self.get_schema(), CYCLE_QUERY)
+        assert response.data is None
+        [error] = response.errors
+        assert error.extensions == {"code": QUERY_COST_EXCEEDED}
+        assert response.extensions["cost"]["requestedCost"] > 1000
+
+    def test_over_depth(self):
+        """Test operations deeper than the limit are not executed."""
+        schema = self.get_schema(max_cost=10**6, max_depth=5)
+        response = self.execute(schema, CYCLE_QUERY)
+        [error] = response.errors
+        assert error.extensions == {"code": QUERY_DEPTH_EXCEEDED}
+        assert response.extensions["cost"]["depth"] == 8
+
+    def test_subscription_over_budget(self):
+        """Test subscriptions over the budget are rejected before any result."""
+        schema = self.get_schema(max_cost=5)
+
+        async def subscribe():
+            results = await schema.subscribe(
+                "subscription { streamFruits { name color { name } } }"
+            )
+            return [result async for result in results]
+
+        with self.assertNumQueries(0):
+            [result] = async_to_sync(subscribe)()
+        assert result.data is None
+        [error] = result.errors
+        assert error.extensions == {"code": QUERY_COST_EXCEEDED}
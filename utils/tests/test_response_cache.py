@@ -0,0 +1,115 @@
+"""Tests response cache in the utils app."""
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.test.client import RequestFactory
+
+from app.models import Color, Fruit, FruitCategory
+from app.queries import Query
+from project.schema import PublicSchema
+from utils.strawberry.response_cache import (
+    DjangoResponseCacheBackend,
+    LocalResponseCacheBackend,
+    ResponseCache,
+)
+
+COLORS_QUERY = """query Colors($first: Int) {
+  colors(first: $first) { edges { node { name fruits { name } } } }
+}"""
+
+
+class ResponseCacheTestCase(TestCase):
+    """Tests the response cache of the schema."""
+
+    backend_class = LocalResponseCacheBackend
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create a color with a fruit."""
+        red = Color.objects.create(name="Red")
+        Fruit.objects.create(name="Apple", category=FruitCategory.CITRUS, color=red)
+
+    def setUp(self):
+        """Create a schema with a new cache watching the app models."""
+        self.response_cache = ResponseCache(backend=self.backend_class())
+        self.response_cache.connect(Fruit, Color)
+        self.addCleanup(self.response_cache.disconnect)
+        self.schema = PublicSchema(query=Query, response_cache=self.response_cache)
+
+    def execute(self, query: str = COLORS_QUERY, **kwargs) -> dict:
+        """Execute the query asynchronously and return the data."""
+        response = async_to_sync(self.schema.execute)(query, **kwargs)
+        assert response.errors is None, response.errors
+        return response.data
+
+    def names(self, data: dict) -> list[str]:
+        """Names of the fruits of the colors."""
+        return [
+            fruit["name"]
+            for edge in data["colors"]["edges"]
+            for fruit in edge["node"]["fruits"]
+        ]
+
+    def test_hit(self):
+        """Test the same query and variables are executed once."""
+        data = self.execute(variable_values={"first": 1})
+        with self.assertNumQueries(0):
+            assert self.execute(variable_values={"first": 1}) == data
+        # Whitespace does not matter, variables do.
+        with self.assertNumQueries(0):
+            self.execute(" ".join(COLORS_QUERY.split()), variable_values={"first": 1})
+        with self.assertNumQueries(2):
+            self.execute(variable_values={"first": 2})
+
+    def test_invalidated_by_save_and_delete(self):
+        """Test saving or deleting a selected model misses the cache."""
+        assert self.names(self.execute()) == ["Apple"]
+        fruit = Fruit.objects.create(
+            name="Cherry", category=FruitCategory.BERRY, color=Color.objects.get()
+        )
+        assert self.names(self.execute()) == ["Apple", "Cherry"]
+        fruit.delete()
+        assert self.names(self.execute()) == ["Apple"]
+        with self.assertNumQueries(0):
+            self.execute()
+
+    def test_keyed_by_user(self):
+        """Test users do not share responses."""
+        user = get_user_model().objects.create_user(username="user")
+        request = RequestFactory().get("/")
+
+        async def auser():
+            return user
+
+        request.user = user
+        request.auser = auser
+        context = type("Context", (), {"request": request})()
+
+        self.execute()
+        with self.assertNumQueries(2):
+            self.execute(context_value=context)
+        with self.assertNumQueries(0):
+            self.execute(context_value=context)
+
+    def test_not_cached(self):
+        """Test unwatched models and sync executions are not cached."""
+        query = "{ users { edges { node { username } } } }"
+        self.execute(query)
+        with self.assertNumQueries(1):
+            self.execute(query)
+
+        self.schema.execute_sync(COLORS_QUERY)
+        with self.assertNumQueries(2):
+            self.execute()
+
+
+class DjangoResponseCacheTestCase(ResponseCacheTestCase):
+    """Tests the response cache with the Django cache framework backend."""
+
+    backend_class = DjangoResponseCacheBackend
+
+    def setUp(self):
+        """Clear the Django cache shared by the tests."""
+        super().setUp()
+        self.response_cache.backend.cache.clear()